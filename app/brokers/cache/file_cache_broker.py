@@ -0,0 +1,158 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from app.brokers.cache.i_cache_broker import ICacheBroker
+from app.brokers.storage.atomic_write import atomic_write_path
+
+
+@dataclass
+class FileCacheBroker(ICacheBroker):
+    """
+    Cache of pickled values in a directory, shared by every process using
+    the same directory.
+
+    Values are written atomically, one file each, and a read marks its file
+    as recently used. Once more than `max_entries` files are cached the least
+    recently used are removed (checked every `max_entries // 10` sets). Tag
+    generations are kept in files too, so a bump in one process invalidates
+    the values cached by all of them.
+    """
+
+    directory: str
+    max_entries: int = 10_000
+    _sets_since_prune: int = field(default=0, init=False, repr=False)
+    _stats: Dict[str, int] = field(
+        default_factory=lambda: {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+        },
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        self._values_directory = os.path.join(self.directory, "values")
+        self._generations_directory = os.path.join(
+            self.directory, "generations"
+        )
+        os.makedirs(self._values_directory, exist_ok=True)
+        os.makedirs(self._generations_directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _path(self, directory: str, key: str) -> str:
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(directory, name)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, key: str) -> Optional[Any]:
+        path = self._path(self._values_directory, key)
+        try:
+            with open(path, "rb") as file:
+                expires_at, value = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self._count("misses")
+            return None
+
+        if expires_at <= time.time():
+            self.delete(key)
+            self._count("misses")
+            return None
+
+        try:
+            os.utime(path)  # Most recently used
+        except OSError:
+            pass
+        self._count("hits")
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        path = self._path(self._values_directory, key)
+        with atomic_write_path(path) as temp_path:
+            with open(temp_path, "wb") as file:
+                pickle.dump(
+                    (time.time() + ttl, value),
+                    file,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+
+        with self._lock:
+            self._stats["sets"] += 1
+            self._sets_since_prune += 1
+            prune = self._sets_since_prune >= max(self.max_entries // 10, 1)
+            if prune:
+                self._sets_since_prune = 0
+        if prune:
+            self._prune()
+
+    def _prune(self) -> None:
+        entries = []
+        with os.scandir(self._values_directory) as scan:
+            for entry in scan:
+                if entry.is_file() and not entry.name.startswith("."):
+                    try:
+                        entries.append((entry.stat().st_mtime, entry.path))
+                    except OSError:
+                        pass
+
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+        entries.sort()
+        for _, path in entries[:excess]:
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._count("evictions")
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(self._values_directory, key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        with os.scandir(self._values_directory) as scan:
+            for entry in scan:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def get_generation(self, tag: str) -> int:
+        try:
+            with open(self._path(self._generations_directory, tag)) as file:
+                return int(file.read() or 0)
+        except (OSError, ValueError):
+            return 0
+
+    def bump_generation(self, tag: str) -> None:
+        # A new unique value rather than an increment, so concurrent bumps
+        # from several processes cannot write back the same generation
+        path = self._path(self._generations_directory, tag)
+        with atomic_write_path(path) as temp_path:
+            with open(temp_path, "w") as file:
+                file.write(str(time.time_ns()))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        try:
+            stats["entries"] = sum(
+                1
+                for name in os.listdir(self._values_directory)
+                if not name.startswith(".")
+            )
+        except OSError:
+            stats["entries"] = 0
+        return stats
@@ -0,0 +1,53 @@
+"""
+A base class for caching values by key for a limited time (e.g in memory
+ or on the filesystem).
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+
+class ICacheBroker(ABC):
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the value cached under a key, or None if there is none or it
+        has expired.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        Caches a value under a key for `ttl` seconds, evicting the least
+        recently used values when the cache is full.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def get_generation(self, tag: str) -> int:
+        """
+        Returns the current generation of a tag. Keys built from the
+        generations of the tags a value depends on stop matching once one of
+        them is bumped, which invalidates every such value at once.
+        """
+        pass
+
+    @abstractmethod
+    def bump_generation(self, tag: str) -> None:
+        pass
+
+    @abstractmethod
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit, miss, set and eviction counters and the number of
+        cached values.
+        """
+        pass
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from app.brokers.cache.i_cache_broker import ICacheBroker
+
+
+@dataclass
+class MemoryCacheBroker(ICacheBroker):
+    """
+    Cache of this process's memory, holding at most `max_entries` values and
+    evicting the least recently used first.
+    """
+
+    max_entries: int = 1024
+    _entries: "OrderedDict[str, Tuple[float, Any]]" = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _generations: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _stats: Dict[str, int] = field(
+        default_factory=lambda: {
+            "hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "evictions": 0,
+        },
+        init=False,
+        repr=False,
+    )
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            self._stats["sets"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_generation(self, tag: str) -> int:
+        return self._generations.get(tag, 0)
+
+    def bump_generation(self, tag: str) -> None:
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
@@ -0,0 +1,93 @@
+"""
+A base class for publishing events to channels and fanning them out to
+ subscribers (e.g in process, or across processes through SQLite).
+"""
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class ChannelMetrics:
+    """
+    Throughput counters of one channel.
+
+    Attributes:
+        published (int): Messages published.
+        batches (int): Batches delivered to the channel's subscribers.
+        delivered (int): Messages handed to subscribers (once per subscriber).
+        dropped_consumers (int): Subscribers dropped for falling behind.
+        consumers (int): Current subscribers.
+        started_at (float): When the counters started (monotonic time).
+    """
+
+    published: int = 0
+    batches: int = 0
+    delivered: int = 0
+    dropped_consumers: int = 0
+    consumers: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def to_dict(self) -> Dict[str, Any]:
+        seconds = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "published": self.published,
+            "batches": self.batches,
+            "delivered": self.delivered,
+            "dropped_consumers": self.dropped_consumers,
+            "consumers": self.consumers,
+            "published_per_second": self.published / seconds,
+            "delivered_per_second": self.delivered / seconds,
+        }
+
+
+class IEventBroker(ABC):
+    @abstractmethod
+    def publish(self, channel: str, message: Any) -> None:
+        """
+        Queues a message on a channel. Messages are sent in batches, so a
+        subscriber receives them some time after this returns.
+        """
+        pass
+
+    @abstractmethod
+    def subscribe(
+        self,
+        channel: str,
+        callback: Callable[[List[Any]], None],
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> Any:
+        """
+        Calls `callback` with each batch of messages published on a channel,
+        in order, on a thread of the subscriber's own. A subscriber whose
+        queue of undelivered batches is full is dropped, and `on_drop` is
+        called, rather than slowing the publishers down.
+
+        Returns:
+            Any: The subscription, to pass to `unsubscribe`.
+        """
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, subscription: Any) -> None:
+        pass
+
+    def flush(self) -> None:
+        """
+        Sends the messages queued by `publish` now.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Sends the queued messages and stops the broker's threads.
+        """
+        self.flush()
+
+    @abstractmethod
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the throughput counters of each channel.
+        """
+        pass
@@ -0,0 +1,214 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from app.brokers.events.i_event_broker import ChannelMetrics, IEventBroker
+
+
+logger = logging.getLogger(__name__)
+
+
+class EventConsumer:
+    """
+    A subscriber's callback, run on a thread of its own with a bounded queue
+    of batches waiting for it.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        callback: Callable[[List[Any]], None],
+        max_queued_batches: int,
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.channel = channel
+        self.callback = callback
+        self.max_queued_batches = max_queued_batches
+        self.on_drop = on_drop
+        self.dropped = False
+        self._queue: Deque[Optional[List[Any]]] = deque()
+        self._closed = False
+        # Looked up on use, so they are cooperative once gevent has patched
+        # threading
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(
+            target=self._run, name=f"event-consumer-{channel}", daemon=True
+        )
+        self._thread.start()
+
+    def offer(self, batch: List[Any]) -> bool:
+        """
+        Queues a batch for the callback. Returns False, without queueing it,
+        if the consumer is closed or its queue is full.
+        """
+        with self._condition:
+            if self._closed or len(self._queue) >= self.max_queued_batches:
+                return False
+            self._queue.append(batch)
+            self._condition.notify()
+        return True
+
+    def close(self, dropped: bool = False) -> None:
+        """
+        Stops the consumer once the batches already queued are handled, or
+        at once (discarding them) when it is dropped for falling behind.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self.dropped = dropped
+            if dropped:
+                self._queue.clear()
+            self._queue.append(None)
+            self._condition.notify()
+
+        if dropped and self.on_drop is not None:
+            self.on_drop()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                batch = self._queue.popleft()
+            if batch is None:
+                return
+
+            try:
+                self.callback(batch)
+            except Exception:
+                logger.exception("Event consumer of %s failed", self.channel)
+
+
+@dataclass
+class InProcessEventBroker(IEventBroker):
+    """
+    Event broker fanning messages out to the subscribers of this process.
+
+    Published messages are collected per channel and sent as one batch when
+    `batch_size` messages are waiting, or after at most `batch_interval`
+    seconds. Each subscriber has a queue of at most `max_queued_batches`
+    batches; one that is full when a batch is sent is dropped.
+    """
+
+    batch_size: int = 500
+    batch_interval: float = 0.01
+    max_queued_batches: int = 1000
+    _consumers: Dict[str, List[EventConsumer]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _pending: Dict[str, List[Any]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _metrics: Dict[str, ChannelMetrics] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _flusher: Optional[Any] = field(default=None, init=False, repr=False)
+    _closed: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def _channel_metrics(self, channel: str) -> ChannelMetrics:
+        metrics = self._metrics.get(channel)
+        if metrics is None:
+            metrics = self._metrics.setdefault(channel, ChannelMetrics())
+        return metrics
+
+    def publish(self, channel: str, message: Any) -> None:
+        with self._lock:
+            pending = self._pending.setdefault(channel, [])
+            pending.append(message)
+            self._channel_metrics(channel).published += 1
+            batch = None
+            if len(pending) >= self.batch_size:
+                batch = self._pending.pop(channel)
+            elif self._flusher is None and not self._closed:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically,
+                    name="event-broker-flusher",
+                    daemon=True,
+                )
+                self._flusher.start()
+
+        if batch is not None:
+            self.dispatch(channel, batch)
+
+    def _flush_periodically(self) -> None:
+        while not self._closed:
+            time.sleep(self.batch_interval)
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for channel, batch in pending.items():
+            self.dispatch(channel, batch)
+
+    def dispatch(self, channel: str, batch: List[Any]) -> None:
+        """
+        Hands a batch to every subscriber of a channel now, dropping those
+        whose queue is full. Used by the cross-process brokers to deliver the
+        batches they receive.
+        """
+        consumers = self._consumers.get(channel)
+        metrics = self._channel_metrics(channel)
+        metrics.batches += 1
+        if not consumers:
+            return
+
+        for consumer in list(consumers):
+            if consumer.offer(batch):
+                metrics.delivered += len(batch)
+                continue
+
+            logger.warning("Dropping a slow consumer of %s", channel)
+            consumer.close(dropped=True)
+            self.unsubscribe(consumer)
+            metrics.dropped_consumers += 1
+
+    def subscribe(
+        self,
+        channel: str,
+        callback: Callable[[List[Any]], None],
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> EventConsumer:
+        consumer = EventConsumer(
+            channel, callback, self.max_queued_batches, on_drop=on_drop
+        )
+        with self._lock:
+            # Copied on write, so dispatch can iterate without the lock
+            consumers = [*self._consumers.get(channel, []), consumer]
+            self._consumers[channel] = consumers
+            self._channel_metrics(channel).consumers = len(consumers)
+        return consumer
+
+    def unsubscribe(self, subscription: EventConsumer) -> None:
+        channel = subscription.channel
+        with self._lock:
+            consumers = [
+                consumer
+                for consumer in self._consumers.get(channel, [])
+                if consumer is not subscription
+            ]
+            self._consumers[channel] = consumers
+            self._channel_metrics(channel).consumers = len(consumers)
+        subscription.close()
+
+    def close(self) -> None:
+        self._closed = True
+        self.flush()
+        with self._lock:
+            consumers = [c for cs in self._consumers.values() for c in cs]
+            self._consumers = {}
+        for consumer in consumers:
+            consumer.close()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            metrics = dict(self._metrics)
+        return {channel: m.to_dict() for channel, m in metrics.items()}
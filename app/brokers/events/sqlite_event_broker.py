@@ -0,0 +1,212 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.brokers.events.i_event_broker import ChannelMetrics, IEventBroker
+from app.brokers.events.in_process_event_broker import (
+    EventConsumer,
+    InProcessEventBroker,
+)
+from app.services.util.make_serializable import serialize_scalar
+
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+@dataclass
+class SQLiteEventBroker(IEventBroker):
+    """
+    Event broker shared by the processes of one host through a SQLite
+    database in WAL mode, so readers never block the writer.
+
+    Published messages are JSON encoded and inserted in batches of up to
+    `batch_size`, one transaction each, at least every `batch_interval`
+    seconds. Each process polls the table every `poll_interval` seconds for
+    rows after the last it read and fans them out to its own subscribers,
+    dropping slow ones as the in-process broker does. Rows older than
+    `retention` seconds are deleted.
+    """
+
+    path: str
+    batch_size: int = 500
+    batch_interval: float = 0.01
+    poll_interval: float = 0.02
+    max_queued_batches: int = 1000
+    retention: float = 60.0
+    _pending: List[Tuple[str, str, float]] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _published: Dict[str, int] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _last_id: Optional[int] = field(default=None, init=False, repr=False)
+    _last_cleanup: float = field(default=0.0, init=False, repr=False)
+    _flusher: Optional[Any] = field(default=None, init=False, repr=False)
+    _poller: Optional[Any] = field(default=None, init=False, repr=False)
+    _closed: bool = field(default=False, init=False, repr=False)
+    _started_at: float = field(
+        default_factory=time.monotonic, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        self._local = InProcessEventBroker(
+            batch_size=self.batch_size,
+            batch_interval=self.batch_interval,
+            max_queued_batches=self.max_queued_batches,
+        )
+        self._lock = threading.Lock()
+        self._connections = threading.local()
+
+        connection = self._connect()
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(_SCHEMA)
+        connection.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread, as sqlite3 connections are not shared
+        connection = getattr(self._connections, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.connection = connection
+        return connection
+
+    def publish(self, channel: str, message: Any) -> None:
+        payload = json.dumps(
+            message, default=serialize_scalar, separators=(",", ":")
+        )
+        with self._lock:
+            self._pending.append((channel, payload, time.time()))
+            self._published[channel] = self._published.get(channel, 0) + 1
+            full = len(self._pending) >= self.batch_size
+            if self._flusher is None and not self._closed:
+                self._flusher = threading.Thread(
+                    target=self._flush_periodically,
+                    name="event-broker-flusher",
+                    daemon=True,
+                )
+                self._flusher.start()
+
+        if full:
+            self.flush()
+
+    def _flush_periodically(self) -> None:
+        while not self._closed:
+            time.sleep(self.batch_interval)
+            try:
+                self.flush()
+            except sqlite3.Error:
+                logger.exception("Could not write events to %s", self.path)
+
+    def flush(self) -> None:
+        with self._lock:
+            rows, self._pending = self._pending, []
+        if not rows:
+            return
+
+        connection = self._connect()
+        with connection:  # One transaction per batch
+            connection.executemany(
+                "INSERT INTO events (channel, payload, created_at) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+
+        now = time.time()
+        if now - self._last_cleanup >= 1.0:
+            self._last_cleanup = now
+            with connection:
+                connection.execute(
+                    "DELETE FROM events WHERE created_at < ?",
+                    (now - self.retention,),
+                )
+
+    def _poll_periodically(self) -> None:
+        while not self._closed:
+            try:
+                self.poll()
+            except sqlite3.Error:
+                logger.exception("Could not read events from %s", self.path)
+            time.sleep(self.poll_interval)
+
+    def poll(self) -> int:
+        """
+        Reads the rows written since the last poll, by any process, and hands
+        them to this process's subscribers. Returns the number of rows read.
+        """
+        rows = (
+            self._connect()
+            .execute(
+                "SELECT id, channel, payload FROM events WHERE id > ? "
+                "ORDER BY id LIMIT ?",
+                (self._last_id or 0, self.batch_size * 20),
+            )
+            .fetchall()
+        )
+        if not rows:
+            return 0
+        self._last_id = rows[-1][0]
+
+        batches: Dict[str, List[Any]] = {}
+        for _, channel, payload in rows:
+            batches.setdefault(channel, []).append(json.loads(payload))
+        for channel, batch in batches.items():
+            self._local.dispatch(channel, batch)
+        return len(rows)
+
+    def subscribe(
+        self,
+        channel: str,
+        callback: Callable[[List[Any]], None],
+        on_drop: Optional[Callable[[], None]] = None,
+    ) -> EventConsumer:
+        with self._lock:
+            if self._poller is None:
+                # Only rows published from now on are delivered
+                self._last_id = (
+                    self._connect()
+                    .execute("SELECT COALESCE(MAX(id), 0) FROM events")
+                    .fetchone()[0]
+                )
+                self._poller = threading.Thread(
+                    target=self._poll_periodically,
+                    name="event-broker-poller",
+                    daemon=True,
+                )
+                self._poller.start()
+        return self._local.subscribe(channel, callback, on_drop=on_drop)
+
+    def unsubscribe(self, subscription: EventConsumer) -> None:
+        self._local.unsubscribe(subscription)
+
+    def close(self) -> None:
+        self._closed = True
+        self.flush()
+        self._local.close()
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        metrics = self._local.metrics()
+        with self._lock:
+            published = dict(self._published)
+        # Published here and sent through the database, rather than locally
+        seconds = max(time.monotonic() - self._started_at, 1e-9)
+        for channel, count in published.items():
+            channel_metrics = metrics.setdefault(
+                channel, ChannelMetrics().to_dict()
+            )
+            channel_metrics["published"] = count
+            channel_metrics["published_per_second"] = count / seconds
+        return metrics
@@ -0,0 +1,46 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Union
+
+
+@contextmanager
+def atomic_write_path(file_path: Union[str, os.PathLike[str]]) -> Iterator[str]:
+    """
+    Yields a temporary path next to `file_path` and renames it over
+    `file_path` once the block succeeds, so readers never see a partly
+    written file. The temporary file is removed if the block fails.
+    """
+    file_path = os.fspath(file_path)
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(
+        dir=directory,
+        prefix=f".{os.path.basename(file_path)}.",
+        suffix=".tmp",
+    )
+    os.close(fd)
+
+    try:
+        yield temp_path
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def append_bytes(file_path: Union[str, os.PathLike[str]], payload: bytes) -> None:
+    """
+    Appends an already serialized payload to the end of a file in a single
+    write. If the write fails the file is truncated back to its previous
+    size, so it never ends with a partial payload.
+    """
+    with open(file_path, "ab") as file:
+        size = file.tell()
+        try:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+        except BaseException:
+            file.truncate(size)
+            raise
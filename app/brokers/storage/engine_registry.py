@@ -0,0 +1,56 @@
+from threading import Lock
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+
+# (connection string, engine options) -> Engine, shared by the whole process
+_engines: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Engine] = {}
+_engines_lock = Lock()
+
+
+def _registry_key(
+    connection_string: str, engine_options: Dict[str, Any]
+) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    # Option values may be unhashable (e.g. connect_args), so they are keyed
+    # by their repr.
+    return connection_string, tuple(
+        sorted((name, repr(value)) for name, value in engine_options.items())
+    )
+
+
+def get_engine(connection_string: str, **engine_options: Any) -> Engine:
+    """
+    Returns the process-wide engine for a connection string and set of
+    engine options, creating it (and its connection pool) on first use.
+
+    Parameters:
+        connection_string (str): The database URL.
+        **engine_options (Any): Keyword arguments for `create_engine`, such as
+            `pool_size`, `max_overflow`, `pool_recycle` or `pool_pre_ping`.
+
+    Returns:
+        Engine: The shared engine.
+    """
+    key = _registry_key(connection_string, engine_options)
+    engine = _engines.get(key)
+    if engine is None:
+        with _engines_lock:
+            engine = _engines.get(key)
+            if engine is None:
+                engine = create_engine(connection_string, **engine_options)
+                _engines[key] = engine
+    return engine
+
+
+def dispose_engines() -> None:
+    """
+    Disposes the connection pools of every registered engine and empties the
+    registry, e.g. after forking worker processes or in test teardown.
+    """
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+
+    for engine in engines:
+        engine.dispose()
@@ -3,7 +3,7 @@ A base class for interfacing with data storage formats (e.g json, sql,
  excel or csv).
 """
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Iterator
 
 
 class IStorageBroker(ABC):
@@ -15,6 +15,17 @@ class IStorageBroker(ABC):
     def read(self, *args: Any, **kwargs: Any) -> Any:
         pass
 
+    def read_chunks(
+        self, *args: Any, chunksize: int = 100_000, **kwargs: Any
+    ) -> Iterator[Any]:
+        """
+        Yields the stored data in chunks of at most `chunksize` rows, so large
+        datasets can be processed with bounded memory. Brokers whose format
+        cannot be read incrementally yield the result of `read` as a single
+        chunk.
+        """
+        yield self.read(*args, **kwargs)
+
     @abstractmethod
     def update(self, *args: Any, **kwargs: Any) -> Any:
         pass
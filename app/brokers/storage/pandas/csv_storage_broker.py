@@ -1,8 +1,10 @@
+import csv
 import os
-from typing import Any, Union
+from typing import Any, Iterator, List, Optional, Union
 
 import pandas as pd
 
+from app.brokers.storage.atomic_write import append_bytes, atomic_write_path
 from app.brokers.storage.i_storage_broker import IStorageBroker
 
 
@@ -16,8 +18,10 @@ class PandasCsvStorageBroker(IStorageBroker):
         Writes a pandas DataFrame to a CSV file. If the file already exists, it will be overwritten.
     read(file_path: Union[str, os.PathLike[str]], *args: Any, **kwargs: Any) -> pd.DataFrame:
         Reads the CSV file and returns a pandas DataFrame.
+    read_chunks(file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None, *args: Any, **kwargs: Any) -> Iterator[pd.DataFrame]:
+        Reads the CSV file in chunks of rows.
     update(file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
-        Appends new data to the existing data in the CSV file.
+        Appends new rows to the end of the CSV file without reading the existing data.
     delete(file_path: Union[str, os.PathLike[str]], condition: Any, *args: Any, **kwargs: Any) -> None:
         Removes rows that satisfy a certain condition from the CSV file.
     """
@@ -25,6 +29,7 @@ class PandasCsvStorageBroker(IStorageBroker):
     def create(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         """
         Writes a pandas DataFrame to a CSV file. If the file already exists, it will be overwritten.
+        The file is written to a temporary file first and renamed into place.
 
         Parameters
         ----------
@@ -37,7 +42,8 @@ class PandasCsvStorageBroker(IStorageBroker):
         **kwargs : Any
             Arbitrary keyword arguments.
         """
-        data.to_csv(file_path, *args, **kwargs)
+        with atomic_write_path(file_path) as temp_path:
+            data.to_csv(temp_path, *args, **kwargs)
 
     def read(self, file_path: Union[str, os.PathLike[str]], *args: Any, **kwargs: Any) -> pd.DataFrame:
         """
@@ -59,9 +65,39 @@ class PandasCsvStorageBroker(IStorageBroker):
         """
         return pd.read_csv(file_path, *args, **kwargs)
 
+    def read_chunks(self, file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None, *args: Any, **kwargs: Any) -> Iterator[pd.DataFrame]:
+        """
+        Reads the CSV file in chunks of rows, so only one chunk is held in memory at a time.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the CSV file.
+        chunksize : int
+            Number of rows per chunk.
+        columns : Optional[List[str]]
+            Only read these columns.
+        *args : Any
+            Variable length argument list.
+        **kwargs : Any
+            Arbitrary keyword arguments.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next chunk of rows.
+        """
+        with pd.read_csv(file_path, *args, chunksize=chunksize, usecols=columns, **kwargs) as reader:
+            yield from reader
+
     def update(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         """
-        Appends new data to the existing data in the CSV file.
+        Appends new rows to the end of the CSV file without reading the existing data.
+
+        Only the header line of the file is read. The columns of `data` are checked against it and
+        reordered to match; a different set of columns raises a ValueError. The rows are serialized
+        before the file is touched and appended in a single write that is rolled back on failure.
+        If the file does not exist yet, it is created with a header.
 
         Parameters
         ----------
@@ -72,11 +108,49 @@ class PandasCsvStorageBroker(IStorageBroker):
         *args : Any
             Variable length argument list.
         **kwargs : Any
-            Arbitrary keyword arguments.
+            Arbitrary keyword arguments. Use the same `to_csv` arguments (e.g. `index`, `sep`) as `create`.
+        """
+        kwargs.pop("mode", None)
+        kwargs.pop("header", None)
+
+        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+            self.create(file_path, data, *args, **kwargs)
+            return
+
+        sep = kwargs.get("sep", ",")
+        encoding = kwargs.get("encoding") or "utf-8"
+
+        existing_header = self._read_header(file_path, sep, encoding)
+        expected_header = self._parse_header(data.head(0).to_csv(None, *args, **kwargs), sep)
+
+        if existing_header != expected_header:
+            data = self._match_columns(data, existing_header, expected_header)
+
+        payload = data.to_csv(None, *args, header=False, **kwargs)
+        append_bytes(file_path, payload.encode(encoding))
+
+    def _read_header(self, file_path: Union[str, os.PathLike[str]], sep: str, encoding: str) -> List[str]:
+        with open(file_path, "r", encoding=encoding, newline="") as csv_file:
+            return next(csv.reader(csv_file, delimiter=sep), [])
+
+    def _parse_header(self, header: str, sep: str) -> List[str]:
+        return next(csv.reader(header.splitlines(), delimiter=sep), [])
+
+    def _match_columns(self, data: pd.DataFrame, existing_header: List[str], expected_header: List[str]) -> pd.DataFrame:
         """
-        existing_data = self.read(file_path)
-        updated_data = existing_data.append(data)
-        self.create(file_path, updated_data, *args, **kwargs)
+        Reorders the columns of `data` to the column order of the file, or raises a ValueError if the
+        file has a different set of columns.
+        """
+        index_width = len(expected_header) - len(data.columns)
+        columns_by_name = {str(column): column for column in data.columns}
+        file_columns = existing_header[index_width:]
+
+        if existing_header[:index_width] != expected_header[:index_width] or sorted(file_columns) != sorted(columns_by_name):
+            raise ValueError(
+                f"Columns {expected_header} do not match the columns {existing_header} of the CSV file."
+            )
+
+        return data[[columns_by_name[name] for name in file_columns]]
 
     def delete(self, file_path: Union[str, os.PathLike[str]], condition: Any, *args: Any, **kwargs: Any) -> None:
         """
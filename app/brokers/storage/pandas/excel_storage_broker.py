@@ -1,7 +1,8 @@
 import os
-from typing import Any, Union
+from typing import Any, Iterator, List, Optional, Union
 
 import pandas as pd
+from openpyxl import load_workbook
 
 from app.brokers.storage.i_storage_broker import IStorageBroker
 
@@ -16,6 +17,8 @@ class PandasExcelStorageBroker(IStorageBroker):
         Writes a pandas DataFrame to an Excel file. If the file already exists, it will be overwritten.
     read(file_path: Union[str, os.PathLike[str]], *args: Any, **kwargs: Any) -> pd.DataFrame:
         Reads the Excel file and returns a pandas DataFrame.
+    read_chunks(file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None, sheet_name: Union[str, int] = 0) -> Iterator[pd.DataFrame]:
+        Reads a sheet of an .xlsx file in chunks of rows.
     update(file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         Appends new data to the existing data in the Excel file.
     delete(file_path: Union[str, os.PathLike[str]], condition: Any, *args: Any, **kwargs: Any) -> None:
@@ -59,6 +62,54 @@ class PandasExcelStorageBroker(IStorageBroker):
         """
         return pd.read_excel(file_path, *args, **kwargs)
 
+    def read_chunks(self, file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None, sheet_name: Union[str, int] = 0) -> Iterator[pd.DataFrame]:
+        """
+        Reads a sheet of an .xlsx file in chunks of rows. The workbook is opened in openpyxl's
+        read-only mode, which streams the sheet instead of loading every cell into memory.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the Excel file.
+        chunksize : int
+            Number of rows per chunk.
+        columns : Optional[List[str]]
+            Only keep these columns.
+        sheet_name : Union[str, int]
+            The name or position of the sheet, the first sheet by default. The first row of the
+            sheet is the header.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next chunk of rows.
+        """
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+            rows = worksheet.iter_rows(values_only=True)
+
+            header = next(rows, None)
+            if header is None:
+                return
+            # Same names pandas.read_excel gives to blank header cells
+            names = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= chunksize:
+                    yield self._to_frame(chunk, names, columns)
+                    chunk = []
+            if chunk:
+                yield self._to_frame(chunk, names, columns)
+        finally:
+            workbook.close()
+
+    def _to_frame(self, rows: List[tuple], names: List[Any], columns: Optional[List[str]]) -> pd.DataFrame:
+        data = pd.DataFrame.from_records(rows, columns=names)
+        return data if columns is None else data[columns]
+
     def update(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         """
         Appends new data to the existing data in the Excel file.
@@ -0,0 +1,186 @@
+import os
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Union
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+
+from app.brokers.storage.atomic_write import atomic_write_path
+from app.brokers.storage.i_storage_broker import IStorageBroker
+from app.brokers.storage.pandas.frame_rows import append_rows, drop_rows
+
+
+@dataclass
+class PandasFeatherStorageBroker(IStorageBroker):
+    """
+    A class to interface with Feather (Arrow IPC) files using pandas and pyarrow.
+
+    Files are written uncompressed, so reads can memory-map them: the Arrow buffers point straight
+    into the operating system's page cache, and every process reading the same file shares those
+    pages instead of holding a private copy. Numeric columns without nulls are converted to pandas
+    without copying. Files are only ever replaced by an atomic rename, never rewritten in place, so
+    readers that still have the previous version mapped are not affected by a write.
+
+    Attributes
+    ----------
+    compression : str
+        "uncompressed" (required for zero-copy reads), "lz4" or "zstd".
+    chunksize : int
+        Number of rows per record batch written.
+
+    Methods
+    -------
+    create(file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
+        Writes a pandas DataFrame to a Feather file. If the file already exists, it will be replaced.
+    read(file_path: Union[str, os.PathLike[str]], *args: Any, columns: Optional[List[str]] = None, **kwargs: Any) -> pd.DataFrame:
+        Memory-maps the Feather file and returns a pandas DataFrame.
+    read_table(file_path: Union[str, os.PathLike[str]], columns: Optional[List[str]] = None) -> pa.Table:
+        Memory-maps the Feather file and returns a pyarrow Table.
+    read_chunks(file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        Reads the Feather file one record batch at a time.
+    update(file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
+        Appends new data to the existing data in the Feather file.
+    delete(file_path: Union[str, os.PathLike[str]], condition: Any, *args: Any, **kwargs: Any) -> None:
+        Removes rows that satisfy a certain condition from the Feather file.
+    """
+
+    compression: str = "uncompressed"
+    chunksize: int = 65_536
+
+    def create(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
+        """
+        Writes a pandas DataFrame to a Feather file. If the file already exists, it will be replaced.
+        The file is written to a temporary file first and renamed into place.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the Feather file.
+        data : pd.DataFrame
+            The data to write to the Feather file.
+        *args : Any
+            Variable length argument list.
+        **kwargs : Any
+            Arbitrary keyword arguments.
+        """
+        table = pa.Table.from_pandas(data, preserve_index=kwargs.pop("index", None))
+        kwargs.setdefault("compression", self.compression)
+        kwargs.setdefault("chunksize", self.chunksize)
+
+        with atomic_write_path(file_path) as temp_path:
+            feather.write_feather(table, temp_path, *args, **kwargs)
+
+    def read(self, file_path: Union[str, os.PathLike[str]], *args: Any, columns: Optional[List[str]] = None, **kwargs: Any) -> pd.DataFrame:
+        """
+        Memory-maps the Feather file and returns a pandas DataFrame.
+
+        Columns are converted block by block (`split_blocks=True`) so pandas does not consolidate
+        them into new arrays, which keeps the conversion zero-copy where the column types allow.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the Feather file.
+        *args : Any
+            Variable length argument list.
+        columns : Optional[List[str]]
+            Only read these columns.
+        **kwargs : Any
+            Arbitrary keyword arguments passed to `pyarrow.Table.to_pandas`.
+
+        Returns
+        -------
+        pd.DataFrame
+            The data from the Feather file.
+        """
+        kwargs.setdefault("split_blocks", True)
+        return self.read_table(file_path, columns).to_pandas(*args, **kwargs)
+
+    def read_table(self, file_path: Union[str, os.PathLike[str]], columns: Optional[List[str]] = None) -> pa.Table:
+        """
+        Memory-maps the Feather file and returns a pyarrow Table backed by the mapped pages.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the Feather file.
+        columns : Optional[List[str]]
+            Only read these columns.
+
+        Returns
+        -------
+        pa.Table
+            The data from the Feather file.
+        """
+        # The mapping stays open for as long as the returned buffers reference it
+        source = pa.memory_map(os.fspath(file_path), "r")
+        table = ipc.open_file(source).read_all()
+        return table if columns is None else table.select(columns)
+
+    def read_chunks(self, file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Reads the Feather file one record batch at a time from the memory map, so only the pages of
+        the current batch are touched.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the Feather file.
+        chunksize : int
+            Maximum number of rows per chunk. Chunks never span record batches.
+        columns : Optional[List[str]]
+            Only read these columns.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next chunk of rows.
+        """
+        reader = ipc.open_file(pa.memory_map(os.fspath(file_path), "r"))
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for offset in range(0, batch.num_rows, chunksize):
+                yield batch.slice(offset, chunksize).to_pandas(split_blocks=True)
+
+    def update(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
+        """
+        Appends new data to the existing data in the Feather file and atomically replaces it.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the Feather file.
+        data : pd.DataFrame
+            The data to append to the Feather file.
+        *args : Any
+            Variable length argument list.
+        **kwargs : Any
+            Arbitrary keyword arguments.
+        """
+        existing_data = self.read(file_path)
+        updated_data = append_rows(existing_data, data)
+        self.create(file_path, updated_data, *args, **kwargs)
+
+    def delete(self, file_path: Union[str, os.PathLike[str]], condition: Any, *args: Any, **kwargs: Any) -> None:
+        """
+        Removes rows that satisfy a certain condition from the Feather file and atomically replaces it.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the Feather file.
+        condition : Any
+            The condition to satisfy for rows to be removed: a boolean mask, or a callable returning
+            one from the DataFrame.
+        *args : Any
+            Variable length argument list.
+        **kwargs : Any
+            Arbitrary keyword arguments.
+        """
+        data = self.read(file_path)
+        data = drop_rows(data, condition)
+        self.create(file_path, data, *args, **kwargs)
@@ -0,0 +1,59 @@
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def _has_default_index(data: pd.DataFrame) -> bool:
+    # Numbered 0..n-1, which some formats read back as a plain integer index
+    index = data.index
+    return index.name is None and index.equals(pd.RangeIndex(len(index)))
+
+
+def append_rows(existing_data: pd.DataFrame, data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Appends rows to a DataFrame read from a file.
+
+    When both frames have the default index (numbered 0..n-1) the result is renumbered, so its
+    labels stay unique. Any other index, such as timestamps or ids, is kept as it is.
+
+    Parameters
+    ----------
+    existing_data : pd.DataFrame
+        The rows already stored.
+    data : pd.DataFrame
+        The rows to append.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows of both frames.
+    """
+    ignore_index = _has_default_index(existing_data) and _has_default_index(data)
+    return pd.concat([existing_data, data], ignore_index=ignore_index)
+
+
+def drop_rows(data: pd.DataFrame, condition: Any) -> pd.DataFrame:
+    """
+    Removes the rows of a DataFrame that satisfy a condition.
+
+    The rows are picked by position, so rows that share an index label are told apart. The default
+    index (numbered 0..n-1) is renumbered; any other index is kept.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        The rows read from a file.
+    condition : Any
+        A boolean mask with one value per row, or a callable returning one from the DataFrame.
+
+    Returns
+    -------
+    pd.DataFrame
+        The rows that do not satisfy the condition.
+    """
+    mask = condition(data) if callable(condition) else condition
+    remaining = data.loc[~np.asarray(mask, dtype=bool)]
+    if _has_default_index(data):
+        remaining = remaining.reset_index(drop=True)
+    return remaining
@@ -1,30 +1,54 @@
 import os
-from typing import Any, Union
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Union
 
 import pandas as pd
 
 from app.brokers.storage.i_storage_broker import IStorageBroker
+from app.brokers.storage.pandas.frame_rows import append_rows, drop_rows
 
 
+@dataclass
 class PandasHdfStorageBroker(IStorageBroker):
     """
     A class to interface with HDF files using pandas.
 
+    With `format="table"` keys are stored as PyTables tables: `update` appends rows with
+    `HDFStore.append`, `delete` removes rows with `HDFStore.remove(where=...)` and `read` selects rows
+    and columns with `HDFStore.select(where=..., columns=...)`, none of which load the whole key.
+    Queries on `data_columns` use their on-disk index.
+
+    Attributes
+    ----------
+    format : str
+        "fixed" (the pandas default) or "table".
+    data_columns : Optional[Union[List[str], bool]]
+        Columns of a table to store as indexed, queryable data columns (True for all columns).
+
     Methods
     -------
     create(file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, key: str, *args: Any, **kwargs: Any) -> None:
-        Writes a pandas DataFrame to an HDF file. If the file already exists, it will be overwritten.
-    read(file_path: Union[str, os.PathLike[str]], key: str, *args: Any, **kwargs: Any) -> pd.DataFrame:
+        Writes a pandas DataFrame to an HDF file. If the key already exists, it will be overwritten.
+    read(file_path: Union[str, os.PathLike[str]], key: str, *args: Any, where: Any = None, columns: Optional[List[str]] = None, **kwargs: Any) -> pd.DataFrame:
         Reads the HDF file and returns a pandas DataFrame.
+    read_chunks(file_path: Union[str, os.PathLike[str]], key: str, chunksize: int = 100_000, where: Any = None, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        Reads a key in chunks of rows.
     update(file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, key: str, *args: Any, **kwargs: Any) -> None:
         Appends new data to the existing data in the HDF file.
     delete(file_path: Union[str, os.PathLike[str]], condition: Any, key: str, *args: Any, **kwargs: Any) -> None:
         Removes rows that satisfy a certain condition from the HDF file.
     """
 
+    format: str = "fixed"
+    data_columns: Optional[Union[List[str], bool]] = None
+
+    @property
+    def is_table(self) -> bool:
+        return self.format in ("table", "t")
+
     def create(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, key: str, *args: Any, **kwargs: Any) -> None:
         """
-        Writes a pandas DataFrame to an HDF file. If the file already exists, it will be overwritten.
+        Writes a pandas DataFrame to an HDF file. If the key already exists, it will be overwritten.
 
         Parameters
         ----------
@@ -39,9 +63,12 @@ class PandasHdfStorageBroker(IStorageBroker):
         **kwargs : Any
             Arbitrary keyword arguments.
         """
-        data.to_hdf(file_path, key, *args, **kwargs)
+        if self.is_table:
+            kwargs.setdefault("format", "table")
+            kwargs.setdefault("data_columns", self.data_columns)
+        data.to_hdf(file_path, key=key, *args, **kwargs)
 
-    def read(self, file_path: Union[str, os.PathLike[str]], key: str, *args: Any, **kwargs: Any) -> pd.DataFrame:
+    def read(self, file_path: Union[str, os.PathLike[str]], key: str, *args: Any, where: Any = None, columns: Optional[List[str]] = None, **kwargs: Any) -> pd.DataFrame:
         """
         Reads the HDF file and returns a pandas DataFrame.
 
@@ -53,6 +80,10 @@ class PandasHdfStorageBroker(IStorageBroker):
             Identifier for the group in the store.
         *args : Any
             Variable length argument list.
+        where : Any
+            A query such as `"amount > 100 & category == 'a'"`, evaluated by PyTables. Table format only.
+        columns : Optional[List[str]]
+            Only read these columns. Table format only.
         **kwargs : Any
             Arbitrary keyword arguments.
 
@@ -61,11 +92,50 @@ class PandasHdfStorageBroker(IStorageBroker):
         pd.DataFrame
             The data from the HDF file.
         """
+        if where is not None or columns is not None:
+            with pd.HDFStore(file_path, mode="r") as store:
+                return store.select(key, where=where, columns=columns, *args, **kwargs)
+
         return pd.read_hdf(file_path, key, *args, **kwargs)
 
+    def read_chunks(self, file_path: Union[str, os.PathLike[str]], key: str, chunksize: int = 100_000, where: Any = None, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+        """
+        Reads a key in chunks of rows. Table-format keys are read incrementally, so scanning a large
+        key keeps memory bounded; fixed-format keys can only be loaded whole and are then split.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the HDF file.
+        key : str
+            Identifier for the group in the store.
+        chunksize : int
+            Number of rows per chunk.
+        where : Any
+            A query evaluated by PyTables. Table format only.
+        columns : Optional[List[str]]
+            Only read these columns.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next chunk of rows.
+        """
+        with pd.HDFStore(file_path, mode="r") as store:
+            if store.get_storer(key).is_table:
+                yield from store.select(key, where=where, columns=columns, iterator=True, chunksize=chunksize)
+                return
+
+            data = store.select(key)
+            if columns is not None:
+                data = data[columns]
+            for start in range(0, len(data), chunksize):
+                yield data.iloc[start:start + chunksize]
+
     def update(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, key: str, *args: Any, **kwargs: Any) -> None:
         """
-        Appends new data to the existing data in the HDF file.
+        Appends new data to the existing data in the HDF file. For the table format the rows are
+        appended to the table without reading it.
 
         Parameters
         ----------
@@ -80,8 +150,14 @@ class PandasHdfStorageBroker(IStorageBroker):
         **kwargs : Any
             Arbitrary keyword arguments.
         """
+        if self.is_table:
+            kwargs.setdefault("data_columns", self.data_columns)
+            with pd.HDFStore(file_path) as store:
+                store.append(key, data, *args, **kwargs)
+            return
+
         existing_data = self.read(file_path, key)
-        updated_data = existing_data.append(data)
+        updated_data = append_rows(existing_data, data)
         self.create(file_path, updated_data, key, *args, **kwargs)
 
     def delete(self, file_path: Union[str, os.PathLike[str]], condition: Any, key: str, *args: Any, **kwargs: Any) -> None:
@@ -93,14 +169,27 @@ class PandasHdfStorageBroker(IStorageBroker):
         file_path : Union[str, os.PathLike[str]]
             The path to the HDF file.
         condition : Any
-            The condition to satisfy for rows to be removed.
+            The condition to satisfy for rows to be removed: a boolean mask, or a callable returning
+            one from the DataFrame. For the table format, a PyTables query such as `"amount > 100"`.
         key : str
             Identifier for the group in the store.
         *args : Any
             Variable length argument list.
         **kwargs : Any
             Arbitrary keyword arguments.
+
+        Raises
+        ------
+        ValueError
+            If the format is table and there is no condition, which would remove the whole key.
         """
+        if self.is_table:
+            if condition is None:
+                raise ValueError("A condition is required to delete rows from a table")
+            with pd.HDFStore(file_path) as store:
+                store.remove(key, where=condition)
+            return
+
         data = self.read(file_path, key)
-        data = data.drop(data[condition].index)
+        data = drop_rows(data, condition)
         self.create(file_path, data, key, *args, **kwargs)
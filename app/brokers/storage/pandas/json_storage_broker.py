@@ -1,5 +1,5 @@
 import os
-from typing import Any, Union
+from typing import Any, Iterator, List, Optional, Union
 
 import pandas as pd
 
@@ -16,6 +16,8 @@ class PandasJsonStorageBroker(IStorageBroker):
         Writes a pandas DataFrame to a JSON file. If the file already exists, it will be overwritten.
     read(file_path: Union[str, os.PathLike[str]], *args: Any, **kwargs: Any) -> pd.DataFrame:
         Reads the JSON file and returns a pandas DataFrame.
+    read_chunks(file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None, *args: Any, **kwargs: Any) -> Iterator[pd.DataFrame]:
+        Reads a JSON lines file in chunks of rows.
     update(file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         Appends new data to the existing data in the JSON file.
     delete(file_path: Union[str, os.PathLike[str]], condition: Any, *args: Any, **kwargs: Any) -> None:
@@ -59,6 +61,33 @@ class PandasJsonStorageBroker(IStorageBroker):
         """
         return pd.read_json(file_path, *args, **kwargs)
 
+    def read_chunks(self, file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None, *args: Any, **kwargs: Any) -> Iterator[pd.DataFrame]:
+        """
+        Reads a JSON lines file (one record per line, as written by `create(..., orient="records",
+        lines=True)`) in chunks of rows, so only one chunk is held in memory at a time.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the JSON lines file.
+        chunksize : int
+            Number of rows per chunk.
+        columns : Optional[List[str]]
+            Only keep these columns.
+        *args : Any
+            Variable length argument list.
+        **kwargs : Any
+            Arbitrary keyword arguments.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next chunk of rows.
+        """
+        with pd.read_json(file_path, *args, lines=True, chunksize=chunksize, **kwargs) as reader:
+            for chunk in reader:
+                yield chunk if columns is None else chunk[columns]
+
     def update(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         """
         Appends new data to the existing data in the JSON file.
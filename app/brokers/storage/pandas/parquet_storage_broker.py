@@ -1,27 +1,53 @@
 import os
-from typing import Any, Union
+import shutil
+import uuid
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Union
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
+from app.brokers.storage.atomic_write import atomic_write_path
 from app.brokers.storage.i_storage_broker import IStorageBroker
+from app.brokers.storage.pandas.frame_rows import append_rows, drop_rows
 
 
+@dataclass
 class PandasParquetStorageBroker(IStorageBroker):
     """
     A class to interface with Parquet files using pandas.
 
+    By default each path is a single Parquet file. With `dataset=True` each path is a directory of
+    Parquet fragments, optionally hive-partitioned (`column=value/` sub-directories) by
+    `partition_cols`. Appends then write new fragments, and reads and deletes only touch the
+    fragments and row groups whose partition values and statistics can match their filters.
+
+    Attributes
+    ----------
+    dataset : bool
+        Store each path as a directory of Parquet fragments instead of a single file.
+    partition_cols : Optional[List[str]]
+        Columns to hive-partition a dataset by.
+
     Methods
     -------
     create(file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
-        Writes a pandas DataFrame to a Parquet file. If the file already exists, it will be overwritten.
-    read(file_path: Union[str, os.PathLike[str]], *args: Any, **kwargs: Any) -> pd.DataFrame:
-        Reads the Parquet file and returns a pandas DataFrame.
+        Writes a pandas DataFrame to a Parquet file or dataset. If it already exists, it will be overwritten.
+    read(file_path: Union[str, os.PathLike[str]], *args: Any, columns: Optional[List[str]] = None, filters: Any = None, **kwargs: Any) -> pd.DataFrame:
+        Reads the Parquet file or dataset and returns a pandas DataFrame.
+    read_chunks(file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None, filters: Any = None) -> Iterator[pd.DataFrame]:
+        Reads the Parquet file or dataset in batches of rows.
     update(file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
-        Appends new data to the existing data in the Parquet file.
+        Appends new data to the existing data in the Parquet file or dataset.
     delete(file_path: Union[str, os.PathLike[str]], condition: Any, *args: Any, **kwargs: Any) -> None:
-        Removes rows that satisfy a certain condition from the Parquet file.
+        Removes rows that satisfy a certain condition from the Parquet file or dataset.
     """
 
+    dataset: bool = False
+    partition_cols: Optional[List[str]] = None
+
     def create(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         """
         Writes a pandas DataFrame to a Parquet file. If the file already exists, it will be overwritten.
@@ -37,36 +63,87 @@ class PandasParquetStorageBroker(IStorageBroker):
         **kwargs : Any
             Arbitrary keyword arguments.
         """
-        data.to_parquet(file_path, *args, **kwargs)
+        if self.dataset:
+            # Build the new dataset next to the old one and swap them
+            temp_path = f"{os.fspath(file_path)}.{uuid.uuid4().hex}.tmp"
+            self._write_fragment(temp_path, data, **kwargs)
+            if os.path.exists(file_path):
+                old_path = f"{temp_path}.old"
+                os.replace(file_path, old_path)
+                os.replace(temp_path, file_path)
+                shutil.rmtree(old_path)
+            else:
+                os.replace(temp_path, file_path)
+            return
 
-    def read(self, file_path: Union[str, os.PathLike[str]], *args: Any, **kwargs: Any) -> pd.DataFrame:
+        with atomic_write_path(file_path) as temp_path:
+            data.to_parquet(temp_path, *args, **kwargs)
+
+    def read(self, file_path: Union[str, os.PathLike[str]], *args: Any, columns: Optional[List[str]] = None, filters: Any = None, **kwargs: Any) -> pd.DataFrame:
         """
-        Reads the Parquet file and returns a pandas DataFrame.
+        Reads the Parquet file or dataset and returns a pandas DataFrame.
 
         Parameters
         ----------
         file_path : Union[str, os.PathLike[str]]
-            The path to the Parquet file.
+            The path to the Parquet file or dataset directory.
         *args : Any
             Variable length argument list.
+        columns : Optional[List[str]]
+            Only read these columns.
+        filters : Any
+            Row filters in pyarrow DNF form (e.g. `[("year", "=", 2024), ("amount", ">", 100)]`) or a
+            `pyarrow.compute.Expression`. They are pushed down to partition values and row-group
+            statistics, so fragments and row groups that cannot match are skipped.
         **kwargs : Any
             Arbitrary keyword arguments.
 
         Returns
         -------
         pd.DataFrame
-            The data from the Parquet file.
+            The data from the Parquet file or dataset.
+        """
+        return pd.read_parquet(file_path, *args, columns=columns, filters=filters, **kwargs)
+
+    def read_chunks(self, file_path: Union[str, os.PathLike[str]], chunksize: int = 100_000, columns: Optional[List[str]] = None, filters: Any = None) -> Iterator[pd.DataFrame]:
         """
-        return pd.read_parquet(file_path, *args, **kwargs)
+        Reads the Parquet file or dataset in batches of rows, scanning one row group at a time so
+        only the current batch is held in memory.
+
+        Parameters
+        ----------
+        file_path : Union[str, os.PathLike[str]]
+            The path to the Parquet file or dataset directory.
+        chunksize : int
+            Maximum number of rows per chunk.
+        columns : Optional[List[str]]
+            Only read these columns.
+        filters : Any
+            Row filters in pyarrow DNF form or a `pyarrow.compute.Expression`, as for `read`.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next chunk of rows.
+        """
+        dataset = ds.dataset(os.fspath(file_path), format="parquet", partitioning="hive" if self.dataset else None)
+        if filters is not None and not isinstance(filters, ds.Expression):
+            filters = pq.filters_to_expression(filters)
+
+        for batch in dataset.to_batches(columns=columns, filter=filters, batch_size=chunksize):
+            if batch.num_rows:
+                yield batch.to_pandas()
 
     def update(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         """
-        Appends new data to the existing data in the Parquet file.
+        Appends new data to the existing data in the Parquet file or dataset.
+
+        In dataset mode the data is written as new fragments and the existing fragments are not read.
 
         Parameters
         ----------
         file_path : Union[str, os.PathLike[str]]
-            The path to the Parquet file.
+            The path to the Parquet file or dataset directory.
         data : pd.DataFrame
             The data to append to the Parquet file.
         *args : Any
@@ -74,26 +151,78 @@ class PandasParquetStorageBroker(IStorageBroker):
         **kwargs : Any
             Arbitrary keyword arguments.
         """
+        if self.dataset:
+            self._write_fragment(file_path, data, **kwargs)
+            return
+
         existing_data = self.read(file_path)
-        updated_data = existing_data.append(data)
+        updated_data = append_rows(existing_data, data)
         self.create(file_path, updated_data, *args, **kwargs)
 
     def delete(self, file_path: Union[str, os.PathLike[str]], condition: Any, *args: Any, **kwargs: Any) -> None:
         """
-        Removes rows that satisfy a certain condition from the Parquet file.
+        Removes rows that satisfy a certain condition from the Parquet file or dataset.
+
+        In dataset mode only the fragments that contain matching rows are rewritten (or removed once
+        empty); fragments ruled out by their partition values or statistics are not read.
 
         Parameters
         ----------
         file_path : Union[str, os.PathLike[str]]
-            The path to the Parquet file.
+            The path to the Parquet file or dataset directory.
         condition : Any
-            The condition to satisfy for rows to be removed.
+            The condition to satisfy for rows to be removed: a boolean mask, or a callable returning
+            one from the DataFrame. In dataset mode, filters in pyarrow DNF form or a
+            `pyarrow.compute.Expression`.
         *args : Any
             Variable length argument list.
         **kwargs : Any
             Arbitrary keyword arguments.
         """
+        if self.dataset:
+            self._delete_from_dataset(file_path, condition)
+            return
+
         data = self.read(file_path)
-        data = data.drop(data[condition].index)
+        data = drop_rows(data, condition)
         self.create(file_path, data, *args, **kwargs)
 
+    def _write_fragment(self, file_path: Union[str, os.PathLike[str]], data: pd.DataFrame, **kwargs: Any) -> None:
+        table = pa.Table.from_pandas(data, preserve_index=kwargs.pop("index", None))
+        pq.write_to_dataset(
+            table,
+            os.fspath(file_path),
+            partition_cols=self.partition_cols,
+            basename_template=f"part-{uuid.uuid4().hex}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+            **kwargs,
+        )
+
+    def _delete_from_dataset(self, file_path: Union[str, os.PathLike[str]], condition: Any) -> None:
+        expression = condition if isinstance(condition, ds.Expression) else pq.filters_to_expression(condition)
+        # Rows where the condition is null are kept, as they are not known to match
+        keep = ~expression | expression.is_null()
+
+        dataset = ds.dataset(os.fspath(file_path), format="parquet", partitioning="hive")
+        for fragment in dataset.get_fragments(filter=expression):
+            matches = ds.Scanner.from_fragment(fragment, schema=dataset.schema, filter=expression)
+            if not matches.count_rows():
+                continue
+
+            remaining = fragment.to_table(schema=dataset.schema, filter=keep)
+            if remaining.num_rows == 0:
+                os.remove(fragment.path)
+                self._remove_empty_partitions(file_path, os.path.dirname(fragment.path))
+                continue
+
+            # Partition columns live in the directory names, not in the fragment
+            remaining = remaining.select(fragment.physical_schema.names)
+            with atomic_write_path(fragment.path) as temp_path:
+                pq.write_table(remaining, temp_path)
+
+    def _remove_empty_partitions(self, file_path: Union[str, os.PathLike[str]], directory: str) -> None:
+        root = os.path.abspath(file_path)
+        directory = os.path.abspath(directory)
+        while directory != root and directory.startswith(root) and not os.listdir(directory):
+            os.rmdir(directory)
+            directory = os.path.dirname(directory)
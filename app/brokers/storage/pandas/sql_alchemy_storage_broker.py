@@ -1,27 +1,75 @@
-from typing import Any
+import sqlite3
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
 
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import MetaData, Table, delete, inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
 
+from app.brokers.storage.engine_registry import get_engine
 from app.brokers.storage.i_storage_broker import IStorageBroker
 
+# Maximum number of bound parameters in one SQLite statement
+SQLITE_MAX_VARIABLES = 32766 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999
 
+
+@dataclass
 class PandasSqlAlchemyStorageBroker(IStorageBroker):
     """
     A class to interface with SQL databases using SQLAlchemy and pandas.
 
+    Engines come from the process-wide engine registry, so every call for the same connection
+    string and `engine_options` shares one connection pool. Rows are written with multi-row
+    `INSERT` statements of up to `batch_size` rows, and `update` and `delete` run incrementally
+    on the server instead of rewriting the table.
+
+    Attributes
+    ----------
+    engine_options : Dict[str, Any]
+        Keyword arguments for `create_engine`, such as `pool_size` or `pool_pre_ping`.
+    batch_size : int
+        Maximum number of rows per `INSERT` statement.
+
     Methods
     -------
     create(connection_string: str, table_name: str, data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         Writes a pandas DataFrame to an SQL table. If the table already exists, it will be overwritten.
     read(connection_string: str, table_name: str, *args: Any, **kwargs: Any) -> pd.DataFrame:
         Reads the SQL table and returns a pandas DataFrame.
-    update(connection_string: str, table_name: str, data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
-        Appends new data to the existing data in the SQL table.
-    delete(connection_string: str, table_name: str, condition: str, *args: Any, **kwargs: Any) -> None:
+    read_chunks(connection_string: str, table_name: str, chunksize: int = 100_000, columns: Optional[List[str]] = None, *args: Any, **kwargs: Any) -> Iterator[pd.DataFrame]:
+        Reads the SQL table in chunks of rows.
+    update(connection_string: str, table_name: str, data: pd.DataFrame, *args: Any, key_column: Optional[str] = None, **kwargs: Any) -> None:
+        Appends new data to the SQL table, or upserts it on `key_column`.
+    delete(connection_string: str, table_name: str, condition: str, *args: Any, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
         Removes rows that satisfy a certain SQL condition from the SQL table.
     """
 
+    engine_options: Dict[str, Any] = field(default_factory=dict)
+    batch_size: int = 1000
+
+    def get_engine(self, connection_string: str) -> Engine:
+        """
+        Returns the shared engine for a connection string.
+        """
+        return get_engine(connection_string, **self.engine_options)
+
+    def get_chunksize(self, engine: Engine, data: pd.DataFrame, index: bool = True) -> int:
+        """
+        Returns the number of rows per multi-row `INSERT`, capped so a statement stays within
+        SQLite's limit on bound parameters.
+        """
+        chunksize = self.batch_size
+        if engine.dialect.name == "sqlite":
+            columns = len(data.columns) + (data.index.nlevels if index else 0)
+            chunksize = min(chunksize, SQLITE_MAX_VARIABLES // max(columns, 1))
+        return max(chunksize, 1)
+
+    def _to_sql(self, data: pd.DataFrame, table_name: str, engine: Engine, connection: Any, if_exists: str, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("method", "multi")
+        kwargs.setdefault("chunksize", self.get_chunksize(engine, data, kwargs.get("index", True)))
+        data.to_sql(table_name, connection, if_exists=if_exists, *args, **kwargs)
+
     def create(self, connection_string: str, table_name: str, data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
         """
         Writes a pandas DataFrame to an SQL table. If the table already exists, it will be overwritten.
@@ -39,8 +87,8 @@ class PandasSqlAlchemyStorageBroker(IStorageBroker):
         **kwargs : Any
             Arbitrary keyword arguments.
         """
-        engine = create_engine(connection_string)
-        data.to_sql(table_name, engine, if_exists='replace', *args, **kwargs)
+        engine = self.get_engine(connection_string)
+        self._to_sql(data, table_name, engine, engine, 'replace', *args, **kwargs)
 
     def read(self, connection_string: str, table_name: str, *args: Any, **kwargs: Any) -> pd.DataFrame:
         """
@@ -62,12 +110,44 @@ class PandasSqlAlchemyStorageBroker(IStorageBroker):
         pd.DataFrame
             The data from the SQL table.
         """
-        engine = create_engine(connection_string)
+        engine = self.get_engine(connection_string)
         return pd.read_sql_table(table_name, engine, *args, **kwargs)
 
-    def update(self, connection_string: str, table_name: str, data: pd.DataFrame, *args: Any, **kwargs: Any) -> None:
+    def read_chunks(self, connection_string: str, table_name: str, chunksize: int = 100_000, columns: Optional[List[str]] = None, *args: Any, **kwargs: Any) -> Iterator[pd.DataFrame]:
+        """
+        Reads the SQL table in chunks of rows. Results are streamed from a server-side cursor where
+        the driver supports one, so only the current chunk is held in memory.
+
+        Parameters
+        ----------
+        connection_string : str
+            The connection string to the SQL database.
+        table_name : str
+            The name of the SQL table.
+        chunksize : int
+            Number of rows per chunk.
+        columns : Optional[List[str]]
+            Only read these columns.
+        *args : Any
+            Variable length argument list.
+        **kwargs : Any
+            Arbitrary keyword arguments.
+
+        Yields
+        ------
+        pd.DataFrame
+            The next chunk of rows.
         """
-        Appends new data to the existing data in the SQL table.
+        engine = self.get_engine(connection_string)
+
+        with engine.connect().execution_options(stream_results=True) as connection:
+            yield from pd.read_sql_table(table_name, connection, *args, columns=columns, chunksize=chunksize, **kwargs)
+
+    def update(self, connection_string: str, table_name: str, data: pd.DataFrame, *args: Any, key_column: Optional[str] = None, **kwargs: Any) -> None:
+        """
+        Appends new data to the SQL table without reading it. With `key_column`, rows whose key
+        already exists in the table are replaced (an upsert): the data is loaded into a staging
+        table, matching rows are deleted, and the staged rows are inserted, all in one transaction.
 
         Parameters
         ----------
@@ -79,17 +159,35 @@ class PandasSqlAlchemyStorageBroker(IStorageBroker):
             The data to append to the SQL table.
         *args : Any
             Variable length argument list.
+        key_column : Optional[str]
+            The column identifying a row, to upsert on.
         **kwargs : Any
             Arbitrary keyword arguments.
         """
-        engine = create_engine(connection_string)
-        existing_data = self.read(connection_string, table_name)
-        updated_data = existing_data.append(data)
-        updated_data.to_sql(table_name, engine, if_exists='replace', *args, **kwargs)
+        engine = self.get_engine(connection_string)
+
+        with engine.begin() as connection:
+            if key_column is None or not inspect(connection).has_table(table_name):
+                self._to_sql(data, table_name, engine, connection, 'append', *args, **kwargs)
+            else:
+                self._upsert(connection, engine, table_name, data, key_column, *args, **kwargs)
+
+    def _upsert(self, connection: Connection, engine: Engine, table_name: str, data: pd.DataFrame, key_column: str, *args: Any, **kwargs: Any) -> None:
+        staging_name = f"_staging_{table_name}_{uuid.uuid4().hex[:8]}"
+        self._to_sql(data, staging_name, engine, connection, 'fail', *args, **kwargs)
 
-    def delete(self, connection_string: str, table_name: str, condition: str, *args: Any, **kwargs: Any) -> None:
+        target = Table(table_name, MetaData(), autoload_with=connection)
+        staging = Table(staging_name, MetaData(), autoload_with=connection)
+        columns = [name for name in staging.columns.keys() if name in target.columns]
+
+        connection.execute(delete(target).where(target.c[key_column].in_(select(staging.c[key_column]))))
+        connection.execute(insert(target).from_select(columns, select(*(staging.c[name] for name in columns))))
+        staging.drop(connection)
+
+    def delete(self, connection_string: str, table_name: str, condition: str, *args: Any, params: Optional[Dict[str, Any]] = None, **kwargs: Any) -> None:
         """
-        Removes rows that satisfy a certain SQL condition from the SQL table.
+        Removes rows that satisfy a certain SQL condition from the SQL table with a single
+        `DELETE ... WHERE` statement run on the server.
 
         Parameters
         ----------
@@ -98,13 +196,16 @@ class PandasSqlAlchemyStorageBroker(IStorageBroker):
         table_name : str
             The name of the SQL table.
         condition : str
-            The SQL condition to satisfy for rows to be removed.
+            The SQL condition to satisfy for rows to be removed, e.g. `"amount > :amount"`.
         *args : Any
             Variable length argument list.
+        params : Optional[Dict[str, Any]]
+            Values for the bound parameters of `condition`.
         **kwargs : Any
             Arbitrary keyword arguments.
         """
-        engine = create_engine(connection_string)
-        data = self.read(connection_string, table_name)
-        data.query(condition, inplace=True)
-        data.to_sql(table_name, engine, if_exists='replace', *args, **kwargs)
+        engine = self.get_engine(connection_string)
+        table = engine.dialect.identifier_preparer.quote(table_name)
+
+        with engine.begin() as connection:
+            connection.execute(text(f"DELETE FROM {table} WHERE {condition}"), params or {})
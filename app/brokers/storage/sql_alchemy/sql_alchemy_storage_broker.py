@@ -1,12 +1,116 @@
+import base64
+import json
+import time
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Literal
+from datetime import datetime
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+)
 
-from app import app, db
+from flask import current_app as ca
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.core.database.database import db
 from app.brokers.storage.i_storage_broker import IStorageBroker
+from app.services.util.eager_loading import (
+    DEFAULT_PROFILE,
+    apply_load_profile,
+)
+from app.services.util.stream_serializable import iter_chunks
+
+
+# (database, schema, SQL, parameters) -> (expiry time, row count)
+_count_cache: Dict[Any, Tuple[float, int]] = {}
+_count_cache_lock = Lock()
+COUNT_CACHE_MAX_ENTRIES = 1024
+
+
+@dataclass
+class CursorPage:
+    """
+    One page of a cursor (keyset) paginated read.
+
+    Attributes:
+        items (List[Any]): The rows of the page.
+        next_cursor (Optional[str]): Opaque cursor of the next page, or None
+            on the last page.
+        total (Optional[int]): The (cached) number of rows of the whole query,
+            if it was requested.
+    """
+
+    items: List[Any]
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+
+
+class BulkWriteError(Exception):
+    """
+    Raised when a batch of a bulk write fails. The batches before it stay
+    committed.
+
+    Attributes:
+        committed (int): The number of rows the committed batches wrote.
+        failed_ids (List[Any]): The ids of the rows of the failed batch, or
+            of only those that do not exist when an update matched fewer
+            rows. Empty for new rows without ids.
+    """
+
+    def __init__(
+        self, message: str, committed: int, failed_ids: List[Any]
+    ) -> None:
+        super().__init__(message)
+        self.committed = committed
+        self.failed_ids = failed_ids
+
+
+def encode_cursor(key: str, values: List[Any]) -> str:
+    """
+    Encodes the sort key values of the last row of a page as an opaque cursor.
+    """
+    values = [
+        {"datetime": v.isoformat()} if isinstance(v, datetime) else v
+        for v in values
+    ]
+    payload = json.dumps({"key": key, "values": values}).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str, key: str) -> List[Any]:
+    """
+    Decodes a cursor made by `encode_cursor` for the given sort key.
+
+    Raises:
+        ValueError: If the cursor is malformed or was made for another key.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        cursor_key, values = payload["key"], payload["values"]
+        values = [
+            datetime.fromisoformat(v["datetime"]) if isinstance(v, dict) else v
+            for v in values
+        ]
+    except (TypeError, KeyError, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
+
+    if cursor_key != key:
+        raise ValueError(f"Cursor is not for the sort key {key!r}")
+    return values
 
 
 @dataclass
 class SQLAlchemyStorageBroker(IStorageBroker):
+    # Seconds a cursor query's total row count is reused for
+    count_cache_ttl: float = 60.0
+
     def create(self, data: Any, *args: Any, **kwargs: Any) -> Any:
         db.session.add(data)
         db.session.commit()
@@ -14,11 +118,15 @@ class SQLAlchemyStorageBroker(IStorageBroker):
         return data
 
     def read(
-        self, read_type: Literal["single", "all"], *args: Any, **kwargs: Any
+        self,
+        read_type: Literal["single", "all", "cursor"],
+        *args: Any,
+        **kwargs: Any,
     ) -> Any:
         read_type_factory: Dict[str, Callable[..., Any]] = {
             "single": self.read_single,
             "all": self.read_all,
+            "cursor": self.read_cursor,
         }
 
         return read_type_factory[read_type](*args, **kwargs)
@@ -29,14 +137,249 @@ class SQLAlchemyStorageBroker(IStorageBroker):
         return data
 
     def read_all(
-        self, query: Any, page: int, *args: Any, **kwargs: Any
+        self,
+        query: Any,
+        page: int,
+        *args: Any,
+        profile: Optional[str] = DEFAULT_PROFILE,
+        **kwargs: Any,
     ) -> Any:
+        # Eager loads the relationships that are serialized with each row;
+        # a `profile` of None leaves them to load lazily
+        if profile is not None:
+            query = apply_load_profile(query, profile)
         data = query.paginate(
-            page=page, per_page=app.config["ROWS_PER_PAGE"]
+            page=page, per_page=ca.config["ROWS_PER_PAGE"]
         ).items
 
         return data
 
+    def read_cursor(
+        self,
+        query: Any,
+        cursor: Optional[str] = None,
+        per_page: Optional[int] = None,
+        key: Literal["id", "created_at"] = "id",
+        with_total: bool = False,
+        *args: Any,
+        **kwargs: Any,
+    ) -> CursorPage:
+        """
+        Reads one page of a query with keyset pagination.
+
+        Rows are ordered by `id`, or by `created_at` then `id`, and each page
+        starts after the sort key of the previous page's last row, so every
+        page is one indexed range scan however deep it is. No COUNT query is
+        run unless `with_total` is set, and its result is then cached.
+
+        Parameters:
+            query (Any): The query of a model with `id` (and `created_at`).
+            cursor (Optional[str]): The `next_cursor` of the previous page, or
+                None for the first page.
+            per_page (Optional[int]): Rows per page, by default
+                `ROWS_PER_PAGE`.
+            key (str): "id" or "created_at".
+            with_total (bool): Also return the number of rows of the query.
+
+        Returns:
+            CursorPage: The rows and the cursor of the next page.
+        """
+        per_page = per_page or ca.config["ROWS_PER_PAGE"]
+        model = query.column_descriptions[0]["entity"]
+        columns = [model.id] if key == "id" else [model.created_at, model.id]
+
+        page_query = query.order_by(None).order_by(*columns)
+        if cursor is not None:
+            values = decode_cursor(cursor, key)
+            if len(values) != len(columns):
+                raise ValueError("Malformed cursor")
+            page_query = page_query.filter(self._after(columns, values))
+
+        # One extra row tells whether there is a next page
+        items = page_query.limit(per_page + 1).all()
+        next_cursor = None
+        if len(items) > per_page:
+            items = items[:per_page]
+            last = items[-1]
+            next_cursor = encode_cursor(
+                key, [getattr(last, column.key) for column in columns]
+            )
+
+        total = self.count(query) if with_total else None
+        return CursorPage(items=items, next_cursor=next_cursor, total=total)
+
+    def _after(self, columns: List[Any], values: List[Any]) -> Any:
+        # (a, b) > (x, y) spelled out, as not every database has row values
+        column, value = columns[0], values[0]
+        if len(columns) == 1:
+            return column > value
+        return or_(
+            column > value,
+            and_(column == value, self._after(columns[1:], values[1:])),
+        )
+
+    def count(self, query: Any) -> int:
+        """
+        Returns the number of rows of a query, reusing a count made within the
+        last `count_cache_ttl` seconds for the same SQL, parameters and
+        database.
+        """
+        statement = query.order_by(None).statement
+        compiled = statement.compile()
+        bind = db.session.get_bind(clause=statement)
+        cache_key = (
+            str(bind.url),
+            # Schema-per-tenant engines share a URL
+            repr(bind.get_execution_options().get("schema_translate_map")),
+            str(compiled),
+            repr(sorted(compiled.params.items())),
+        )
+
+        now = time.monotonic()
+        cached = _count_cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        total = query.order_by(None).count()
+        with _count_cache_lock:
+            if len(_count_cache) >= COUNT_CACHE_MAX_ENTRIES:
+                _count_cache.pop(next(iter(_count_cache)), None)
+            _count_cache[cache_key] = (now + self.count_cache_ttl, total)
+        return total
+
+    def bulk_create(
+        self,
+        model: Any,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Inserts rows of a model with one multi-row INSERT and one transaction
+        per batch. Batches committed before a failing batch stay committed.
+
+        Parameters:
+            model (Any): The model class.
+            rows (Iterable[Dict[str, Any]]): Column values of each new row.
+            batch_size (Optional[int]): Rows per batch, by default
+                `BULK_BATCH_SIZE`.
+
+        Returns:
+            int: The number of rows inserted.
+
+        Raises:
+            BulkWriteError: If a batch failed, with the rows committed before.
+        """
+        return self._bulk(model, insert(model), rows, batch_size)
+
+    def bulk_update(
+        self,
+        model: Any,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Updates rows of a model by primary key, with one transaction per
+        batch. Each row holds the primary key and the columns to change.
+        Batches committed before a failing batch stay committed.
+
+        Parameters:
+            model (Any): The model class.
+            rows (Iterable[Dict[str, Any]]): Primary key and new values of each
+                row.
+            batch_size (Optional[int]): Rows per batch, by default
+                `BULK_BATCH_SIZE`.
+
+        Returns:
+            int: The number of rows updated.
+
+        Raises:
+            BulkWriteError: If a batch failed, e.g. as one of its ids does not
+                exist, with the rows committed before and the missing ids.
+        """
+        return self._bulk(model, update(model), rows, batch_size)
+
+    def bulk_delete(
+        self,
+        model: Any,
+        ids: Iterable[Any],
+        batch_size: Optional[int] = None,
+    ) -> int:
+        """
+        Deletes rows of a model with one `DELETE ... WHERE id IN (...)` and
+        one transaction per batch of ids.
+
+        Parameters:
+            model (Any): The model class.
+            ids (Iterable[Any]): The ids of the rows to delete.
+            batch_size (Optional[int]): Ids per batch, by default
+                `BULK_BATCH_SIZE`.
+
+        Returns:
+            int: The number of rows deleted, which leaves out ids that did not
+                exist.
+
+        Raises:
+            BulkWriteError: If a batch failed, with the rows committed before.
+        """
+        batch_size = batch_size or ca.config["BULK_BATCH_SIZE"]
+        deleted = 0
+        for batch in iter_chunks(ids, batch_size):
+            statement = (
+                delete(model)
+                .where(model.id.in_(batch))
+                .execution_options(synchronize_session=False)
+            )
+            try:
+                rowcount = db.session.execute(statement).rowcount
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                raise self._batch_error(model, batch, deleted, e) from e
+            deleted += rowcount
+        return deleted
+
+    def _bulk(
+        self,
+        model: Any,
+        statement: Any,
+        rows: Iterable[Dict[str, Any]],
+        batch_size: Optional[int],
+    ) -> int:
+        batch_size = batch_size or ca.config["BULK_BATCH_SIZE"]
+        columns = set(model.__mapper__.column_attrs.keys())
+        count = 0
+        for batch in iter_chunks(rows, batch_size):
+            try:
+                unknown = {key for row in batch for key in row} - columns
+                if unknown:
+                    raise ValueError(f"Unknown columns: {sorted(unknown)}")
+                # A list of parameter sets runs as an ORM bulk statement. An
+                # update raises StaleDataError unless every row matched, so a
+                # committed batch wrote all of its rows.
+                db.session.execute(statement, batch)
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                ids = [row["id"] for row in batch if row.get("id") is not None]
+                raise self._batch_error(model, ids, count, e) from e
+            count += len(batch)
+        return count
+
+    def _batch_error(
+        self, model: Any, ids: List[Any], committed: int, error: Exception
+    ) -> BulkWriteError:
+        if isinstance(error, StaleDataError):
+            existing = set(
+                db.session.scalars(select(model.id).where(model.id.in_(ids)))
+            )
+            missing = [i for i in ids if i not in existing]
+            return BulkWriteError(
+                f"No records with ids {missing}", committed, missing
+            )
+        if isinstance(error, ValueError):
+            return BulkWriteError(str(error), committed, ids)
+        return BulkWriteError("The database rejected a batch", committed, ids)
+
     def update(self, *args: Any, **kwargs: Any) -> Any:
         db.session.commit()
 
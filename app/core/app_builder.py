@@ -20,11 +20,14 @@ from app.core.cors.flask_cors import init_flask_cors
 from app.core.limiter.flask_limiter import init_flask_limiter
 from app.core.talisman.flask_talisman import init_flask_talisman
 from app.core.before_request.before_request import before_request
+from app.core.provision_tenant.provision_tenant import provision_all_tenants
 from app.core.context_processor.context_processor import context_processor
 from app.core.health_check.view import health_check
 from app.core.errorhandler.errorhandler import errorhandler
 from app.core.api_factory import create_api
 from app.core.health_check.rest_api import health_check_api
+from app.core.realtime.rest_api import realtime_api
+from app.core.response_cache.response_cache import init_response_cache
 from app.core.flask_admin.init_flask_admin import init_flask_admin
 
 
@@ -51,6 +54,9 @@ def build_app(
     app.db = db
     app.db.init_app(app=app)
 
+    # At startup, so workers that only write still invalidate shared caches
+    init_response_cache(app)
+
     app = init_flask_security(app=app)
 
     app.csrf_protect = CSRFProtect(app)
@@ -68,6 +74,9 @@ def build_app(
 
     before_request(app=app)
 
+    if app.config["PROVISION_TENANTS_ON_STARTUP"]:
+        provision_all_tenants(app=app)
+
     context_processor(app=app)
 
     health_check(app=app, **health_check_kwargs)
@@ -76,6 +85,7 @@ def build_app(
 
     app = create_api(app=app, authorizations=authorizations)
     health_check_api(app=app, **health_check_kwargs)
+    realtime_api(app=app)
 
     app = init_flask_admin(app)
 
@@ -4,6 +4,8 @@ from flask import Flask
 
 from configuration.config import Config
 
+from app.core.json_provider.json_provider import init_json_provider
+
 
 def create_app(
     config_object: Config,
@@ -11,4 +13,5 @@ def create_app(
 ) -> Any:
     app = Flask(__name__, template_folder=template_folder)
     app.config.from_object(config_object)
+    app = init_json_provider(app)
     return app
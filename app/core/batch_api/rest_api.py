@@ -0,0 +1,96 @@
+from typing import Any, Callable, List, Optional
+
+from flask import request
+from flask_restx import Resource
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.brokers.storage.sql_alchemy.sql_alchemy_storage_broker import (
+    BulkWriteError,
+    SQLAlchemyStorageBroker,
+)
+
+
+def batch_api(
+    app: Any,
+    model: Any,
+    name: Optional[str] = None,
+    decorators: Optional[List[Callable[..., Any]]] = None,
+    batch_size: Optional[int] = None,
+) -> None:
+    """
+    Registers batch create, update and delete endpoints for a model at
+    `/api/<name>/batch`, where `name` defaults to the model's table name.
+
+    Each request writes its rows in batches of `batch_size` (by default
+    `BULK_BATCH_SIZE`) with one transaction per batch. When a batch fails
+    the endpoint answers 422 with the number of rows already `committed` by
+    the earlier batches and the `failed_ids` of the failed one. Pass
+    `decorators` (e.g. authentication or permission checks) to protect the
+    endpoints.
+    """
+    name = name or model.__tablename__
+    broker = SQLAlchemyStorageBroker()
+
+    # Swagger namespace
+    ns = app.api.namespace(
+        f"api/{name}/batch",
+        description=f"Batch writes of {name} records",
+    )
+
+    def get_rows(records: bool = True) -> List[Any]:
+        rows = request.get_json(silent=True)
+        if isinstance(rows, dict):
+            rows = rows.get("ids", rows.get("rows"))
+        if not isinstance(rows, list):
+            ns.abort(422, "Expected a JSON list (or {'rows': [...]})")
+        if records and not all(isinstance(row, dict) for row in rows):
+            ns.abort(422, "Every record must be a JSON object")
+        return rows
+
+    def run(write: Callable[..., int], rows: List[Any]) -> int:
+        try:
+            return write(model, rows, batch_size=batch_size)
+        except BulkWriteError as e:
+            if isinstance(e.__cause__, SQLAlchemyError):
+                app.logger.exception("Batch write of %s failed", name)
+            # Earlier batches of the request stay committed
+            ns.abort(
+                422,
+                str(e),
+                committed=e.committed,
+                failed_ids=e.failed_ids,
+            )
+
+    @ns.route("")
+    class BatchResource(Resource):
+        method_decorators = list(decorators or [])
+
+        @ns.doc(
+            responses={201: "Created", 422: "Unprocessable Entity"},
+            description="Insert a list of records",
+        )
+        def post(self):
+            """Create records in batches"""
+            created = run(broker.bulk_create, get_rows())
+            return {"created": created}, 201
+
+        @ns.doc(
+            responses={200: "OK", 422: "Unprocessable Entity"},
+            description="Update a list of records, each with its id",
+        )
+        def patch(self):
+            """Update records by id in batches"""
+            rows = get_rows()
+            if not all("id" in row for row in rows):
+                ns.abort(422, "Every record must have an id")
+            updated = run(broker.bulk_update, rows)
+            return {"updated": updated}, 200
+
+        @ns.doc(
+            responses={200: "OK", 422: "Unprocessable Entity"},
+            description="Delete records by a list of ids",
+        )
+        def delete(self):
+            """Delete records by id in batches"""
+            deleted = run(broker.bulk_delete, get_rows(records=False))
+            return {"deleted": deleted}, 200
@@ -3,10 +3,8 @@ from typing import Any
 from flask import g, request
 
 from app.core.choose_tenant.choose_tenant import choose_tenant
-from app.core.create_database.create_database import create_database
-from app.core.create_tables_from_models.create_tables_from_models import (
-    create_tables_from_models,
-)
+from app.core.choose_tenant.tenant_resolver import init_tenant_resolver
+from app.core.provision_tenant.provision_tenant import provision_tenant
 from app.core.create_admin_user.create_admin_user import create_admin_user
 
 
@@ -14,14 +12,18 @@ appHasRunBefore: bool = False
 
 
 def before_request(app: Any) -> None:
+    init_tenant_resolver(app=app)
+
     @app.before_request
     def before_request() -> None:
         global appHasRunBefore
-        choose_tenant(app=app)
+        # The default database lists the tenants choose_tenant resolves
+        provision_tenant(app=app)
 
-        create_database(app=app)
+        choose_tenant(app=app)
 
-        create_tables_from_models(app=app)
+        # Creates the tenant's database and tables on its first request only
+        provision_tenant(app=app, tenant=g.organization)
 
         if not appHasRunBefore:
             create_admin_user(app=app)
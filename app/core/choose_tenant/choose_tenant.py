@@ -1,21 +1,26 @@
 from typing import Any
 
-from flask import g, request
+from flask import abort, g, request
 
+from app.core.choose_tenant.tenant_resolver import init_tenant_resolver
 from app.core.database.database import db
 
 
 def choose_tenant(app: Any) -> None:
-    g.organization = "default"
+    resolver = app.extensions.get("tenant_resolver")
+    if resolver is None:
+        resolver = init_tenant_resolver(app)
 
-    host = request.environ.get("HTTP_HOST").split(".")
+    organization = request.args.get("organization")
+    if organization is not None:
+        tenant = resolver.resolve_organization(organization)
+    else:
+        tenant = resolver.resolve_host(request.environ.get("HTTP_HOST"))
 
-    if "organization" in request.args:
-        g.organization = request.args["organization"]
-        app.logger.info("Organisation changed: " + g.organization)
-    elif len(host) == 3 and host[0] != "www":
-        g.organization = host[0]
-        app.logger.info("Organisation changed: " + g.organization)
+    # Unknown tenants must not read or write the default tenant's database
+    if tenant is None:
+        abort(404, description="Unknown organization")
+    g.organization = tenant
 
     # Set database to tenant_name
     db.choose_tenant(g.organization)
@@ -0,0 +1,137 @@
+import time
+from threading import Lock
+from typing import Any, Dict, Optional, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.database.database import db
+
+
+DEFAULT_TENANT = "default"
+
+
+class TenantResolver:
+    """
+    Maps request hosts and organization names to tenant bind keys.
+
+    Known tenants are the configured binds and the rows of the `Database`
+    model. They are loaded once, reloaded when a `Database` row changes in
+    this process and otherwise every `ttl` seconds (for changes made by other
+    processes); a load that fails is retried on the next lookup. Each host
+    seen is cached with the tenant it resolves to, or with None when its
+    tenant subdomain is unknown, so resolving a host is a single dict lookup;
+    the cache keeps at most `max_hosts` hosts.
+    """
+
+    def __init__(self, app: Any, ttl: float = 300, max_hosts: int = 10_000):
+        self.app = app
+        self.ttl = ttl
+        self.max_hosts = max_hosts
+        self._tenants: Set[str] = {DEFAULT_TENANT}
+        self._hosts: Dict[Optional[str], Optional[str]] = {}
+        self._expires_at = 0.0
+        self._failing = False
+        self._lock = Lock()
+
+    def resolve_host(self, host: Optional[str]) -> Optional[str]:
+        """
+        Returns the tenant of a host such as `acme.example.com`, the default
+        tenant if the host has no tenant subdomain, or None if its tenant
+        subdomain is unknown.
+        """
+        if time.monotonic() >= self._expires_at:
+            self.reload()
+
+        try:
+            return self._hosts[host]
+        except KeyError:
+            return self._resolve_new_host(host)
+
+    def resolve_organization(self, organization: str) -> Optional[str]:
+        """
+        Returns the tenant of an organization name, or None if it is unknown.
+        """
+        if time.monotonic() >= self._expires_at:
+            self.reload()
+
+        if organization in self._tenants:
+            return organization
+
+        self.app.logger.debug("Unknown organization: %s", organization)
+        return None
+
+    def _resolve_new_host(self, host: Optional[str]) -> Optional[str]:
+        parts = (host or "").split(":")[0].split(".")
+        tenant: Optional[str] = DEFAULT_TENANT
+        if len(parts) == 3 and parts[0] != "www":
+            if parts[0] in self._tenants:
+                tenant = parts[0]
+            else:
+                self.app.logger.debug("Unknown tenant host: %s", host)
+                tenant = None
+
+        with self._lock:
+            if len(self._hosts) >= self.max_hosts:
+                # Drop the oldest host (dicts keep insertion order)
+                self._hosts.pop(next(iter(self._hosts)), None)
+            self._hosts[host] = tenant
+        return tenant
+
+    def reload(self) -> None:
+        """
+        Loads the known tenants again and clears the host cache.
+        """
+        tenants = {DEFAULT_TENANT}
+        tenants.update(self.app.config.get("SQLALCHEMY_BINDS", {}))
+
+        from app.models.data.database import Database
+
+        table = Database.__table__
+        query = select(table.c.name).where(table.c.deleted_at.is_(None))
+        try:
+            with db.engines["default"].connect() as connection:
+                tenants.update(connection.execute(query).scalars())
+        except SQLAlchemyError as e:
+            # e.g. the default database is not provisioned yet. The tenants
+            # known so far are kept and the load is retried on the next
+            # lookup, rather than treating every other tenant as unknown
+            # until the ttl expires.
+            if not self._failing:
+                self.app.logger.warning("Could not load tenants: %s", e)
+            self._failing = True
+            with self._lock:
+                self._tenants = self._tenants | tenants
+            return
+
+        with self._lock:
+            self._tenants = tenants
+            self._hosts = {}
+            self._expires_at = time.monotonic() + self.ttl
+            self._failing = False
+
+    def invalidate(self, *args: Any) -> None:
+        """
+        Marks the known tenants as stale, so they are reloaded on the next
+        lookup.
+        """
+        self._expires_at = 0.0
+
+
+def init_tenant_resolver(app: Any) -> TenantResolver:
+    """
+    Creates the tenant resolver of an app and reloads it whenever a
+    `Database` row is inserted, updated or deleted.
+    """
+    from app.models.data.database import Database
+
+    resolver = TenantResolver(
+        app,
+        ttl=app.config.get("TENANT_RESOLVER_TTL", 300),
+        max_hosts=app.config.get("TENANT_RESOLVER_MAX_HOSTS", 10_000),
+    )
+    for identifier in ("after_insert", "after_update", "after_delete"):
+        event.listen(Database, identifier, resolver.invalidate)
+
+    app.extensions["tenant_resolver"] = resolver
+    return resolver
@@ -0,0 +1,154 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from functools import wraps
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+from flask import Response, current_app as ca, g, request
+from flask_login import current_user
+from flask_restx.utils import unpack
+from sqlalchemy import func, select
+
+from app.core.database.database import db
+from app.core.response_cache.response_cache import (
+    generation_tag,
+    init_response_cache,
+)
+
+
+ChangeToken = Tuple[str, Optional[datetime]]
+
+
+def get_change_token(model: Any) -> ChangeToken:
+    """
+    Returns the change token of a `BaseModel` table in the requesting tenant,
+    and when it was last modified (None if it is empty).
+
+    The token combines the table's row count, highest id and latest
+    `updated_at`, which change with any create, update or delete by any
+    process, with the table's version: its generation in the response
+    cache, which every commit changing the table bumps, bulk writes
+    included. `updated_at` only has a one-second granularity, so the version
+    is what tells apart two updates of a row within the same second.
+
+    Versions are shared by the processes sharing a filesystem response cache.
+    With the per-process memory cache each process has its own, so the same
+    data can get different ETags (a 200 instead of a 304) from different
+    processes, and a same-second update committed by another process is
+    only seen once the row count, highest id or `updated_at` moves on.
+
+    Tokens are cached under the version for `CONDITIONAL_GET_TOKEN_TTL`
+    seconds, so a commit seen by the cache is reflected at once, and other
+    changes after at most that long.
+    """
+    cache = init_response_cache(ca)
+    tenant = g.get("organization", "default")
+    tag = generation_tag(tenant, model.__tablename__)
+    generation = cache.get_generation(tag)
+    key = f"change-token:{tag}:{generation}"
+
+    token: Optional[ChangeToken] = cache.get(key)
+    if token is None:
+        count, max_id, last_modified = db.session.execute(
+            select(
+                func.count(model.id),
+                func.max(model.id),
+                func.max(model.updated_at),
+            )
+        ).one()
+        token = (
+            f"{generation}:{count}:{max_id}:{last_modified}",
+            last_modified,
+        )
+        cache.set(key, token, ca.config.get("CONDITIONAL_GET_TOKEN_TTL", 1))
+    return token
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQL CURRENT_TIMESTAMP is UTC, returned without a timezone
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def conditional_response(
+    models: Iterable[Any],
+    vary_on_user: bool = False,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Adds a strong `ETag` and a `Last-Modified` header, derived from the
+    change tokens of `models`, to the 200 responses of a flask_restx
+    resource method, and answers `304 Not Modified` without running it when
+    the request's `If-None-Match` (or, without one, `If-Modified-Since`)
+    shows the client already has the current representation.
+
+    The ETag also covers the path and query arguments (so `format` and
+    `template`), and the user with `vary_on_user`. Tokens are read before the
+    method runs, so a change committed meanwhile can only make the next
+    request miss, never serve a stale 304.
+
+    Use as the outermost of the caching decorators of a resource method:
+
+        @ns.route("/")
+        class ItemsResource(Resource):
+            @conditional_response(models=[Item])
+            @cached_response(models=[Item])
+            def get(self):
+                ...
+    """
+    models = sorted(models, key=lambda model: model.__tablename__)
+
+    def decorator(f: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(f)
+        def decorated_function(*args: Any, **kwargs: Any) -> Any:
+            tokens = [get_change_token(model) for model in models]
+            parts = {
+                "tokens": [token for token, _ in tokens],
+                "path": request.path,
+                "args": sorted(request.args.items(multi=True)),
+            }
+            if vary_on_user:
+                parts["user"] = (
+                    current_user.get_id()
+                    if current_user.is_authenticated
+                    else None
+                )
+            encoded = json.dumps(parts, default=str, separators=(",", ":"))
+            etag = hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+            modified: List[datetime] = [
+                _as_utc(last_modified)
+                for _, last_modified in tokens
+                if last_modified is not None
+            ]
+            last_modified = max(modified) if modified else None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                not_modified = (
+                    last_modified is not None
+                    and request.if_modified_since is not None
+                    and last_modified <= request.if_modified_since
+                )
+            if not_modified:
+                response = Response(status=304)
+            else:
+                data, code, headers = unpack(f(*args, **kwargs))
+                if isinstance(data, Response):
+                    response = data
+                else:
+                    response = ca.api.make_response(
+                        data, code, headers=headers
+                    )
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            return response
+
+        return decorated_function
+
+    return decorator
@@ -3,6 +3,7 @@ from typing import Any
 from flask import g
 
 from app.services.util.make_serializable import make_serializable
+from app.services.util.model_serializer import serialize_model
 
 
 def context_processor(app: Any) -> None:
@@ -11,4 +12,5 @@ def context_processor(app: Any) -> None:
         return {
             "organization": getattr(g, "organization", "No Organization Set"),
             "make_serializable": make_serializable,
+            "serialize_model": serialize_model,
         }
@@ -1,15 +1,20 @@
-from typing import Any
+from typing import Any, Optional
 
-from sqlalchemy_utils import database_exists, create_database
+from sqlalchemy.engine import Engine
+from sqlalchemy_utils import database_exists
+from sqlalchemy_utils import create_database as create_sql_database
 
 from app.core.database.database import db
 
 
-def create_database(app: Any):
+def create_database(app: Any, engine: Optional[Engine] = None):
     # Create database if it does not exist.
     if app.config["AUTO_CREATE_DATABASE"]:
-        if not database_exists(db.get_engine().url):
-            create_database(db.get_engine().url)
+        engine = engine if engine is not None else db.get_engine()
+        if not database_exists(engine.url):
+            create_sql_database(engine.url)
         else:
-            # Connect the database if exists.
-            db.get_engine().connect()
+            # Connect the database if exists, returning the connection to
+            # the pool straight away.
+            with engine.connect():
+                pass
@@ -1,11 +1,17 @@
-from typing import Any
+from typing import Any, Optional
+
+from sqlalchemy.engine import Engine
 
 from app.core.database.database import db
 
 
-def create_tables_from_models(app: Any):
+def create_tables_from_models(app: Any, engine: Optional[Engine] = None):
     # Build the database:
     if app.config["AUTO_CREATE_TABLES_FROM_MODELS"]:
         # This will create the database tables using SQLAlchemy
         with app.app_context():
-            db.create_all()
+            if engine is None:
+                db.create_all()
+            else:
+                # Only the tables of the given (tenant) engine
+                db.metadata.create_all(bind=engine)
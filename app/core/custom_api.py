@@ -4,15 +4,24 @@ import io
 from dicttoxml import dicttoxml  # For XML formatting
 from flask_restx import Api
 from flask import (
+    Response,
     request,
     make_response,
-    jsonify,
     render_template,
+    stream_with_context,
     current_app as ca,
 )
 from pandas import DataFrame
 
 from app.services.util.make_serializable import make_serializable
+from app.services.util.stream_serializable import (
+    is_single_record,
+    iter_serializable_rows,
+    stream_csv,
+    stream_json,
+    stream_ndjson,
+    stream_xml,
+)
 
 
 class CustomApi(Api):
@@ -24,6 +33,10 @@ class CustomApi(Api):
         """
         Override default response generation with format-aware rendering.
         """
+        # flask_restx passes the status code positionally
+        if args:
+            code = args[0]
+
         template_name = None
         if headers and "X-TEMPLATE" in headers:
             template_name = headers.pop("X-TEMPLATE")
@@ -43,9 +56,21 @@ class CustomApi(Api):
 
     def render_response(self, data, *args, template_name=None, **kwargs):
         format_type = request.args.get("format", "json").lower()
-        serializable_data = make_serializable(data)
         filename = request.path.strip("/").replace("/", "_") or "data"
 
+        # A single record keeps its own shape rather than becoming a list
+        if format_type == "ndjson" or (
+            format_type in ("json", "csv", "xml")
+            and request.args.get("stream", "false").lower() == "true"
+            and not is_single_record(data)
+        ):
+            return self.stream_response(data, format_type, filename)
+
+        if format_type not in ("xml", "html", "csv"):  # Default: JSON
+            return self.json_response(data, filename)
+
+        serializable_data = make_serializable(data)
+
         if format_type == "xml":
             response = make_response(
                 dicttoxml(serializable_data, custom_root="response")
@@ -155,12 +180,61 @@ class CustomApi(Api):
                 response.headers["Content-Disposition"] = "inline"
                 response.headers["Content-Type"] = "text/text"
 
-        else:  # Default: JSON
-            response = make_response(jsonify(serializable_data))
-            if request.args.get("download", "false").lower() == "true":
-                response.headers["Content-Disposition"] = (
-                    f"attachment; filename={filename}.json"
-                )
-            response.headers["Content-Type"] = "application/json"
+        return response
+
+    def json_response(self, data, filename):
+        """
+        Encodes the data with the app's JSON provider, which converts models,
+        rows and dates itself; only data it cannot encode is first copied
+        through `make_serializable`.
+        """
+        try:
+            response = ca.json.response(data)
+        except TypeError:
+            response = ca.json.response(make_serializable(data))
+
+        if request.args.get("download", "false").lower() == "true":
+            response.headers["Content-Disposition"] = (
+                f"attachment; filename={filename}.json"
+            )
+        response.headers["Content-Type"] = "application/json"
+        return response
+
+    def stream_response(self, data, format_type, filename):
+        """
+        Generator-backed rendering: rows are serialized and written one chunk
+        at a time so memory stays bounded and the first bytes are sent before
+        the whole payload has been built.
+        """
+        chunk_size = int(ca.config.get("STREAM_CHUNK_SIZE", 1000))
+        rows = iter_serializable_rows(data, chunk_size=chunk_size)
+
+        if format_type == "xml":
+            body = stream_xml(rows, chunk_size=chunk_size)
+            extension, content_type = "xml", "application/xml"
+
+        elif format_type == "csv":
+            body = stream_csv(
+                rows,
+                delimiter=(
+                    request.args.get("delimiter")
+                    or ca.config.get("CSV_DELIMITER", "|")
+                ),
+                chunk_size=chunk_size,
+            )
+            extension, content_type = "csv", "text/csv"
+
+        elif format_type == "ndjson":
+            body = stream_ndjson(rows, ca.json.dumps, chunk_size=chunk_size)
+            extension, content_type = "ndjson", "application/x-ndjson"
 
+        else:  # Default: JSON array
+            body = stream_json(rows, ca.json.dumps, chunk_size=chunk_size)
+            extension, content_type = "json", "application/json"
+
+        response = Response(stream_with_context(body), mimetype=content_type)
+        if request.args.get("download", "false").lower() == "true":
+            response.headers["Content-Disposition"] = (
+                f"attachment; filename={filename}.{extension}"
+            )
         return response
@@ -1,24 +1,242 @@
-from typing import Any
+from threading import Lock
+from typing import Any, Dict, Optional
 
-from flask import g
+from flask import Flask, current_app, g, has_app_context
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session, _app_ctx_id
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import scoped_session, sessionmaker
 
+from app.core.database.read_replicas import ReadReplicaRouter
+from app.core.database.tenant_engine_manager import (
+    TenantEngineManager,
+    get_pool_stats,
+)
+
+
+def _is_bound_to(registry: Optional[scoped_session], engine: Engine) -> bool:
+    if registry is None:
+        return False
+    return registry.session_factory.kw["bind"] is engine
+
+
+class TenantSession(Session):
+    """
+    Session that runs the queries of a request on its tenant's database.
+
+    Plain SELECTs go to a read replica of the tenant when it has any. Writes,
+    flushes, locking reads and every query of a session with unflushed
+    changes or an uncommitted write (a flush or an INSERT/UPDATE/DELETE
+    statement) go to the primary, as do all queries after a write was
+    committed in the same request (read-your-writes).
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and "tenant" in g:
+            if self._is_replica_read(clause):
+                replica = self._db.get_replica_bind()
+                if replica is not None:
+                    return replica
+            return self._db.get_bind(mapper=mapper, clause=clause)
+        return super().get_bind(
+            mapper=mapper, clause=clause, bind=bind, **kwargs
+        )
+
+    def _is_replica_read(self, clause: Any) -> bool:
+        if not getattr(clause, "is_select", False):
+            return False
+        if getattr(clause, "_for_update_arg", None) is not None:
+            return False
+        if self._flushing or self.info.get("has_written"):
+            return False
+        if g.get("_read_your_writes") or not self._is_clean():
+            return False
+        return True
+
+
+@event.listens_for(TenantSession, "after_flush")
+def _after_flush(session: TenantSession, flush_context: Any) -> None:
+    session.info["has_written"] = True
+
+
+@event.listens_for(TenantSession, "do_orm_execute")
+def _do_orm_execute(orm_execute_state: Any) -> None:
+    # Statements run through session.execute() write without a flush
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["has_written"] = True
+
+
+@event.listens_for(TenantSession, "after_commit")
+def _after_commit(session: TenantSession) -> None:
+    if session.info.pop("has_written", False) and has_app_context():
+        g._read_your_writes = True
+
+
+@event.listens_for(TenantSession, "after_rollback")
+def _after_rollback(session: TenantSession) -> None:
+    session.info.pop("has_written", None)
+
 
 class MultiTenantSQLAlchemy(SQLAlchemy):
     """Custom SQLAlchemy class for handling multi-tenancy."""
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        session_options = kwargs.setdefault("session_options", {})
+        session_options.setdefault("class_", TenantSession)
+        super().__init__(*args, **kwargs)
+        # (app, tenant) -> session registry scoped to the app context
+        self._tenant_sessions: Dict[Any, scoped_session] = {}
+        self._tenant_sessions_lock = Lock()
+        # (app, tenant) -> default engine with the tenant's schema mapped in
+        self._schema_engines: Dict[Any, Engine] = {}
+
+    def init_app(self, app: Flask) -> None:
+        super().init_app(app)
+        app.config.setdefault("TENANCY_MODE", "database")
+        app.config.setdefault("TENANT_MAX_ENGINES", 100)
+        app.extensions["tenant_engines"] = TenantEngineManager(
+            app,
+            make_engine=lambda tenant, uri: self._make_tenant_engine(
+                app, tenant, uri
+            ),
+            default_engine=lambda: self.engines["default"],
+            max_engines=app.config["TENANT_MAX_ENGINES"],
+        )
+        app.config.setdefault("SQLALCHEMY_READ_REPLICAS", {})
+        app.config.setdefault("READ_REPLICA_STRATEGY", "round_robin")
+        app.extensions["read_replicas"] = ReadReplicaRouter(
+            app,
+            make_engine=lambda name, uri: self._make_tenant_engine(
+                app, name, uri
+            ),
+            strategy=app.config["READ_REPLICA_STRATEGY"],
+        )
+        app.teardown_appcontext(self._teardown_tenant_sessions)
+
+    def _make_tenant_engine(self, app: Flask, tenant: str, uri: str) -> Engine:
+        options = dict(self._engine_options)
+        options.update(app.config["SQLALCHEMY_ENGINE_OPTIONS"])
+        options["url"] = uri
+        options.setdefault("echo", app.config["SQLALCHEMY_ECHO"])
+        options.setdefault("echo_pool", app.config["SQLALCHEMY_ECHO"])
+        self._apply_driver_defaults(options, app)
+        return self._make_engine(tenant, options, app)
+
+    @property
+    def tenant_engines(self) -> TenantEngineManager:
+        """The tenant engine manager of the current app."""
+        return current_app.extensions["tenant_engines"]
+
+    def get_tenant_schema(self, tenant: Optional[str]) -> Optional[str]:
+        """
+        Return the schema holding a tenant's tables in "schema" tenancy mode,
+        or None when the tenant uses the default schema.
+        """
+        if current_app.config["TENANCY_MODE"] != "schema":
+            return None
+        return None if tenant in (None, "default") else tenant
+
+    def get_tenant_engine(self, tenant: str) -> Engine:
+        """
+        Return the engine of a tenant.
+
+        In "database" tenancy mode this is its configured bind, else its
+        lazily created engine, else the default database. In "schema" mode
+        every tenant shares the default engine and its pool; the tenant's
+        engine is a view of it whose `schema_translate_map` renders the
+        tables of the models in the tenant's schema.
+        """
+        schema = self.get_tenant_schema(tenant)
+        if schema is not None:
+            return self._get_schema_engine(tenant, schema)
+
+        engines = self.engines
+        if tenant in engines:
+            return engines[tenant]
+        engine = self.tenant_engines.get_engine(tenant)
+        return engine if engine is not None else engines["default"]
+
+    def _get_schema_engine(self, tenant: str, schema: str) -> Engine:
+        key = (current_app._get_current_object(), tenant)
+        engine = self._schema_engines.get(key)
+        if engine is None:
+            # Engine.execution_options returns a copy sharing the same pool
+            engine = self.engines["default"].execution_options(
+                schema_translate_map={None: schema}
+            )
+            self._schema_engines[key] = engine
+        return engine
+
     def get_bind(self, mapper=None, clause=None):
         """Dynamically choose the correct tenant database."""
         tenant = getattr(g, "tenant", "default")
-        return self.engines.get(tenant, self.engines["default"])
+        return self.get_tenant_engine(tenant)
+
+    def get_replica_bind(self) -> Optional[Engine]:
+        """
+        Return a read replica engine of the current tenant, or None if its
+        database has no replicas.
+        """
+        tenant = getattr(g, "tenant", "default")
+        schema = self.get_tenant_schema(tenant)
+        if schema is not None:  # Tenants share the replicas of the default
+            tenant = "default"
+        elif tenant not in self.engines and tenant not in (
+            current_app.config["SQLALCHEMY_READ_REPLICAS"]
+        ):
+            return None
+
+        replica = current_app.extensions["read_replicas"].get_replica(tenant)
+        if replica is not None and schema is not None:
+            replica = replica.execution_options(
+                schema_translate_map={None: schema}
+            )
+        return replica
 
     def choose_tenant(self, bind_key):
         """Set the tenant database bind key for the current request."""
         g.tenant = bind_key
 
-    def get_session(self):
-        """Return a session bound to the correct tenant database."""
-        engine = self.get_bind()
-        session_factory = sessionmaker(bind=engine)
-        return scoped_session(session_factory)
+    def get_session(self, tenant: Optional[str] = None) -> scoped_session:
+        """
+        Return the session registry of a tenant, the current tenant by
+        default. Registries are created once per tenant and scoped to the app
+        context (request or greenlet), so every call within one context gets
+        the same session, which is removed when the context is torn down.
+        """
+        tenant = tenant or getattr(g, "tenant", "default")
+        engine = self.get_tenant_engine(tenant)
+        key = (current_app._get_current_object(), tenant)
+
+        registry = self._tenant_sessions.get(key)
+        # Rebuilt when the tenant's engine was replaced (e.g. evicted)
+        if not _is_bound_to(registry, engine):
+            with self._tenant_sessions_lock:
+                registry = self._tenant_sessions.get(key)
+                if not _is_bound_to(registry, engine):
+                    registry = scoped_session(
+                        sessionmaker(bind=engine), scopefunc=_app_ctx_id
+                    )
+                    self._tenant_sessions[key] = registry
+
+        used = g.setdefault("_tenant_sessions", set())
+        used.add(key)
+        return registry
+
+    def _teardown_tenant_sessions(self, exc: Optional[BaseException]) -> None:
+        """Remove the tenant sessions used in the ending app context."""
+        for key in g.pop("_tenant_sessions", ()):
+            registry = self._tenant_sessions.get(key)
+            if registry is not None:
+                registry.remove()
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the connection pool statistics of every open engine."""
+        stats = {
+            "primary" if key is None else key: get_pool_stats(engine)
+            for key, engine in self.engines.items()
+        }
+        stats.update(self.tenant_engines.pool_stats())
+        stats.update(current_app.extensions["read_replicas"].pool_stats())
+        return stats
@@ -0,0 +1,91 @@
+from itertools import count
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+
+from app.core.database.tenant_engine_manager import (
+    checked_out_connections,
+    get_pool_stats,
+)
+
+
+class ReadReplicaRouter:
+    """
+    Read replica engines of each bind, created on first use from the
+    `SQLALCHEMY_READ_REPLICAS` config (bind key -> list of database URLs).
+
+    `strategy` chooses the replica of each read: "round_robin" cycles through
+    them, "least_connections" picks the one with the fewest checked out
+    connections.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        make_engine: Callable[[str, str], Engine],
+        strategy: str = "round_robin",
+    ) -> None:
+        """
+        Parameters:
+            app (Any): The Flask app whose config lists the replicas.
+            make_engine (Callable[[str, str], Engine]): Builds an engine from
+                its name and database URL.
+            strategy (str): "round_robin" or "least_connections".
+        """
+        if strategy not in ("round_robin", "least_connections"):
+            raise ValueError(f"Unknown read replica strategy: {strategy}")
+
+        self.app = app
+        self.make_engine = make_engine
+        self.strategy = strategy
+        self._replicas: Dict[str, List[Engine]] = {}
+        self._counters: Dict[str, Any] = {}
+        self._lock = Lock()
+
+    def get_replicas(self, bind_key: str) -> List[Engine]:
+        """
+        Returns the replica engines of a bind, which is empty if it has none.
+        """
+        replicas = self._replicas.get(bind_key)
+        if replicas is None:
+            with self._lock:
+                replicas = self._replicas.get(bind_key)
+                if replicas is None:
+                    uris = self.app.config["SQLALCHEMY_READ_REPLICAS"].get(
+                        bind_key, []
+                    )
+                    replicas = [
+                        self.make_engine(f"{bind_key}:replica{i}", uri)
+                        for i, uri in enumerate(uris)
+                    ]
+                    self._counters[bind_key] = count()
+                    self._replicas[bind_key] = replicas
+        return replicas
+
+    def get_replica(self, bind_key: str) -> Optional[Engine]:
+        """
+        Returns the replica engine to run a read of a bind on, or None if the
+        bind has no replicas.
+        """
+        replicas = self.get_replicas(bind_key)
+        if not replicas:
+            return None
+        if len(replicas) == 1:
+            return replicas[0]
+
+        if self.strategy == "least_connections":
+            return min(replicas, key=checked_out_connections)
+        return replicas[next(self._counters[bind_key]) % len(replicas)]
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the pool statistics of each replica engine created so far.
+        """
+        with self._lock:
+            replicas = {
+                f"{bind_key}:replica{i}": engine
+                for bind_key, engines in self._replicas.items()
+                for i, engine in enumerate(engines)
+            }
+        return {name: get_pool_stats(e) for name, e in replicas.items()}
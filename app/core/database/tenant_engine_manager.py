@@ -0,0 +1,151 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+
+class TenantEngineManager:
+    """
+    Lazily created, bounded set of engines for tenants that are not configured
+    binds.
+
+    A tenant's database URL is taken from `SQLALCHEMY_BINDS` (binds added
+    after the app was initialized) or else from the `Database` model, looked up
+    with a Core query on the default engine. At most `max_engines` engines are
+    kept; when a new one would exceed that, the least recently used engines
+    with no checked out connections are disposed, closing their pools.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        make_engine: Callable[[str, str], Engine],
+        default_engine: Callable[[], Engine],
+        max_engines: int = 100,
+    ) -> None:
+        """
+        Parameters:
+            app (Any): The Flask app whose config lists the binds.
+            make_engine (Callable[[str, str], Engine]): Builds the engine of a
+                tenant from its name and database URL.
+            default_engine (Callable[[], Engine]): Returns the engine holding
+                the `Database` model.
+            max_engines (int): Maximum number of engines kept open.
+        """
+        self.app = app
+        self.make_engine = make_engine
+        self.default_engine = default_engine
+        self.max_engines = max_engines
+        self._engines: "OrderedDict[str, Engine]" = OrderedDict()
+        self._lock = Lock()
+
+    def get_engine(self, tenant: str) -> Optional[Engine]:
+        """
+        Returns the engine of a tenant, creating it on first use.
+
+        Parameters:
+            tenant (str): The tenant (organization) name.
+
+        Returns:
+            Optional[Engine]: The engine, or None if no database is known for
+            the tenant.
+        """
+        with self._lock:
+            engine = self._engines.get(tenant)
+            if engine is not None:
+                self._engines.move_to_end(tenant)
+                return engine
+
+        # Looked up outside the lock so a slow lookup does not block the
+        # tenants whose engines already exist
+        database_uri = self.get_database_uri(tenant)
+        if database_uri is None:
+            return None
+
+        with self._lock:
+            engine = self._engines.get(tenant)
+            if engine is None:
+                engine = self.make_engine(tenant, database_uri)
+                self._engines[tenant] = engine
+                self._evict()
+            self._engines.move_to_end(tenant)
+            return engine
+
+    def get_database_uri(self, tenant: str) -> Optional[str]:
+        """
+        Returns the database URL of a tenant from the config binds or the
+        `Database` model.
+        """
+        database_uri = self.app.config.get("SQLALCHEMY_BINDS", {}).get(tenant)
+        if database_uri is not None:
+            return database_uri
+
+        from app.models.data.database import Database
+
+        table = Database.__table__
+        query = select(table.c.database_uri).where(
+            table.c.name == tenant, table.c.deleted_at.is_(None)
+        )
+        with self.default_engine().connect() as connection:
+            return connection.execute(query).scalar()
+
+    def _evict(self) -> None:
+        # Called with the lock held. Engines still in use are skipped, so the
+        # limit can be exceeded while every pool is busy.
+        for tenant in list(self._engines):
+            if len(self._engines) <= self.max_engines:
+                break
+            engine = self._engines[tenant]
+            if checked_out_connections(engine):
+                continue
+            del self._engines[tenant]
+            engine.dispose()
+
+    def dispose(self, tenant: Optional[str] = None) -> None:
+        """
+        Disposes the engine of a tenant, or of every tenant, so it is rebuilt
+        (e.g. with a new URL) on next use.
+        """
+        with self._lock:
+            if tenant is None:
+                engines = list(self._engines.values())
+                self._engines.clear()
+            else:
+                engine = self._engines.pop(tenant, None)
+                engines = [] if engine is None else [engine]
+
+        for engine in engines:
+            engine.dispose()
+
+    def pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the pool statistics of each open tenant engine, least recently
+        used first.
+        """
+        with self._lock:
+            engines = list(self._engines.items())
+        return {tenant: get_pool_stats(engine) for tenant, engine in engines}
+
+
+def checked_out_connections(engine: Engine) -> int:
+    """
+    Returns the number of connections of an engine currently in use.
+    """
+    checkedout = getattr(engine.pool, "checkedout", None)
+    return checkedout() if checkedout is not None else 0
+
+
+def get_pool_stats(engine: Engine) -> Dict[str, Any]:
+    """
+    Returns the size and usage of an engine's connection pool. Counters that
+    the pool class does not keep (e.g. for SQLite's pools) are left out.
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        counter = getattr(pool, name, None)
+        if counter is not None:
+            stats[name] = counter()
+    return stats
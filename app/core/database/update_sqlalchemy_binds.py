@@ -1,9 +1,11 @@
+from sqlalchemy.engine import Engine
+
 from app.core.database.database import db
 from flask import current_app as ca
 
 
-def update_sqlalchemy_binds(new_bind_key: str, new_bind_uri: str) -> None:
+def update_sqlalchemy_binds(new_bind_key: str, new_bind_uri: str) -> Engine:
     ca.config["SQLALCHEMY_BINDS"][new_bind_key] = new_bind_uri
-    db.get_engine(
-        ca, bind=new_bind_key
-    )  # This will create a new engine for the new bind
+    # Drop an engine built from a previous URI, then build the new one
+    db.tenant_engines.dispose(new_bind_key)
+    return db.get_tenant_engine(new_bind_key)
@@ -0,0 +1,37 @@
+from typing import Any
+
+from app.brokers.events.i_event_broker import IEventBroker
+from app.brokers.events.in_process_event_broker import InProcessEventBroker
+from app.brokers.events.sqlite_event_broker import SQLiteEventBroker
+
+
+def init_event_broker(app: Any) -> IEventBroker:
+    """
+    Returns the event broker of an app, creating it on first use from the
+    `EVENT_BROKER` config: "in_process" only reaches the subscribers of this
+    process, "sqlite" reaches every worker process on the host through the
+    database at `EVENT_BROKER_SQLITE_PATH`.
+    """
+    broker = app.extensions.get("event_broker")
+    if broker is not None:
+        return broker
+
+    options = {
+        "batch_size": app.config.get("EVENT_BROKER_BATCH_SIZE", 500),
+        "batch_interval": app.config.get("EVENT_BROKER_BATCH_INTERVAL", 0.01),
+        "max_queued_batches": app.config.get(
+            "EVENT_BROKER_MAX_QUEUED_BATCHES", 1000
+        ),
+    }
+    backend = app.config.get("EVENT_BROKER", "in_process")
+    if backend == "in_process":
+        broker = InProcessEventBroker(**options)
+    elif backend == "sqlite":
+        broker = SQLiteEventBroker(
+            app.config["EVENT_BROKER_SQLITE_PATH"], **options
+        )
+    else:
+        raise ValueError(f"Unknown event broker: {backend}")
+
+    app.extensions["event_broker"] = broker
+    return broker
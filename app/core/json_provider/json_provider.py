@@ -0,0 +1,140 @@
+from datetime import date, datetime, time
+from typing import Any, Optional, Type
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.engine import Row
+from sqlalchemy.orm.dynamic import AppenderQuery
+
+from app.services.util.model_serializer import serialize_model
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+def default(o: Any) -> Any:
+    """
+    Converts the values the JSON libraries cannot encode themselves: model
+    instances (with their relationships, as `make_serializable` does),
+    SQLAlchemy rows (as dicts), dynamic relationships (as lists) and dates
+    (in ISO 8601), then whatever Flask's provider handles (Decimals, UUIDs,
+    dataclasses). Raises TypeError for anything else.
+    """
+    if hasattr(o, "__tablename__"):
+        return serialize_model(o)
+    if isinstance(o, Row):
+        return o._asdict()
+    if isinstance(o, AppenderQuery):
+        return o.all()
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    return DefaultJSONProvider.default(o)
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """
+    Flask's JSON provider, encoding models, rows and dates like the fast
+    providers so responses do not depend on which library is installed.
+    """
+
+    default = staticmethod(default)
+
+
+class OrjsonJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider encoding with orjson, which handles datetimes, UUIDs and
+    dataclasses natively and writes the response body as bytes directly.
+    """
+
+    def _options(self, indent: Optional[int] = None, **kwargs: Any) -> int:
+        options = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(
+            obj, default=default, option=self._options(**kwargs)
+        ).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or (
+            self.compact is False
+        )
+        body = orjson.dumps(
+            obj, default=default, option=self._options(indent=indent)
+        )
+        return self._app.response_class(
+            body + b"\n", mimetype=self.mimetype
+        )
+
+
+class MsgspecJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider encoding with msgspec, which handles datetimes, Decimals,
+    UUIDs and dataclasses natively and writes the response body as bytes
+    directly. Keys are kept in insertion order rather than sorted.
+    """
+
+    def __init__(self, app: Any) -> None:
+        super().__init__(app)
+        self._encoder = msgspec.json.Encoder(enc_hook=default)
+        self._decoder = msgspec.json.Decoder()
+
+    def _encode(self, obj: Any, indent: bool = False) -> bytes:
+        try:
+            body = self._encoder.encode(obj)
+        except msgspec.EncodeError as e:
+            raise TypeError(str(e)) from e
+        return msgspec.json.format(body, indent=2) if indent else body
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return self._encode(obj, bool(kwargs.get("indent"))).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return self._decoder.decode(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Any:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or (
+            self.compact is False
+        )
+        return self._app.response_class(
+            self._encode(obj, indent) + b"\n", mimetype=self.mimetype
+        )
+
+
+def get_json_provider_class(name: str = "auto") -> Type[DefaultJSONProvider]:
+    """
+    Returns the JSON provider class for the `JSON_PROVIDER` config: "orjson",
+    "msgspec" or "stdlib", or "auto" for the first whose library is
+    installed, in that order. A named library that is missing falls back to
+    the stdlib provider.
+    """
+    if name in ("auto", "orjson") and orjson is not None:
+        return OrjsonJSONProvider
+    if name in ("auto", "msgspec") and msgspec is not None:
+        return MsgspecJSONProvider
+    if name not in ("auto", "orjson", "msgspec", "stdlib"):
+        raise ValueError(f"Unknown JSON provider: {name}")
+    return StdlibJSONProvider
+
+
+def init_json_provider(app: Any) -> Any:
+    provider_class = get_json_provider_class(
+        app.config.get("JSON_PROVIDER", "auto")
+    )
+    app.json = provider_class(app)
+    return app
@@ -0,0 +1,78 @@
+from threading import Lock
+from typing import Any, Optional, Set, Tuple
+
+from sqlalchemy.schema import CreateSchema
+
+from app.core.create_database.create_database import create_database
+from app.core.create_tables_from_models.create_tables_from_models import (
+    create_tables_from_models,
+)
+from app.core.database.database import db
+
+
+# (database URL, schema) of every tenant provisioned by this process
+_provisioned: Set[Tuple[str, Optional[str]]] = set()
+# Held while a database is provisioned, so concurrent first requests (threads
+# or patched gevent greenlets) do not create the same database twice.
+_provision_lock = Lock()
+
+
+def provision_tenant(app: Any, tenant: Optional[str] = None) -> bool:
+    """
+    Creates the database and tables of a tenant, once per process.
+
+    After the first call for a database this is a set lookup, so it is cheap
+    to call on every request. Must be called within an app context.
+
+    Args:
+        app (Any): The Flask app.
+        tenant (Optional[str]): The tenant (organization) name.
+
+    Returns:
+        bool: True if the database was provisioned by this call.
+    """
+    if tenant not in (None, "default"):
+        # The default database holds the `Database` model tenant engines are
+        # looked up from
+        provision_tenant(app=app, tenant="default")
+
+    engine = db.get_tenant_engine(tenant or "default")
+    schema = db.get_tenant_schema(tenant)
+    key = (str(engine.url), schema)
+
+    if key in _provisioned:
+        return False
+
+    with _provision_lock:
+        if key in _provisioned:
+            return False
+
+        create_database(app=app, engine=engine)
+        if schema is not None:
+            with engine.begin() as connection:
+                connection.execute(CreateSchema(schema, if_not_exists=True))
+        create_tables_from_models(app=app, engine=engine)
+        _provisioned.add(key)
+
+    app.logger.info("Tenant database provisioned: " + str(tenant))
+    return True
+
+
+def provision_all_tenants(app: Any) -> None:
+    """
+    Provisions every configured tenant bind, e.g. at startup so no request
+    pays for it.
+    """
+    with app.app_context():
+        for bind_key in db.engines:
+            if bind_key is not None:
+                provision_tenant(app=app, tenant=bind_key)
+
+
+def reset_provisioned_tenants() -> None:
+    """
+    Forgets which databases were provisioned, so they are checked again on
+    their next request (e.g. after a tenant database was dropped).
+    """
+    with _provision_lock:
+        _provisioned.clear()
@@ -0,0 +1,317 @@
+import time
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Set,
+)
+
+from flask import current_app, g, has_app_context
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import BinaryExpression, BindParameter
+
+from app.models.data.base_model import BaseModel
+from app.services.util.model_serializer import get_model_serializer
+
+
+CommitListener = Callable[[List["Change"]], None]
+
+
+@dataclass(frozen=True)
+class _Registration:
+    listener: CommitListener
+    # Tables whose changes the listener receives, None for all of them
+    collections: Optional[FrozenSet[str]]
+    with_data: bool
+
+
+_commit_listeners: List[_Registration] = []
+_commit_listeners_lock = Lock()
+
+
+@dataclass
+class Change:
+    """
+    One committed change of a record of a `BaseModel` table.
+
+    Attributes:
+        action (str): "create", "update" or "delete".
+        collection (str): The table name of the record.
+        record_id (Any): The primary key of the record, or None when a bulk
+            statement changed records it does not name (e.g. an insert of
+            rows without ids, or an update with other criteria).
+        tenant (str): The tenant whose database holds the record.
+        data (Dict[str, Any]): The column values of the record loaded when
+            it was flushed (its last values for a delete), or the values a
+            bulk insert or update wrote. Columns the flush expired, such as
+            server-side `onupdate` ones, are left out, and it is empty for
+            bulk deletes and unless a listener of its table asked for data.
+        timestamp (float): When the change was flushed (Unix time).
+    """
+
+    action: Literal["create", "update", "delete"]
+    collection: str
+    record_id: Any
+    tenant: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "action": self.action,
+            "collection": self.collection,
+            "record_id": self.record_id,
+            "data": self.data,
+            "timestamp": self.timestamp,
+        }
+
+
+def add_commit_listener(
+    listener: CommitListener,
+    collections: Optional[Iterable[str]] = None,
+    with_data: bool = True,
+) -> CommitListener:
+    """
+    Registers a callable run with the list of changes of every commit that
+    changed `BaseModel` records of `collections` (table names, all of them
+    by default). Changes are only collected for tables some listener asked
+    for, and their column values only when one asked `with_data`. Listeners
+    run in the committing thread, after the commit, in the order they were
+    added; they should hand slow work off rather than block the request. Can
+    be used as a decorator.
+    """
+    registration = _Registration(
+        listener,
+        None if collections is None else frozenset(collections),
+        with_data,
+    )
+    with _commit_listeners_lock:
+        if all(r.listener is not listener for r in _commit_listeners):
+            _commit_listeners.append(registration)
+    return listener
+
+
+def remove_commit_listener(listener: CommitListener) -> None:
+    """
+    Unregisters a listener added with `add_commit_listener`.
+    """
+    with _commit_listeners_lock:
+        _commit_listeners[:] = [
+            r for r in _commit_listeners if r.listener is not listener
+        ]
+
+
+def _current_tenant() -> str:
+    if has_app_context():
+        return getattr(g, "tenant", "default")
+    return "default"
+
+
+def _columns(model_class: type, values: Dict[str, Any]) -> Dict[str, Any]:
+    # The column values among attribute values, keyed by column name
+    serializer = get_model_serializer(model_class)
+    data = {
+        name: values[key]
+        for name, key in serializer.plain_columns
+        if key in values
+    }
+    for name, key, converter in serializer.converted_columns:
+        if key in values:
+            value = values[key]
+            data[name] = None if value is None else converter(value)
+    return data
+
+
+def _loaded_columns(instance: Any) -> Dict[str, Any]:
+    # Only the values already loaded are read: expired ones (e.g. refreshed
+    # by `onupdate` server functions) would each cost a SELECT in the flush
+    return _columns(instance.__class__, instance.__dict__)
+
+
+def _record_id(instance: Any) -> Any:
+    # The identity key holds the primary key even when `id` is expired
+    identity = sa_inspect(instance).identity
+    if identity is not None:
+        return identity[0]
+    return instance.__dict__.get("id")
+
+
+def _wanted(
+    registrations: List[_Registration], with_data: bool = False
+) -> Optional[FrozenSet[str]]:
+    # The tables some registration wants (with data), None for all of them
+    tables: Set[str] = set()
+    for registration in registrations:
+        if with_data and not registration.with_data:
+            continue
+        if registration.collections is None:
+            return None
+        tables.update(registration.collections)
+    return frozenset(tables)
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    registrations = list(_commit_listeners)
+    # Nothing is collected when no one listens
+    if not registrations:
+        return
+
+    collected = _wanted(registrations)
+    with_data = _wanted(registrations, with_data=True)
+    tenant = _current_tenant()
+    changes = session.info.setdefault("_pending_changes", [])
+
+    def record(action: str, instance: Any) -> None:
+        if not isinstance(instance, BaseModel):
+            return
+        collection = instance.__tablename__
+        if collected is not None and collection not in collected:
+            return
+        changes.append(
+            Change(
+                action=action,
+                collection=collection,
+                record_id=_record_id(instance),
+                tenant=tenant,
+                data=(
+                    _loaded_columns(instance)
+                    if with_data is None or collection in with_data
+                    else {}
+                ),
+            )
+        )
+
+    for instance in session.new:
+        record("create", instance)
+    for instance in session.dirty:
+        if session.is_modified(instance):
+            record("update", instance)
+    for instance in session.deleted:
+        record("delete", instance)
+
+
+def _criteria_ids(statement: Any, primary_key: Any) -> Optional[List[Any]]:
+    # The ids a statement filtered by `id IN (...)` or `id == ...` targets
+    criteria = getattr(statement, "whereclause", None)
+    if not isinstance(criteria, BinaryExpression):
+        return None
+    if not criteria.left.compare(primary_key):
+        return None
+    if not isinstance(criteria.right, BindParameter):
+        return None
+    if criteria.operator is operators.in_op:
+        return list(criteria.right.value)
+    if criteria.operator is operators.eq:
+        return [criteria.right.value]
+    return None
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(orm_execute_state: Any) -> None:
+    # Bulk statements (e.g. the storage broker's bulk writes) skip the flush
+    if orm_execute_state.is_select:
+        return
+    registrations = list(_commit_listeners)
+    if not registrations:
+        return
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or not issubclass(mapper.class_, BaseModel):
+        return
+    model_class = mapper.class_
+    collection = model_class.__tablename__
+    collected = _wanted(registrations)
+    if collected is not None and collection not in collected:
+        return
+
+    if orm_execute_state.is_insert:
+        action = "create"
+    elif orm_execute_state.is_update:
+        action = "update"
+    elif orm_execute_state.is_delete:
+        action = "delete"
+    else:
+        return
+    with_data = _wanted(registrations, with_data=True)
+    with_data = with_data is None or collection in with_data
+    tenant = _current_tenant()
+    changes = orm_execute_state.session.info.setdefault(
+        "_pending_changes", []
+    )
+
+    statement = orm_execute_state.statement
+    primary_key = mapper.primary_key[0]
+    id_key = mapper.get_property_by_column(primary_key).key
+    parameters = orm_execute_state.parameters
+    if isinstance(parameters, dict):
+        parameters = [parameters]
+
+    if parameters and getattr(statement, "whereclause", None) is None:
+        # A bulk insert or update by primary key: one change per row, whose
+        # id is only known when the row holds it
+        for row in parameters:
+            changes.append(
+                Change(
+                    action=action,
+                    collection=collection,
+                    record_id=row.get(id_key),
+                    tenant=tenant,
+                    data=_columns(model_class, row) if with_data else {},
+                )
+            )
+        return
+
+    ids = _criteria_ids(statement, primary_key)
+    for record_id in ids if ids is not None else [None]:
+        changes.append(
+            Change(
+                action=action,
+                collection=collection,
+                record_id=record_id,
+                tenant=tenant,
+            )
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    changes: Optional[List[Change]] = session.info.pop(
+        "_pending_changes", None
+    )
+    if not changes:
+        return
+
+    for registration in list(_commit_listeners):
+        if registration.collections is None:
+            listened = changes
+        else:
+            listened = [
+                change
+                for change in changes
+                if change.collection in registration.collections
+            ]
+            if not listened:
+                continue
+        try:
+            registration.listener(listened)
+        except Exception:
+            # The commit succeeded; a failing listener must not undo that
+            if has_app_context():
+                current_app.logger.exception(
+                    "Commit listener %r failed", registration.listener
+                )
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("_pending_changes", None)
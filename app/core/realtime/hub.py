@@ -0,0 +1,343 @@
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.core.realtime.change_feed import Change
+from app.services.util.make_serializable import serialize_scalar
+
+
+def format_sse(event: str, data: Any) -> str:
+    """
+    Formats one Server-Sent Event with a JSON payload.
+    """
+    payload = json.dumps(
+        data, default=serialize_scalar, separators=(",", ":")
+    )
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+def coalesce(previous: Optional[Change], change: Change) -> Optional[Change]:
+    """
+    Merges a change into the waiting change of the same record: a create
+    then an update is one create with the latest values, a create then a
+    delete cancels out (None), and otherwise the latest change wins. As
+    changes only carry the values loaded when they were flushed, the values
+    of an update are merged over those of the change it follows.
+    """
+    if previous is None or previous.action == "delete":
+        return change
+    if change.action == "delete":
+        return None if previous.action == "create" else change
+    return Change(
+        action=previous.action if change.action == "update" else "create",
+        collection=change.collection,
+        record_id=change.record_id,
+        tenant=change.tenant,
+        data={**previous.data, **change.data},
+        timestamp=change.timestamp,
+    )
+
+
+class Batch:
+    """
+    The coalesced changes of one topic sealed together, with their event
+    encoded once for every subscriber without filters.
+    """
+
+    __slots__ = ("seq", "changes", "_event")
+
+    def __init__(self, seq: int, changes: List[Change]) -> None:
+        self.seq = seq
+        self.changes = changes
+        self._event: Optional[str] = None
+
+    @property
+    def event(self) -> str:
+        if self._event is None:
+            self._event = format_sse(
+                "changes", [change.to_dict() for change in self.changes]
+            )
+        return self._event
+
+
+class Topic:
+    """
+    The changes of one collection, or of one record, of a tenant.
+
+    Published changes are coalesced per record into a pending batch, which
+    is sealed by the first subscriber to read once it is `batch_interval`
+    old (or early when it reaches `max_pending` records). The last
+    `max_batches` sealed batches are kept, and each subscriber reads the ones
+    after the last it sent, so publishing does no work per subscriber.
+    """
+
+    def __init__(
+        self, batch_interval: float, max_batches: int, max_pending: int
+    ) -> None:
+        self.batch_interval = batch_interval
+        self.max_batches = max_batches
+        self.max_pending = max_pending
+        self.seq = 0
+        self.subscribers = 0
+        self._batches: Deque[Batch] = deque(maxlen=max_batches)
+        self._pending: Dict[Any, Change] = {}
+        self._pending_since = 0.0
+        # Looked up on use, so they are cooperative once gevent has patched
+        # threading
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    def push(self, change: Change) -> bool:
+        """
+        Adds a change to the pending batch. Returns True if it was coalesced
+        with a pending change of the same record.
+        """
+        with self._lock:
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            key = change.record_id
+            if key is None:
+                # Bulk changes of records not named are never merged
+                key = object()
+            previous = self._pending.pop(key, None)
+            merged = coalesce(previous, change)
+            if merged is not None:
+                self._pending[key] = merged
+            if len(self._pending) >= self.max_pending:
+                self._seal()
+            ready = self._ready
+        ready.set()
+        return previous is not None
+
+    def _seal(self) -> None:
+        # Called with the lock held
+        if self._pending:
+            self.seq += 1
+            self._batches.append(Batch(self.seq, list(self._pending.values())))
+            self._pending = {}
+        # Waiters on the old event return; later ones wait for new changes
+        self._ready = threading.Event()
+
+    def due_in(self) -> float:
+        """
+        Returns the seconds until the pending batch is due to be sealed.
+        """
+        if not self._pending:
+            return 0.0
+        due = self._pending_since + self.batch_interval - time.monotonic()
+        return max(due, 0.0)
+
+    def wait(self, seq: int, timeout: float) -> bool:
+        """
+        Waits until there are changes after batch `seq`, or the timeout
+        passes.
+        """
+        ready = self._ready
+        if self.seq > seq or ready.is_set():
+            return True
+        return ready.wait(timeout)
+
+    def read(self, seq: int) -> Optional[List[Batch]]:
+        """
+        Seals the pending changes if they are due and returns the batches
+        after batch `seq`, or None if some of them were already dropped.
+        """
+        with self._lock:
+            if self.due_in() <= 0:
+                self._seal()
+            batches = [batch for batch in self._batches if batch.seq > seq]
+        if batches and batches[0].seq != seq + 1:
+            return None
+        if not batches and self.seq > seq:
+            return None
+        return batches
+
+
+class Subscription:
+    """
+    One client's subscription to a topic, with its own filters and position.
+    """
+
+    __slots__ = ("key", "topic", "filters", "seq")
+
+    def __init__(
+        self,
+        key: Tuple[Any, ...],
+        topic: Topic,
+        filters: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self.key = key
+        self.topic = topic
+        self.filters = filters or {}
+        self.seq = topic.seq
+
+    @property
+    def collection(self) -> str:
+        return self.key[1]
+
+    def matches(self, change: Change) -> bool:
+        """
+        Returns whether a change passes the subscription's filters, which
+        compare column values as strings.
+        """
+        data = change.data
+        for column, value in self.filters.items():
+            if str(data.get(column)) != value:
+                return False
+        return True
+
+
+class ChangeFeedHub:
+    """
+    Fans committed changes out to subscriptions of a tenant's collections or
+    records.
+
+    Each change is added to at most two topics, its collection's and its
+    record's, whatever the number of subscribers. Subscribers stream the
+    batches of their topic as Server-Sent Events, filtered on the server.
+    """
+
+    def __init__(
+        self,
+        batch_interval: float = 0.05,
+        heartbeat: float = 15.0,
+        max_batches: int = 256,
+        max_pending: int = 10_000,
+    ) -> None:
+        """
+        Parameters:
+            batch_interval (float): Seconds a stream waits after the first
+                change of a batch for more to coalesce with it.
+            heartbeat (float): Seconds between keepalive comments of an idle
+                stream.
+            max_batches (int): Sealed batches kept per topic for subscribers
+                that are behind; one further behind is overflowed.
+            max_pending (int): Records coalesced per topic before the batch
+                is sealed early.
+        """
+        self.batch_interval = batch_interval
+        self.heartbeat = heartbeat
+        self.max_batches = max_batches
+        self.max_pending = max_pending
+        self._topics: Dict[Tuple[Any, ...], Topic] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "published": 0,
+            "coalesced": 0,
+            "delivered": 0,
+            "overflowed": 0,
+        }
+
+    def subscribe(
+        self,
+        tenant: str,
+        collection: str,
+        record_id: Optional[Any] = None,
+        filters: Optional[Dict[str, str]] = None,
+    ) -> Subscription:
+        """
+        Adds a subscription to the changes of a collection, or of one record
+        of it when `record_id` is given.
+        """
+        key: Tuple[Any, ...] = (tenant, collection)
+        if record_id is not None:
+            key += (str(record_id),)
+
+        with self._lock:
+            topic = self._topics.get(key)
+            if topic is None:
+                topic = Topic(
+                    self.batch_interval, self.max_batches, self.max_pending
+                )
+                self._topics[key] = topic
+            topic.subscribers += 1
+        return Subscription(key, topic, filters)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """
+        Removes a subscription, and its topic once it has no subscribers.
+        """
+        with self._lock:
+            topic = subscription.topic
+            topic.subscribers -= 1
+            if topic.subscribers <= 0:
+                self._topics.pop(subscription.key, None)
+
+    def publish(self, changes: List[Change]) -> None:
+        """
+        Adds committed changes to the topics subscribed to. Registered as a
+        commit listener of the change feed.
+        """
+        topics = self._topics
+        coalesced = 0
+        for change in changes:
+            collection_key = (change.tenant, change.collection)
+            keys = [collection_key]
+            if change.record_id is not None:
+                keys.append((*collection_key, str(change.record_id)))
+            for key in keys:
+                topic = topics.get(key)
+                if topic is not None and topic.push(change):
+                    coalesced += 1
+        self._stats["published"] += len(changes)
+        self._stats["coalesced"] += coalesced
+
+    def stream(self, subscription: Subscription) -> Iterator[str]:
+        """
+        Yields the Server-Sent Events of a subscription: one `changes` event
+        per batch, keepalive comments while idle, and an `overflow` event
+        before closing a subscription that fell too far behind (the client
+        should then read the collection again). Unsubscribes when the client
+        disconnects.
+        """
+        topic = subscription.topic
+        try:
+            yield f"retry: {int(self.heartbeat * 1000)}\n\n"
+            yield format_sse(
+                "connected", {"collection": subscription.collection}
+            )
+            while True:
+                if not topic.wait(subscription.seq, self.heartbeat):
+                    yield ": keepalive\n\n"
+                    continue
+
+                # Let the rest of a burst of commits arrive and coalesce
+                time.sleep(topic.due_in())
+                batches = topic.read(subscription.seq)
+                if batches is None:
+                    self._stats["overflowed"] += 1
+                    yield format_sse("overflow", {})
+                    return
+
+                for batch in batches:
+                    subscription.seq = batch.seq
+                    if not subscription.filters:
+                        self._stats["delivered"] += len(batch.changes)
+                        yield batch.event
+                        continue
+
+                    changes = [
+                        change.to_dict()
+                        for change in batch.changes
+                        if subscription.matches(change)
+                    ]
+                    if changes:
+                        self._stats["delivered"] += len(changes)
+                        yield format_sse("changes", changes)
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the numbers of topics and subscriptions, and the counts of
+        published, coalesced, delivered and overflowed changes.
+        """
+        with self._lock:
+            topics = list(self._topics.values())
+        return {
+            "topics": len(topics),
+            "subscriptions": sum(topic.subscribers for topic in topics),
+            **self._stats,
+        }
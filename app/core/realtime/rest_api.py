@@ -0,0 +1,188 @@
+from dataclasses import asdict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from flask import Response, g, request, stream_with_context
+from flask_restx import Resource
+from flask_security import auth_required
+
+from app.core.database.database import db
+from app.core.event_broker.event_broker import init_event_broker
+from app.core.realtime.change_feed import Change, add_commit_listener
+from app.core.realtime.hub import ChangeFeedHub
+from app.core.requires.requires import requires
+
+
+# Query arguments that are not filters on the changed records' columns
+RESERVED_ARGS = {"organization"}
+
+# Event broker channel carrying the committed changes of every process
+CHANGES_CHANNEL = "realtime.changes"
+
+
+def init_change_feed_hub(
+    app: Any, collections: Optional[Iterable[str]] = None
+) -> ChangeFeedHub:
+    """
+    Creates the change feed hub of an app. The committed changes of
+    `collections` (by default `REALTIME_COLLECTIONS`) are published on the
+    app's event broker, and the hub receives the changes of every process
+    sharing the broker.
+    """
+    hub = app.extensions.get("change_feed_hub")
+    if hub is not None:
+        return hub
+
+    hub = ChangeFeedHub(
+        batch_interval=app.config.get("REALTIME_BATCH_INTERVAL", 0.05),
+        heartbeat=app.config.get("REALTIME_HEARTBEAT", 15.0),
+    )
+    broker = init_event_broker(app)
+
+    def publish_changes(changes: List[Change]) -> None:
+        for change in changes:
+            broker.publish(CHANGES_CHANNEL, asdict(change))
+
+    def receive_changes(messages: List[Dict[str, Any]]) -> None:
+        hub.publish([Change(**message) for message in messages])
+
+    def resubscribe() -> None:
+        # The hub fell behind; its clients miss the dropped changes
+        app.logger.warning("Change feed hub dropped by the event broker")
+        broker.subscribe(CHANGES_CHANNEL, receive_changes, on_drop=resubscribe)
+
+    if collections is None:
+        collections = app.config.get("REALTIME_COLLECTIONS", [])
+    add_commit_listener(publish_changes, collections=collections)
+    broker.subscribe(CHANGES_CHANNEL, receive_changes, on_drop=resubscribe)
+    app.extensions["change_feed_hub"] = hub
+    return hub
+
+
+def realtime_decorators(app: Any) -> List[Callable[..., Any]]:
+    """
+    Returns the method decorators of the realtime endpoints from config:
+    authentication by `REALTIME_AUTH_METHODS` (none when empty), then the
+    `REALTIME_ROLES` and `REALTIME_PERMISSIONS` checks.
+    """
+    decorators: List[Callable[..., Any]] = []
+    roles = app.config.get("REALTIME_ROLES") or None
+    permissions = app.config.get("REALTIME_PERMISSIONS") or None
+    if roles or permissions:
+        decorators.append(requires(roles=roles, permissions=permissions))
+
+    # flask_restx applies method decorators in order, so the last is outermost
+    methods = app.config.get("REALTIME_AUTH_METHODS", ["token", "session"])
+    if methods:
+        decorators.append(auth_required(*methods))
+    return decorators
+
+
+def realtime_api(
+    app: Any,
+    collections: Optional[Iterable[str]] = None,
+    decorators: Optional[List[Callable[..., Any]]] = None,
+) -> None:
+    """
+    Registers Server-Sent Events endpoints streaming the committed changes of
+    a collection, `/api/realtime/<collection>`, or of one of its records,
+    `/api/realtime/<collection>/<record_id>`, in the requesting tenant.
+
+    Only the tables listed in `collections` (by default `REALTIME_COLLECTIONS`)
+    can be subscribed to, as every column of a changed row is sent; with none
+    listed nothing is registered and no changes are collected. Query
+    arguments filter the changes on column values, e.g. `?status=active`.
+    The endpoints require a user authenticated by one of
+    `REALTIME_AUTH_METHODS` and, when set, one of `REALTIME_ROLES` and of
+    `REALTIME_PERMISSIONS`; pass `decorators` to protect them otherwise.
+    """
+    if collections is None:
+        collections = app.config.get("REALTIME_COLLECTIONS", [])
+    collections = set(collections)
+    if not collections:
+        return
+
+    if decorators is None:
+        decorators = realtime_decorators(app)
+
+    hub = init_change_feed_hub(app, collections)
+    # Table name -> model, filled on first use as plugins add models later
+    models: Dict[str, Any] = {}
+
+    def get_model(collection: str) -> Any:
+        if collection not in collections:
+            return None
+        if collection not in models:
+            models.update(
+                (mapper.class_.__tablename__, mapper.class_)
+                for mapper in db.Model.registry.mappers
+                if getattr(mapper.class_, "__tablename__", None)
+                in collections
+            )
+        return models.get(collection)
+
+    # Swagger namespace
+    ns = app.api.namespace(
+        "api/realtime",
+        description="Realtime changes of records as Server-Sent Events",
+    )
+
+    def subscribe(collection: str, record_id: Optional[str] = None) -> Any:
+        model = get_model(collection)
+        if model is None:
+            ns.abort(404, f"No realtime collection: {collection}")
+
+        filters = {
+            key: value
+            for key, value in request.args.items()
+            if key not in RESERVED_ARGS
+        }
+        unknown = set(filters) - set(model.__table__.columns.keys())
+        if unknown:
+            ns.abort(422, f"Unknown filter columns: {sorted(unknown)}")
+
+        subscription = hub.subscribe(
+            getattr(g, "tenant", "default"),
+            collection,
+            record_id=record_id,
+            filters=filters,
+        )
+
+        def stream() -> Iterator[str]:
+            # Runs once the view and after_request hooks are done. The
+            # stream never queries the database, so the request's session
+            # (and any pooled connection the auth checks checked out) is
+            # released instead of held for the life of the subscription.
+            db.session.close()
+            yield from hub.stream(subscription)
+
+        response = Response(
+            stream_with_context(stream()),
+            mimetype="text/event-stream",
+        )
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"  # Unbuffered proxies
+        return response
+
+    @ns.route("/<string:collection>")
+    class CollectionChangesResource(Resource):
+        method_decorators = list(decorators or [])
+
+        @ns.doc(
+            responses={200: "OK", 404: "Not Found", 422: "Unprocessable"},
+            description="Stream the changes of a collection",
+        )
+        def get(self, collection):
+            """Subscribe to the changes of a collection"""
+            return subscribe(collection)
+
+    @ns.route("/<string:collection>/<string:record_id>")
+    class RecordChangesResource(Resource):
+        method_decorators = list(decorators or [])
+
+        @ns.doc(
+            responses={200: "OK", 404: "Not Found", 422: "Unprocessable"},
+            description="Stream the changes of one record",
+        )
+        def get(self, collection, record_id):
+            """Subscribe to the changes of a record"""
+            return subscribe(collection, record_id)
@@ -0,0 +1,198 @@
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import count
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Iterable, Tuple
+
+from flask import current_app, g, has_app_context, has_request_context
+from flask_login import current_user, user_logged_in
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+
+_PERMISSION_SEPARATORS = re.compile(r"[,\s]+")
+
+# Bumped whenever a role, its permissions or a user's roles are committed;
+# indexes built at an older version are rebuilt on next use
+_versions = count(1)
+_version = next(_versions)
+
+# (tenant, user id) -> (version, expiry time, index), oldest first
+_index_cache: "OrderedDict[Tuple[Any, Any], Tuple[int, float, Any]]" = (
+    OrderedDict()
+)
+_index_cache_lock = Lock()
+
+
+def parse_permissions(permissions: Any) -> FrozenSet[str]:
+    """
+    Parses the permissions of a role, stored as comma or whitespace separated
+    text (or already as a list), into a set.
+    """
+    if not permissions:
+        return frozenset()
+    if isinstance(permissions, str):
+        permissions = _PERMISSION_SEPARATORS.split(permissions)
+    return frozenset(p.strip() for p in permissions if p and p.strip())
+
+
+@dataclass(frozen=True)
+class PermissionIndex:
+    """
+    The role names and parsed permissions of one user, so that role and
+    permission checks are set lookups.
+
+    Attributes:
+        roles (FrozenSet[str]): The names of the user's roles.
+        permissions (FrozenSet[str]): The permissions of all of the roles.
+        role_permissions (Dict[str, FrozenSet[str]]): The permissions of each
+            role.
+    """
+
+    roles: FrozenSet[str] = frozenset()
+    permissions: FrozenSet[str] = frozenset()
+    role_permissions: Dict[str, FrozenSet[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_user(cls, user: Any) -> "PermissionIndex":
+        role_permissions = {
+            role.name: parse_permissions(role.permissions)
+            for role in user.roles
+        }
+        permissions: FrozenSet[str] = frozenset().union(
+            *role_permissions.values()
+        )
+        return cls(
+            roles=frozenset(role_permissions),
+            permissions=permissions,
+            role_permissions=role_permissions,
+        )
+
+    def has_role(self, role: str) -> bool:
+        return role in self.roles
+
+    def has_any_role(self, roles: Iterable[str]) -> bool:
+        return not self.roles.isdisjoint(roles)
+
+    def has_permission(self, permission: str) -> bool:
+        return permission in self.permissions
+
+    def has_any_permission(self, permissions: Iterable[str]) -> bool:
+        return not self.permissions.isdisjoint(permissions)
+
+    def role_has_permission(self, role: str, permission: str) -> bool:
+        return permission in self.role_permissions.get(role, frozenset())
+
+
+EMPTY_PERMISSION_INDEX = PermissionIndex()
+
+
+def get_permission_index(user: Any = None) -> PermissionIndex:
+    """
+    Returns the permission index of a user, by default the current user.
+
+    The index is built once and reused by the requests of the same user (and
+    tenant) until a role or role assignment is committed, the user logs in
+    again, or `PERMISSION_INDEX_TTL` seconds pass (for changes made by other
+    processes). Within a request it is also kept on `g`. Anonymous users get
+    an empty index.
+    """
+    if user is None:
+        user = current_user
+    if user is None or not getattr(user, "is_authenticated", False):
+        return EMPTY_PERMISSION_INDEX
+
+    key = (g.get("organization") if has_app_context() else None, user.id)
+
+    per_request = None
+    if has_request_context():
+        per_request = g.setdefault("_permission_indexes", {})
+        index = per_request.get(key)
+        if index is not None:
+            return index
+
+    now = time.monotonic()
+    cached = _index_cache.get(key)
+    if cached is not None and cached[0] == _version and cached[1] > now:
+        index = cached[2]
+    else:
+        version = _version
+        index = PermissionIndex.from_user(user)
+        config = current_app.config if has_app_context() else {}
+        ttl = config.get("PERMISSION_INDEX_TTL", 60)
+        max_users = config.get("PERMISSION_INDEX_MAX_USERS", 10_000)
+        with _index_cache_lock:
+            _index_cache.pop(key, None)
+            while _index_cache and len(_index_cache) >= max_users:
+                _index_cache.popitem(last=False)
+            _index_cache[key] = (version, now + ttl, index)
+
+    if per_request is not None:
+        per_request[key] = index
+    return index
+
+
+def invalidate_permission_indexes(*args: Any, **kwargs: Any) -> None:
+    """
+    Marks every cached permission index as stale.
+    """
+    global _version
+    _version = next(_versions)
+
+
+def _forget_user(sender: Any, user: Any = None, **kwargs: Any) -> None:
+    # A login rebuilds the user's index
+    if user is None:
+        return
+    with _index_cache_lock:
+        for key in [key for key in _index_cache if key[1] == user.id]:
+            del _index_cache[key]
+
+
+def _changes_permissions(instance: Any) -> bool:
+    from app.models.data.role import Role
+    from app.models.data.user import RolesUsers, User
+
+    if isinstance(instance, (Role, RolesUsers)):
+        return True
+    return isinstance(instance, User) and get_history(
+        instance, "roles"
+    ).has_changes()
+
+
+@event.listens_for(Session, "after_flush")
+def _after_flush(session: Session, flush_context: Any) -> None:
+    changed = (*session.new, *session.dirty, *session.deleted)
+    if any(_changes_permissions(instance) for instance in changed):
+        session.info["_permissions_changed"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(orm_execute_state: Any) -> None:
+    # Bulk statements (e.g. the storage broker's bulk writes) skip the flush
+    if orm_execute_state.is_select:
+        return
+    from app.models.data.role import Role
+    from app.models.data.user import RolesUsers
+
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (Role, RolesUsers):
+        orm_execute_state.session.info["_permissions_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    # Only committed changes are visible to the requests that rebuild indexes
+    if session.info.pop("_permissions_changed", False):
+        invalidate_permission_indexes()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session: Session) -> None:
+    session.info.pop("_permissions_changed", None)
+
+
+user_logged_in.connect(_forget_user)
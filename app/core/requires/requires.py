@@ -1,41 +1,49 @@
 from functools import wraps
 
+from flask_login import current_user
+
+from app.core.requires.permission_index import get_permission_index
+
 
 def has_role(user, roles):
     if roles == "any":
         return True
-    return any(role in user.roles for role in roles)
+    return get_permission_index(user).has_any_role(roles)
 
 
 def has_permission(user, permissions):
     if permissions == "any":
         return True
-    return any(
-        permission in role.permissions
-        for role in user.roles
-        for permission in permissions
-    )
+    return get_permission_index(user).has_any_permission(permissions)
 
 
 def requires(roles=None, permissions=None, use_function_name_as_role=False):
     def decorator(f):
+        required_roles = roles
+        required_permissions = permissions
+
+        if use_function_name_as_role and not required_roles:
+            required_roles = [f.__name__]
+
+        # "any" is kept as is, it is not the name of a role or permission
+        if required_roles not in (None, "any") and not isinstance(
+            required_roles, (list, tuple)
+        ):
+            required_roles = [required_roles]
+        if required_permissions not in (None, "any") and not isinstance(
+            required_permissions, (list, tuple)
+        ):
+            required_permissions = [required_permissions]
+
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            user = get_current_user()  # You'll need to define this function
-
-            if use_function_name_as_role and not roles:
-                roles = [f.__name__]
+            user = current_user._get_current_object()
 
-            if roles is not None and not isinstance(roles, (list, tuple)):
-                roles = [roles]
-            if permissions is not None and not isinstance(
-                permissions, (list, tuple)
-            ):
-                permissions = [permissions]
-
-            if roles and not has_role(user, roles):
+            if required_roles and not has_role(user, required_roles):
                 return "Role Required", 403
-            if permissions and not has_permission(user, permissions):
+            if required_permissions and not has_permission(
+                user, required_permissions
+            ):
                 return "Permission Denied", 403
 
             return f(*args, **kwargs)
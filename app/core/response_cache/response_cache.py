@@ -0,0 +1,154 @@
+import hashlib
+import json
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from flask import Response, current_app as ca, g, request
+from flask_login import current_user
+from flask_restx.utils import unpack
+
+from app.brokers.cache.file_cache_broker import FileCacheBroker
+from app.brokers.cache.i_cache_broker import ICacheBroker
+from app.brokers.cache.memory_cache_broker import MemoryCacheBroker
+from app.core.realtime.change_feed import Change, add_commit_listener
+
+
+def init_response_cache(app: Any) -> ICacheBroker:
+    """
+    Returns the response cache of an app, creating it on first use from the
+    `RESPONSE_CACHE_BACKEND` config: "memory" caches in each process,
+    "filesystem" in `RESPONSE_CACHE_DIR`, shared by every process. Commits
+    invalidate the cached responses of the tables they changed, from the
+    moment the cache is created, so call it when building the app.
+    """
+    cache = app.extensions.get("response_cache")
+    if cache is not None:
+        return cache
+
+    backend = app.config.get("RESPONSE_CACHE_BACKEND", "memory")
+    max_entries = app.config.get("RESPONSE_CACHE_MAX_ENTRIES", 1024)
+    if backend == "memory":
+        cache = MemoryCacheBroker(max_entries=max_entries)
+    elif backend == "filesystem":
+        cache = FileCacheBroker(
+            app.config["RESPONSE_CACHE_DIR"], max_entries=max_entries
+        )
+    else:
+        raise ValueError(f"Unknown response cache backend: {backend}")
+
+    def invalidate(changes: List[Change]) -> None:
+        tags = {
+            generation_tag(change.tenant, change.collection)
+            for change in changes
+        }
+        for tag in tags:
+            cache.bump_generation(tag)
+
+    # Only the changed tables are needed, not the rows' values
+    add_commit_listener(invalidate, with_data=False)
+    app.extensions["response_cache"] = cache
+    return cache
+
+
+def generation_tag(tenant: str, table: str) -> str:
+    """
+    Returns the tag whose generation commits changing a table in a tenant
+    bump.
+    """
+    return f"{tenant}:{table}"
+
+
+def _cache_key(
+    cache: ICacheBroker,
+    tables: List[str],
+    vary_on_user: bool,
+) -> str:
+    tenant = g.get("organization", "default")
+    parts = {
+        "tenant": tenant,
+        "method": request.method,
+        "path": request.path,
+        # format and template are query arguments, so part of the key
+        "args": sorted(request.args.items(multi=True)),
+        "generations": [
+            cache.get_generation(generation_tag(tenant, table))
+            for table in tables
+        ],
+    }
+    if vary_on_user:
+        parts["user"] = (
+            current_user.get_id() if current_user.is_authenticated else None
+        )
+    encoded = json.dumps(parts, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def cached_response(
+    models: Iterable[Any] = (),
+    ttl: Optional[float] = None,
+    vary_on_user: bool = False,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Caches the rendered responses of a flask_restx resource method.
+
+    Responses are cached per tenant, path and query arguments (including
+    `format` and `template`), for `ttl` seconds (`RESPONSE_CACHE_TTL` by
+    default), and per user with `vary_on_user`. A commit changing a record of
+    one of `models` in a tenant invalidates that tenant's cached responses.
+    Only complete 200 responses that set no cookies are cached.
+
+    Use as the innermost decorator of a resource method:
+
+        @ns.route("/")
+        class ItemsResource(Resource):
+            @cached_response(models=[Item])
+            def get(self):
+                ...
+    """
+    tables = sorted(model.__tablename__ for model in models)
+
+    def decorator(f: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(f)
+        def decorated_function(*args: Any, **kwargs: Any) -> Any:
+            if not ca.config.get("RESPONSE_CACHE_ENABLED", True):
+                return f(*args, **kwargs)
+
+            cache = init_response_cache(ca)
+            key = _cache_key(cache, tables, vary_on_user)
+            cached = cache.get(key)
+            if cached is not None:
+                body, status, headers = cached
+                return Response(body, status=status, headers=headers)
+
+            data, code, headers = unpack(f(*args, **kwargs))
+            if isinstance(data, Response):
+                return data
+
+            response = ca.api.make_response(data, code, headers=headers)
+            if (
+                response.status_code == 200
+                and not response.is_streamed
+                and "Set-Cookie" not in response.headers
+            ):
+                cache.set(
+                    key,
+                    (
+                        response.get_data(),
+                        response.status_code,
+                        list(response.headers.items()),
+                    ),
+                    ttl or ca.config.get("RESPONSE_CACHE_TTL", 60),
+                )
+            return response
+
+        return decorated_function
+
+    return decorator
+
+
+def response_cache_stats() -> Dict[str, int]:
+    """
+    Returns the hit, miss, set and eviction counters of the app's response
+    cache.
+    """
+    return init_response_cache(ca).stats()
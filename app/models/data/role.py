@@ -6,6 +6,7 @@ from app.models.data.base_model import BaseModel
 
 class Role(RoleMixin, BaseModel):
     __tablename__ = "role"
+    __load_profiles__ = {"default": {"users": "selectin"}}
     id = db.Column(db.Integer(), primary_key=True)
     name = db.Column(db.String(255), unique=True, nullable=False)
     description = db.Column(db.String(255), nullable=True)
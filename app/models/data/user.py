@@ -13,6 +13,7 @@ class RolesUsers(BaseModel):
 
 class User(UserMixin, BaseModel):
     __tablename__ = "user"
+    __load_profiles__ = {"default": {"roles": "selectin"}}
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(255), unique=True)
     username = db.Column(db.String(255), unique=True, nullable=True)
@@ -28,5 +29,5 @@ class User(UserMixin, BaseModel):
     roles = db.relationship(
         "Role",
         secondary="roles_users",
-        backref=db.backref("users", lazy="dynamic"),
+        backref=db.backref("users"),
     )
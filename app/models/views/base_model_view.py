@@ -5,7 +5,8 @@ from werkzeug.wrappers import Response as BaseResponse
 from flask import redirect, request, url_for
 from flask_admin.contrib.sqla import ModelView
 
-from app.models.data.role import Role
+from app.core.requires.permission_index import get_permission_index
+from app.services.util.eager_loading import DEFAULT_PROFILE, apply_load_profile
 
 
 class BaseModelView(ModelView):
@@ -16,32 +17,29 @@ class BaseModelView(ModelView):
     can_view_details = False
     column_display_pk = False  # display primary keys
     page_size = 500  # number of entries to display on list view
+    load_profile = DEFAULT_PROFILE  # eager loading profile of the model
 
     def valid_check(self, permission_name: str) -> bool:
-        class_as_role: Role = current_user.find_role(self.__class__.__name__)
-
-        has_action_as_permission: bool = (
-            permission_name in class_as_role.permissions
-        )
+        # The role named after the view lists the permitted actions
+        permission_index = get_permission_index(current_user)
 
         return any(
             [
-                current_user.has_role("admin"),
-                has_action_as_permission,
+                permission_index.has_role("admin"),
+                permission_index.role_has_permission(
+                    self.__class__.__name__, permission_name
+                ),
             ]
         )
 
     def is_accessible(self) -> bool:
         # Only allow access to admins and managers
+        permission_index = get_permission_index(current_user)
+
         return any(
             [
-                current_user.has_role("admin"),
-                all(
-                    [
-                        current_user.is_authenticated,
-                        current_user.has_role(self.__class__.__name__),
-                    ]
-                ),
+                permission_index.has_role("admin"),
+                permission_index.has_role(self.__class__.__name__),
             ]
         )
 
@@ -89,6 +87,12 @@ class BaseModelView(ModelView):
             f"Current user does not have the: `{permission_name}` permission associated with the Role: `{self.__class__.__name__}`"
         )
 
+    def get_query(self) -> Any:
+        # Eager load the relationships listed with each row of the page
+        return apply_load_profile(
+            super(BaseModelView, self).get_query(), self.load_profile
+        )
+
     def get_one(self, id) -> Any:
         permission_name = "details"
         if self.valid_check(permission_name):
@@ -126,28 +130,15 @@ class BaseModelView(ModelView):
         )
 
     def is_action_allowed(self, name: str) -> bool:
-        print()
-        print("is_action_allowed: name")
-        print(name)
-        print()
         # Check if user has role
         if name not in [
             "create",
             "edit",
             "delete",
             "view",
-        ] or not current_user.has_role(self.__class__.__name__):
+        ] or not get_permission_index(current_user).has_role(
+            self.__class__.__name__
+        ):
             return super(BaseModelView, self).is_action_allowed(name)
 
-        class_as_role: Role = current_user.find_role(self.__class__.__name__)
-
-        has_action_as_permission: bool = name in class_as_role.permissions
-
-        valid_check = any(
-            [
-                current_user.has_role("admin"),
-                has_action_as_permission,
-            ]
-        )
-
-        return valid_check
+        return self.valid_check(name)
@@ -0,0 +1,324 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from jsonschema import Draft7Validator
+
+# Keywords that never produce validation errors
+ANNOTATION_KEYWORDS = {
+    "$schema",
+    "$id",
+    "$comment",
+    "title",
+    "description",
+    "default",
+    "examples",
+    "definitions",
+    "readOnly",
+    "writeOnly",
+}
+
+# Property keywords compiled into whole-column masks
+VECTORIZED_KEYWORDS = {"type", "minimum", "maximum", "pattern", "enum"}
+
+# numpy dtype kinds whose per-row values are plain Python scalars, so column
+# masks agree with what `row.to_dict()` hands to jsonschema
+SUPPORTED_DTYPE_KINDS = {"b", "i", "u", "f", "O"}
+
+# A check receives the rows still without an error and returns the positions
+# of the rows it fails, with one error message per failing row.
+Check = Callable[[np.ndarray], Tuple[np.ndarray, List[str]]]
+
+
+def _native(value: Any) -> Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class _Column:
+    """
+    A DataFrame column as seen by the per-row validator: cast to the common
+    row dtype and boxed to native Python values on demand.
+    """
+
+    def __init__(self, series: pd.Series) -> None:
+        self.series = series
+        self.kind = series.dtype.kind
+        self._values: Optional[List[Any]] = None
+
+    @property
+    def values(self) -> List[Any]:
+        if self._values is None:
+            if self.kind == "O":
+                self._values = [_native(v) for v in self.series.tolist()]
+            else:
+                self._values = self.series.tolist()
+        return self._values
+
+    def take(self, positions: np.ndarray) -> List[Any]:
+        values = self.values
+        return [values[i] for i in positions]
+
+
+class VectorizedSchema:
+    """
+    A Draft-7 schema compiled into whole-column checks.
+
+    The `type`, `minimum`, `maximum`, `pattern` and `enum` keywords of each
+    property and the top-level `required` keyword become NumPy/pandas masks.
+    Property subschemas using any other keyword are validated per value of
+    that column with the original validator. Checks run in the same order as
+    `Draft7Validator.iter_errors`, so the first error reported for each row
+    is the same message the per-row path would report.
+    """
+
+    def __init__(self, validator: Draft7Validator) -> None:
+        self.validator = validator
+        self.float_is_integer = validator.is_type(1.0, "integer")
+        self.plan: List[Tuple[str, Any]] = []
+        self._compile(validator.schema)
+
+    @classmethod
+    def compile(
+        cls, validator: Draft7Validator
+    ) -> Optional["VectorizedSchema"]:
+        """
+        Compile the schema of a validator.
+
+        Parameters:
+            validator (Draft7Validator): The validator whose schema is compiled.
+
+        Returns:
+            Optional[VectorizedSchema]: The compiled schema, or None if the
+            schema uses top-level constructs that need per-row validation.
+        """
+        try:
+            return cls(validator)
+        except NotImplementedError:
+            return None
+
+    def _compile(self, schema: Any) -> None:
+        if not isinstance(schema, dict) or "$ref" in schema:
+            raise NotImplementedError("Schema must be an object without $ref")
+
+        for keyword, value in schema.items():
+            if keyword in ANNOTATION_KEYWORDS:
+                continue
+            elif keyword == "type":
+                types = value if isinstance(value, list) else [value]
+                if "object" not in types:
+                    raise NotImplementedError("Rows are always objects")
+            elif keyword == "properties" and isinstance(value, dict):
+                for property_name, subschema in value.items():
+                    self.plan.append(("property", (property_name, subschema)))
+            elif keyword == "required" and isinstance(value, list):
+                self.plan.append(("required", value))
+            else:
+                raise NotImplementedError(f"Unsupported keyword: {keyword}")
+
+    def validate(
+        self, df: pd.DataFrame
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Validate every row of a DataFrame against the compiled schema.
+
+        Parameters:
+            df (pd.DataFrame): The DataFrame to validate.
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: The `is_valid` and
+            `error_message` values for each row, or None if the DataFrame has
+            column types whose per-row values cannot be reproduced by columns.
+        """
+        if not df.columns.is_unique or any(
+            not isinstance(dtype, np.dtype)
+            or dtype.kind not in SUPPORTED_DTYPE_KINDS
+            for dtype in df.dtypes
+        ):
+            return None
+
+        # Rows of a frame with a single numeric dtype are cast to it
+        row_dtype = df.iloc[:0].values.dtype
+        columns: Dict[Any, _Column] = {}
+
+        def get_column(name: Any) -> _Column:
+            if name not in columns:
+                series = df[name]
+                if row_dtype.kind != "O" and series.dtype != row_dtype:
+                    series = series.astype(row_dtype)
+                columns[name] = _Column(series)
+            return columns[name]
+
+        error_message = np.full(len(df), None, dtype=object)
+        pending = np.ones(len(df), dtype=bool)
+
+        for check in self._checks(df, get_column):
+            if not pending.any():
+                break
+            positions, messages = check(pending)
+            if len(positions):
+                error_message[positions] = messages
+                pending[positions] = False
+
+        return pending, error_message
+
+    def _checks(
+        self, df: pd.DataFrame, get_column: Callable[[Any], _Column]
+    ) -> List[Check]:
+        checks: List[Check] = []
+        for step, value in self.plan:
+            if step == "required":
+                for name in value:
+                    if name not in df.columns:
+                        checks.append(self._missing(name))
+                continue
+
+            property_name, subschema = value
+            if property_name not in df.columns:
+                continue
+            column = get_column(property_name)
+
+            if isinstance(subschema, dict) and set(subschema) <= (
+                VECTORIZED_KEYWORDS | ANNOTATION_KEYWORDS
+            ):
+                for keyword, keyword_value in subschema.items():
+                    if keyword in VECTORIZED_KEYWORDS:
+                        checks.append(
+                            self._keyword(column, keyword, keyword_value)
+                        )
+            else:
+                checks.append(self._per_value(column, subschema))
+        return checks
+
+    def _missing(self, name: str) -> Check:
+        def check(pending: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+            positions = np.flatnonzero(pending)
+            return positions, [f"{name!r} is a required property"] * len(
+                positions
+            )
+
+        return check
+
+    def _per_value(self, column: _Column, subschema: Any) -> Check:
+        def check(pending: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+            failed, messages = [], []
+            values = column.values
+            for position in np.flatnonzero(pending):
+                error = next(
+                    iter(self.validator.descend(values[position], subschema)),
+                    None,
+                )
+                if error is not None:
+                    failed.append(position)
+                    messages.append(error.message)
+            return np.asarray(failed, dtype=np.intp), messages
+
+        return check
+
+    def _keyword(self, column: _Column, keyword: str, value: Any) -> Check:
+        if keyword == "type":
+            types = value if isinstance(value, list) else [value]
+            reprs = ", ".join(repr(t) for t in types)
+
+            def failures() -> np.ndarray:
+                matches = np.zeros(len(column.series), dtype=bool)
+                for json_type in types:
+                    matches |= self._type_mask(column, json_type)
+                return ~matches
+
+            def message(instance: Any) -> str:
+                return f"{instance!r} is not of type {reprs}"
+
+        elif keyword in ("minimum", "maximum"):
+
+            def failures() -> np.ndarray:
+                numbers = self._type_mask(column, "number")
+                if column.kind == "O":
+                    compared = np.zeros(len(numbers), dtype=bool)
+                    values = column.values
+                    for i in np.flatnonzero(numbers):
+                        compared[i] = (
+                            values[i] < value
+                            if keyword == "minimum"
+                            else values[i] > value
+                        )
+                    return compared
+                array = column.series.to_numpy()
+                with np.errstate(invalid="ignore"):
+                    compared = (
+                        array < value if keyword == "minimum" else array > value
+                    )
+                return numbers & compared
+
+            def message(instance: Any) -> str:
+                if keyword == "minimum":
+                    return f"{instance!r} is less than the minimum of {value!r}"
+                return f"{instance!r} is greater than the maximum of {value!r}"
+
+        elif keyword == "pattern":
+            compiled = re.compile(value)
+
+            def failures() -> np.ndarray:
+                strings = self._type_mask(column, "string")
+                failed = np.zeros(len(strings), dtype=bool)
+                if strings.any():
+                    matched = (
+                        column.series[strings]
+                        .str.contains(compiled, regex=True)
+                        .to_numpy(dtype=bool)
+                    )
+                    failed[strings] = ~matched
+                return failed
+
+            def message(instance: Any) -> str:
+                return f"{instance!r} does not match {value!r}"
+
+        elif keyword == "enum":
+            if not all(isinstance(each, str) for each in value):
+                # bool/int and nested equality rules are left to jsonschema
+                return self._per_value(column, {keyword: value})
+
+            def failures() -> np.ndarray:
+                strings = self._type_mask(column, "string")
+                return ~(strings & column.series.isin(value).to_numpy())
+
+            def message(instance: Any) -> str:
+                return f"{instance!r} is not one of {value!r}"
+
+        def check(pending: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+            positions = np.flatnonzero(failures() & pending)
+            return positions, [message(v) for v in column.take(positions)]
+
+        return check
+
+    def _type_mask(self, column: _Column, json_type: str) -> np.ndarray:
+        kind = column.kind
+        size = len(column.series)
+
+        if kind in "iu":
+            return np.full(size, json_type in ("integer", "number"))
+        if kind == "f":
+            if json_type == "number":
+                return np.ones(size, dtype=bool)
+            if json_type == "integer" and self.float_is_integer:
+                array = column.series.to_numpy()
+                return np.isfinite(array) & (np.floor(array) == array)
+            return np.zeros(size, dtype=bool)
+        if kind == "b":
+            return np.full(size, json_type == "boolean")
+
+        # Object columns: the answer only depends on the Python type, except
+        # for floats checked against "integer"
+        is_type = self.validator.is_type
+        by_type: Dict[type, bool] = {}
+        mask = np.empty(size, dtype=bool)
+        for i, v in enumerate(column.values):
+            value_type = type(v)
+            if value_type is float and json_type == "integer":
+                mask[i] = is_type(v, json_type)
+                continue
+            result = by_type.get(value_type)
+            if result is None:
+                result = by_type[value_type] = is_type(v, json_type)
+            mask[i] = result
+        return mask
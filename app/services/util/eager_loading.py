@@ -0,0 +1,151 @@
+from contextlib import contextmanager
+from threading import Lock
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import joinedload, selectinload, subqueryload
+
+
+# Loader strategies a load profile may name for a relationship path
+LOADER_STRATEGIES = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "subquery": subqueryload,
+}
+
+DEFAULT_PROFILE = "default"
+
+_options_cache: Dict[Tuple[type, str], Tuple[Any, ...]] = {}
+_options_lock = Lock()
+
+
+def _build_options(model_class: type, paths: Dict[str, str]) -> List[Any]:
+    options = []
+    for path, strategy in paths.items():
+        if strategy not in LOADER_STRATEGIES:
+            raise ValueError(
+                f"Unknown loader strategy {strategy!r} for "
+                f"{model_class.__name__}.{path}"
+            )
+
+        # "roles.permissions" eager loads roles, then their permissions
+        option = None
+        current_class = model_class
+        for name in path.split("."):
+            relationship_property = sa_inspect(current_class).relationships[
+                name
+            ]
+            if relationship_property.lazy in ("dynamic", "write_only"):
+                raise ValueError(
+                    f"{current_class.__name__}.{name} is a "
+                    f"{relationship_property.lazy} relationship and cannot "
+                    "be eager loaded"
+                )
+
+            attribute = getattr(current_class, name)
+            loader = LOADER_STRATEGIES[strategy]
+            option = (
+                loader(attribute)
+                if option is None
+                else getattr(option, loader.__name__)(attribute)
+            )
+            current_class = relationship_property.mapper.class_
+        options.append(option)
+    return options
+
+
+def get_load_options(
+    model_class: type, profile: str = DEFAULT_PROFILE
+) -> Tuple[Any, ...]:
+    """
+    Returns the loader options of a model's load profile.
+
+    Models declare their profiles as `__load_profiles__`, a dict of profile
+    name (e.g. "default" or an endpoint name) to a dict of relationship path
+    to loader strategy ("selectin", "joined" or "subquery"). A profile the
+    model does not declare falls back to its "default" profile, and a model
+    with no profiles gets no options. The options are built once per model
+    and profile.
+    """
+    key = (model_class, profile)
+    options = _options_cache.get(key)
+    if options is None:
+        profiles = getattr(model_class, "__load_profiles__", None) or {}
+        paths = profiles.get(profile, profiles.get(DEFAULT_PROFILE, {}))
+        options = tuple(_build_options(model_class, paths))
+        with _options_lock:
+            _options_cache[key] = options
+    return options
+
+
+def apply_load_profile(query: Any, profile: str = DEFAULT_PROFILE) -> Any:
+    """
+    Adds the loader options of a load profile of the query's model to a
+    query, so the relationships serialized with each row are loaded with a
+    fixed number of queries rather than one (or more) per row.
+    """
+    model_class = query.column_descriptions[0]["entity"]
+    if model_class is None:
+        return query
+
+    options = get_load_options(model_class, profile)
+    return query.options(*options) if options else query
+
+
+class QueryCounter:
+    """
+    Number of statements executed, and their SQL, while counting.
+    """
+
+    def __init__(self) -> None:
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __call__(self, conn, cursor, statement, *args: Any) -> None:
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine: Optional[Engine] = None) -> Iterator[QueryCounter]:
+    """
+    Counts the statements executed on an engine, or on every engine when none
+    is given, within the block.
+
+    Example:
+        with count_queries() as counter:
+            make_serializable(broker.read("all", User.query, 1))
+        print(counter.count)
+    """
+    target = Engine if engine is None else engine
+    counter = QueryCounter()
+    event.listen(target, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(target, "before_cursor_execute", counter)
+
+
+@contextmanager
+def assert_max_queries(
+    max_queries: int, engine: Optional[Engine] = None
+) -> Iterator[QueryCounter]:
+    """
+    Fails if the block executes more than `max_queries` statements, e.g. to
+    keep a list endpoint from regressing to one query per row.
+
+    Raises:
+        AssertionError: If more statements were executed, listing them.
+    """
+    with count_queries(engine) as counter:
+        yield counter
+
+    if counter.count > max_queries:
+        statements = "\n".join(counter.statements)
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, executed "
+            f"{counter.count}:\n{statements}"
+        )
@@ -1,7 +1,13 @@
-from typing import Union
+from datetime import date, datetime, time
+from typing import Any, Union
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from sqlalchemy.orm.dynamic import AppenderQuery
 
+from app.services.util.model_serializer import (
+    get_model_serializer,
+    serialize_model,
+)
+
 
 def resolve_instrumented_attribute(attribute):
     """
@@ -18,10 +24,17 @@ def extract_model_data(model):
     """
     Extracts only the meaningful data from a SQLAlchemy model, excluding internal attributes.
     """
-    return {
-        column.name: getattr(model, column.name)
-        for column in model.__table__.columns
-    }
+    return get_model_serializer(model.__class__).columns(model)
+
+
+def serialize_scalar(value: Any) -> str:
+    """
+    Converts a value JSON cannot encode to a string: ISO 8601 for dates and
+    times, as the JSON providers write them, `str()` for anything else.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return str(value)
 
 
 def make_serializable(
@@ -39,6 +52,11 @@ def make_serializable(
     Returns:
         Union[dict, str]: the serialized version of the object including nodes.
     """
+    if isinstance(data, (str, int, float, bool, type(None))):  # Basic types
+        return data
+    if isinstance(data, (datetime, date, time)):  # ISO 8601 in every format
+        return data.isoformat()
+
     if visited is None:
         visited = set()
 
@@ -60,41 +78,13 @@ def make_serializable(
             return f"<CircularReference {data.__class__.__name__}>"
         visited.add(obj_id)
 
-        # Extract core attributes of the SQLAlchemy model
-        result = extract_model_data(data)
-
-        # Add relationships
-        for (
-            relationship_name,
-            relationship_property,
-        ) in data.__mapper__.relationships.items():
-            related_data = getattr(data, relationship_name, None)
-
-            if isinstance(
-                related_data, AppenderQuery
-            ):  # Handle dynamic relationships
-                result[relationship_name] = [
-                    extract_model_data(item) for item in related_data.all()
-                ]
-            elif isinstance(
-                related_data, (list, tuple)
-            ):  # Relationship returning multiple objects
-                result[relationship_name] = [
-                    extract_model_data(item) for item in related_data
-                ]
-            elif related_data is not None:  # Single related object
-                result[relationship_name] = extract_model_data(related_data)
-            else:
-                result[relationship_name] = None  # Relationship not populated
-
-        return result
+        # Columns and relationships via the compiled serializer of the class
+        return serialize_model(data)
     elif hasattr(data, "__dict__"):  # Convert custom objects to a dict
         obj_id = id(data)
         if obj_id in visited:  # Avoid circular references in custom objects
             return f"<CircularReference {data.__class__.__name__}>"
         visited.add(obj_id)
         return make_serializable(data.__dict__, visited)
-    elif isinstance(data, (str, int, float, bool, type(None))):  # Basic types
-        return data
     else:
         return str(data)  # Fallback: Convert to string
@@ -0,0 +1,173 @@
+from datetime import date, datetime, time
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import inspect as sa_inspect
+
+
+# Python type -> callable applied to column values of that type when a model
+# is serialized. Dates and times are written in ISO 8601, as the JSON
+# providers write them, so every response format agrees.
+_type_converters: Dict[type, Callable[[Any], Any]] = {
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+    time: time.isoformat,
+}
+
+_serializer_cache: Dict[type, "ModelSerializer"] = {}
+_serializer_lock = Lock()
+
+
+def _find_converter(column: Any) -> Optional[Callable[[Any], Any]]:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return None
+
+    for base in python_type.__mro__:
+        if base in _type_converters:
+            return _type_converters[base]
+    return None
+
+
+class ModelSerializer:
+    """
+    Serializer for one mapped class, compiled once from its mapper.
+
+    The column names, attribute keys, type converters and relationship kinds
+    are resolved at compile time so serializing an instance is a single pass
+    of `getattr` calls with no reflection.
+    """
+
+    __slots__ = (
+        "model_class",
+        "plain_columns",
+        "converted_columns",
+        "relationships",
+    )
+
+    def __init__(self, model_class: type) -> None:
+        mapper = sa_inspect(model_class)
+
+        plain_columns = []
+        converted_columns = []
+        for column in model_class.__table__.columns:
+            try:
+                attribute = mapper.get_property_by_column(column).key
+            except Exception:
+                attribute = column.name
+
+            converter = _find_converter(column)
+            if converter is None:
+                plain_columns.append((column.name, attribute))
+            else:
+                converted_columns.append((column.name, attribute, converter))
+
+        relationships = []
+        for name, relationship_property in mapper.relationships.items():
+            if relationship_property.lazy == "dynamic":
+                kind = "dynamic"
+            elif relationship_property.uselist:
+                kind = "many"
+            else:
+                kind = "one"
+            relationships.append((name, kind))
+
+        self.model_class = model_class
+        self.plain_columns: Tuple[Tuple[str, str], ...] = tuple(plain_columns)
+        self.converted_columns: Tuple[
+            Tuple[str, str, Callable[[Any], Any]], ...
+        ] = tuple(converted_columns)
+        self.relationships: Tuple[Tuple[str, str], ...] = tuple(relationships)
+
+    def columns(self, model: Any) -> Dict[str, Any]:
+        """
+        Extracts the column values of a model instance.
+        """
+        # Loaded attributes are read straight from the instance dict, which
+        # skips the instrumented descriptor; expired ones still go through it.
+        loaded = model.__dict__
+        result = {
+            name: loaded[key] if key in loaded else getattr(model, key)
+            for name, key in self.plain_columns
+        }
+        if self.converted_columns:
+            for name, key, converter in self.converted_columns:
+                value = loaded[key] if key in loaded else getattr(model, key)
+                result[name] = None if value is None else converter(value)
+        return result
+
+    def serialize(self, model: Any) -> Dict[str, Any]:
+        """
+        Extracts the column values of a model instance and the column values
+        of its related instances.
+        """
+        result = self.columns(model)
+        loaded = model.__dict__
+
+        for name, kind in self.relationships:
+            if name in loaded:
+                related_data = loaded[name]
+            else:
+                related_data = getattr(model, name, None)
+
+            if related_data is None:  # Relationship not populated
+                result[name] = None
+            elif kind == "one":
+                result[name] = get_model_serializer(
+                    related_data.__class__
+                ).columns(related_data)
+            else:
+                if kind == "dynamic":
+                    related_data = related_data.all()
+                result[name] = _columns_of_many(related_data)
+
+        return result
+
+
+def _columns_of_many(items: Any) -> list:
+    # Related collections are nearly always of one class, so the serializer
+    # is only looked up again when the class changes.
+    result = []
+    model_class = serializer = None
+    for item in items:
+        if item.__class__ is not model_class:
+            model_class = item.__class__
+            serializer = get_model_serializer(model_class)
+        result.append(serializer.columns(item))
+    return result
+
+
+def get_model_serializer(model_class: type) -> ModelSerializer:
+    """
+    Returns the compiled serializer of a mapped class, compiling it on first
+    use.
+    """
+    serializer = _serializer_cache.get(model_class)
+    if serializer is None:
+        with _serializer_lock:
+            serializer = _serializer_cache.get(model_class)
+            if serializer is None:
+                serializer = ModelSerializer(model_class)
+                _serializer_cache[model_class] = serializer
+    return serializer
+
+
+def serialize_model(model: Any) -> Dict[str, Any]:
+    """
+    Serializes a SQLAlchemy model instance, including its relationships, with
+    the compiled serializer of its class.
+    """
+    return get_model_serializer(model.__class__).serialize(model)
+
+
+def register_type_converter(
+    python_type: type, converter: Callable[[Any], Any]
+) -> None:
+    """
+    Registers a converter applied to column values of `python_type` (or a
+    subclass) and drops the compiled serializers so they pick it up.
+    """
+    with _serializer_lock:
+        _type_converters[python_type] = converter
+        _serializer_cache.clear()
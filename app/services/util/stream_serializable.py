@@ -0,0 +1,145 @@
+import csv
+import io
+from typing import Any, Callable, Iterable, Iterator, List
+
+from dicttoxml import dicttoxml
+from pandas import DataFrame
+from sqlalchemy import Select
+from sqlalchemy.orm import Query
+
+from app.core.database.database import db
+from app.services.util.make_serializable import make_serializable
+
+
+def is_single_record(data: Any) -> bool:
+    """
+    Returns whether a payload is one record (a dict, model or scalar) rather
+    than a collection of rows.
+    """
+    return isinstance(data, (dict, str, bytes)) or hasattr(
+        data, "__tablename__"
+    )
+
+
+def iter_serializable_rows(data: Any, chunk_size: int = 1000) -> Iterator[Any]:
+    """
+    Lazily yields the rows of a payload as JSON-serializable values.
+
+    ORM queries and select statements are fetched `chunk_size` rows at a
+    time with `yield_per`, so only one chunk of rows is held in memory.
+
+    Args:
+        data (Any): a single dict/model, a DataFrame, or any iterable of rows
+            (list, generator, SQLAlchemy query or select, chunk iterator of
+            DataFrames).
+        chunk_size (int): rows fetched per round trip for queries.
+
+    Yields:
+        Any: each row passed through `make_serializable`, one at a time.
+    """
+    if isinstance(data, DataFrame) or is_single_record(data):
+        data = [data]
+    elif isinstance(data, Query):
+        data = data.yield_per(chunk_size)
+    elif isinstance(data, Select):
+        result = db.session.execute(
+            data.execution_options(yield_per=chunk_size)
+        )
+        if len(data.column_descriptions) == 1:
+            data = result.scalars()
+        else:
+            data = (row._asdict() for row in result)
+
+    for item in data:
+        if isinstance(item, DataFrame):  # Chunk of a larger dataset
+            for record in item.to_dict(orient="records"):
+                yield make_serializable(record)
+        else:
+            yield make_serializable(item)
+
+
+def iter_chunks(rows: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    """
+    Groups an iterable of rows into lists of at most `chunk_size` rows.
+    """
+    chunk: List[Any] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(
+    rows: Iterable[Any], delimiter: str = "|", chunk_size: int = 1000
+) -> Iterator[str]:
+    """
+    Writes rows as CSV lines, yielding one string per chunk of rows.
+
+    The header is taken from the keys of the first row when rows are dicts,
+    mirroring the non-streaming CSV rendering.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output, delimiter=delimiter)
+    headers = None
+
+    for chunk in iter_chunks(rows, chunk_size):
+        for row in chunk:
+            if isinstance(row, dict):
+                if headers is None:
+                    headers = list(row.keys())
+                    writer.writerow(headers)
+                writer.writerow([row.get(h, "") for h in headers])
+            else:
+                writer.writerow([row])
+
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+
+    output.close()
+
+
+def stream_ndjson(
+    rows: Iterable[Any],
+    dumps: Callable[[Any], str],
+    chunk_size: int = 1000,
+) -> Iterator[str]:
+    """
+    Writes rows as newline delimited JSON records, one chunk at a time.
+    """
+    for chunk in iter_chunks(rows, chunk_size):
+        yield "".join(dumps(row) + "\n" for row in chunk)
+
+
+def stream_json(
+    rows: Iterable[Any],
+    dumps: Callable[[Any], str],
+    chunk_size: int = 1000,
+) -> Iterator[str]:
+    """
+    Writes rows as a single JSON array, one chunk of elements at a time.
+    """
+    yield "["
+    separator = ""
+    for chunk in iter_chunks(rows, chunk_size):
+        yield separator + ",".join(dumps(row) for row in chunk)
+        separator = ","
+    yield "]"
+
+
+def stream_xml(
+    rows: Iterable[Any],
+    custom_root: str = "response",
+    chunk_size: int = 1000,
+) -> Iterator[str]:
+    """
+    Writes rows as `<item>` elements under a root element, one chunk at a
+    time, matching the markup `dicttoxml` produces for a list payload.
+    """
+    yield f'<?xml version="1.0" encoding="UTF-8" ?><{custom_root}>'
+    for chunk in iter_chunks(rows, chunk_size):
+        yield dicttoxml(chunk, root=False).decode("utf-8")
+    yield f"</{custom_root}>"
@@ -0,0 +1,69 @@
+import pytest
+from flask import Flask, g
+
+from app.core.batch_api.rest_api import batch_api
+from app.core.custom_api import CustomApi
+from app.core.database.database import db
+from app.models.data.role import Role
+
+
+@pytest.fixture
+def client(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'default.db'}"
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=uri,
+        SQLALCHEMY_BINDS={"default": uri},
+        BULK_BATCH_SIZE=2,
+    )
+    db.init_app(app)
+    app.api = CustomApi(app)
+    batch_api(app, Role)
+
+    @app.before_request
+    def set_tenant():
+        g.tenant = "default"
+
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+
+
+def names():
+    return [role.name for role in Role.query.order_by(Role.id)]
+
+
+def test_rows_must_be_objects(client):
+    response = client.post("/api/role/batch", json=[1, 2])
+
+    assert response.status_code == 422
+    assert names() == []
+
+
+def test_partial_update_reports_committed_rows_and_missing_ids(client):
+    rows = [{"name": f"role_{i}"} for i in range(3)]
+    assert client.post("/api/role/batch", json=rows).json == {"created": 3}
+
+    updates = [
+        {"id": 1, "name": "a"},
+        {"id": 2, "name": "b"},
+        {"id": 3, "name": "c"},
+        {"id": 9, "name": "d"},
+    ]
+    response = client.patch("/api/role/batch", json=updates)
+
+    assert response.status_code == 422
+    assert response.json["committed"] == 2
+    assert response.json["failed_ids"] == [9]
+    assert names() == ["a", "b", "role_2"]
+
+
+def test_delete_counts_only_existing_rows(client):
+    rows = [{"name": f"role_{i}"} for i in range(3)]
+    client.post("/api/role/batch", json=rows)
+
+    response = client.delete("/api/role/batch", json=[1, 2, 9])
+
+    assert response.json == {"deleted": 2}
+    assert names() == ["role_2"]
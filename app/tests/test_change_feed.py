@@ -0,0 +1,71 @@
+import pytest
+from flask import Flask, g
+
+from app.brokers.storage.sql_alchemy.sql_alchemy_storage_broker import (
+    SQLAlchemyStorageBroker,
+)
+from app.core.database.database import db
+from app.core.realtime.change_feed import (
+    add_commit_listener,
+    remove_commit_listener,
+)
+from app.models.data.role import Role
+
+
+@pytest.fixture
+def app(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'default.db'}"
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=uri,
+        SQLALCHEMY_BINDS={"default": uri},
+        BULK_BATCH_SIZE=100,
+    )
+    db.init_app(app)
+
+    with app.test_request_context():
+        g.tenant = "default"
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def committed():
+    changes = []
+
+    def listener(batch):
+        changes.extend(change.to_dict() for change in batch)
+
+    add_commit_listener(listener, collections=["role"])
+    yield changes
+    remove_commit_listener(listener)
+
+
+def summary(changes):
+    return [
+        (change["action"], change["record_id"], change["data"].get("name"))
+        for change in changes
+    ]
+
+
+def test_bulk_writes_are_committed_changes(app, committed):
+    broker = SQLAlchemyStorageBroker()
+
+    broker.bulk_create(Role, [{"id": 1, "name": "a"}, {"name": "b"}])
+    assert summary(committed) == [("create", 1, "a"), ("create", None, "b")]
+
+    committed.clear()
+    broker.bulk_update(Role, [{"id": 2, "name": "c"}])
+    assert summary(committed) == [("update", 2, "c")]
+
+    committed.clear()
+    broker.bulk_delete(Role, [1, 2])
+    assert summary(committed) == [("delete", 1, None), ("delete", 2, None)]
+
+
+def test_rolled_back_bulk_writes_are_not_changes(app, committed):
+    db.session.execute(db.insert(Role), [{"name": "a"}])
+    db.session.rollback()
+
+    assert committed == []
@@ -0,0 +1,79 @@
+import pytest
+from flask import Flask, g
+from flask_restx import Resource
+
+from app.core.conditional_get.conditional_get import conditional_response
+from app.core.custom_api import CustomApi
+from app.core.database.database import db
+from app.core.response_cache.response_cache import init_response_cache
+from app.models.data.role import Role
+
+
+@pytest.fixture
+def app(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'default.db'}"
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=uri,
+        SQLALCHEMY_BINDS={"default": uri},
+        # Change tokens are only re-read after a commit
+        CONDITIONAL_GET_TOKEN_TTL=3600,
+    )
+    db.init_app(app)
+    init_response_cache(app)
+    app.api = CustomApi(app)
+
+    @app.api.route("/api/role/names")
+    class RoleNamesResource(Resource):
+        @conditional_response(models=[Role])
+        def get(self):
+            return [role.name for role in Role.query.order_by(Role.id)]
+
+    @app.before_request
+    def set_tenant():
+        g.tenant = g.organization = "default"
+
+    with app.test_request_context():
+        g.tenant = g.organization = "default"
+        db.create_all()
+        db.session.add(Role(name="a"))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+def get_names(client, etag):
+    return client.get("/api/role/names", headers={"If-None-Match": etag})
+
+
+def test_updates_within_a_second_change_the_etag(app):
+    client = app.test_client()
+    etag = client.get("/api/role/names").headers["ETag"]
+    assert get_names(client, etag).status_code == 304
+
+    # Same row count, highest id and (second granular) updated_at
+    role = db.session.get(Role, 1)
+    updated_at = role.updated_at
+    role.name = "b"
+    role.updated_at = updated_at
+    db.session.commit()
+
+    response = get_names(client, etag)
+    assert response.status_code == 200
+    assert response.json == ["b"]
+    assert response.headers["ETag"] != etag
+
+
+def test_bulk_updates_change_the_etag(app):
+    client = app.test_client()
+    etag = client.get("/api/role/names").headers["ETag"]
+
+    updated_at = db.session.get(Role, 1).updated_at
+    db.session.execute(
+        db.update(Role), [{"id": 1, "name": "b", "updated_at": updated_at}]
+    )
+    db.session.commit()
+
+    response = get_names(client, etag)
+    assert response.status_code == 200
+    assert response.json == ["b"]
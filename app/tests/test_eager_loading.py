@@ -0,0 +1,73 @@
+import pytest
+from flask import Flask
+
+from app.brokers.storage.sql_alchemy.sql_alchemy_storage_broker import (
+    SQLAlchemyStorageBroker,
+)
+from app.core.database.database import db
+from app.models.data.role import Role
+from app.models.data.user import User
+from app.models.views.base_model_view import BaseModelView
+from app.services.util.eager_loading import assert_max_queries
+from app.services.util.make_serializable import make_serializable
+
+# One query for the page, one per eager loaded relationship and the count
+MAX_LIST_QUERIES = 3
+
+
+class PermittedModelView(BaseModelView):
+    # Permission checks are not what is measured here
+    def valid_check(self, permission_name: str) -> bool:
+        return True
+
+
+@pytest.fixture
+def app():
+    uri = "sqlite://"
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=uri,
+        SQLALCHEMY_BINDS={"default": uri},
+        ROWS_PER_PAGE=100,
+    )
+    db.init_app(app)
+
+    with app.test_request_context():
+        db.create_all()
+        roles = [Role(name=f"role_{i}") for i in range(10)]
+        db.session.add_all(
+            [
+                User(
+                    email=f"user_{i}@example.com",
+                    password="password",
+                    fs_uniquifier=str(i),
+                    roles=roles[i % 10 : i % 10 + 3],
+                )
+                for i in range(100)
+            ]
+        )
+        db.session.commit()
+        db.session.expunge_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.mark.parametrize("model", [User, Role])
+def test_list_page_query_count(app, model):
+    broker = SQLAlchemyStorageBroker()
+
+    with assert_max_queries(MAX_LIST_QUERIES, db.engine):
+        items = broker.read("all", model.query, 1)
+        rows = make_serializable(items)
+
+    assert len(rows) == model.query.count()
+
+
+@pytest.mark.parametrize("model", [User, Role])
+def test_admin_list_query_count(app, model):
+    view = PermittedModelView(model, db)
+
+    with assert_max_queries(MAX_LIST_QUERIES, db.engine):
+        rows = make_serializable(view.get_query().all())
+
+    assert len(rows) == model.query.count()
@@ -0,0 +1,52 @@
+import json
+from datetime import datetime
+
+import pytest
+from flask import Flask, current_app
+
+from app.core.database.database import db
+from app.core.json_provider.json_provider import StdlibJSONProvider
+from app.models.data.role import Role
+from app.models.data.user import User
+from app.services.util.make_serializable import make_serializable
+
+CREATED_AT = datetime(2024, 5, 6, 7, 8, 9, 123456)
+
+
+@pytest.fixture
+def user():
+    uri = "sqlite://"
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=uri, SQLALCHEMY_BINDS={"default": uri}
+    )
+    db.init_app(app)
+
+    with app.test_request_context():
+        db.create_all()
+        user = User(
+            email="user@example.com",
+            password="password",
+            fs_uniquifier="1",
+            created_at=CREATED_AT,
+            roles=[Role(name="admin", created_at=CREATED_AT)],
+        )
+        db.session.add(user)
+        db.session.commit()
+        app.json = StdlibJSONProvider(app)
+        yield user
+        db.session.remove()
+
+
+def test_model_datetimes_are_iso_8601(user):
+    data = make_serializable(user)
+
+    assert data["created_at"] == "2024-05-06T07:08:09.123456"
+    assert data["roles"][0]["created_at"] == "2024-05-06T07:08:09.123456"
+    assert isinstance(data["updated_at"], str)
+
+
+def test_model_serializes_like_the_json_provider(user):
+    encoded = current_app.json.dumps(user)
+
+    assert json.loads(encoded) == make_serializable(user)
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+
+from app.brokers.storage.pandas.feather_storage_broker import (
+    PandasFeatherStorageBroker,
+)
+from app.brokers.storage.pandas.hdf_storage_broker import (
+    PandasHdfStorageBroker,
+)
+from app.brokers.storage.pandas.parquet_storage_broker import (
+    PandasParquetStorageBroker,
+)
+
+# Broker, file name and the arguments following the data (or condition)
+BROKERS = {
+    "feather": (PandasFeatherStorageBroker, "data.feather", ()),
+    "hdf": (PandasHdfStorageBroker, "data.h5", ("rows",)),
+    "parquet": (PandasParquetStorageBroker, "data.parquet", ()),
+}
+
+
+@pytest.fixture(params=sorted(BROKERS))
+def store(request, tmp_path):
+    broker_class, name, args = BROKERS[request.param]
+    broker = broker_class()
+    path = tmp_path / name
+
+    class Store:
+        def create(self, data):
+            broker.create(path, data, *args)
+
+        def read(self):
+            return broker.read(path, *args)
+
+        def update(self, data):
+            broker.update(path, data, *args)
+
+        def delete(self, condition):
+            broker.delete(path, condition, *args)
+
+    return Store()
+
+
+def test_update_and_delete_keep_rows_distinct(store):
+    store.create(pd.DataFrame({"a": [1, 2, 3]}))
+    store.update(pd.DataFrame({"a": [4, 5]}))
+    store.delete(lambda data: data["a"] == 4)
+
+    data = store.read()
+    assert data["a"].tolist() == [1, 2, 3, 5]
+    assert data.index.tolist() == [0, 1, 2, 3]
+
+
+def test_delete_with_a_mask(store):
+    store.create(pd.DataFrame({"a": [1, 2, 3]}))
+    data = store.read()
+    store.delete(data["a"] > 1)
+
+    assert store.read()["a"].tolist() == [1]
+
+
+def test_update_and_delete_keep_a_meaningful_index(store):
+    index = pd.date_range("2024-01-01", periods=3, freq="D", name="day")
+    store.create(pd.DataFrame({"a": [1, 2, 3]}, index=index))
+    later = pd.date_range("2024-01-04", periods=2, freq="D", name="day")
+    store.update(pd.DataFrame({"a": [4, 5]}, index=later))
+    store.delete(lambda data: data["a"] % 2 == 0)
+
+    data = store.read()
+    assert data["a"].tolist() == [1, 3, 5]
+    assert data.index.name == "day"
+    assert [day.day for day in data.index] == [1, 3, 5]
+
+
+def test_hdf_table_delete_requires_a_condition(tmp_path):
+    broker = PandasHdfStorageBroker(format="table")
+    path = tmp_path / "data.h5"
+    broker.create(path, pd.DataFrame({"a": [1, 2, 3]}), "rows")
+
+    with pytest.raises(ValueError):
+        broker.delete(path, None, "rows")
+
+    assert broker.read(path, "rows")["a"].tolist() == [1, 2, 3]
@@ -0,0 +1,65 @@
+import pytest
+from flask import Flask, g
+from flask_restx import Resource
+
+from app.core.batch_api.rest_api import batch_api
+from app.core.custom_api import CustomApi
+from app.core.database.database import db
+from app.core.response_cache.response_cache import (
+    cached_response,
+    init_response_cache,
+)
+from app.models.data.role import Role
+
+
+@pytest.fixture
+def client(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'default.db'}"
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=uri,
+        SQLALCHEMY_BINDS={"default": uri},
+        BULK_BATCH_SIZE=2,
+    )
+    db.init_app(app)
+    init_response_cache(app)
+    app.api = CustomApi(app)
+    batch_api(app, Role)
+
+    @app.api.route("/api/role/names")
+    class RoleNamesResource(Resource):
+        @cached_response(models=[Role])
+        def get(self):
+            return sorted(role.name for role in Role.query.all())
+
+    @app.before_request
+    def set_tenant():
+        g.tenant = g.organization = "default"
+
+    with app.app_context():
+        db.create_all()
+        yield app.test_client()
+        db.session.remove()
+
+
+def test_batch_writes_invalidate_cached_responses(client):
+    assert client.get("/api/role/names").json == []
+
+    rows = [{"name": f"role_{i}"} for i in range(3)]
+    assert client.post("/api/role/batch", json=rows).status_code == 201
+    assert client.get("/api/role/names").json == [
+        "role_0",
+        "role_1",
+        "role_2",
+    ]
+
+    update = [{"id": 1, "name": "renamed"}]
+    assert client.patch("/api/role/batch", json=update).status_code == 200
+    assert client.get("/api/role/names").json == [
+        "renamed",
+        "role_1",
+        "role_2",
+    ]
+
+    assert client.delete("/api/role/batch", json=[1, 2]).status_code == 200
+    assert client.get("/api/role/names").json == ["role_2"]
@@ -0,0 +1,42 @@
+"""
+Time to append a batch to a CSV file as the file grows.
+
+Run from the repository root: python -m benchmarks.csv_append
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from app.brokers.storage.pandas.csv_storage_broker import (
+    PandasCsvStorageBroker,
+)
+
+
+def main() -> None:
+    broker = PandasCsvStorageBroker()
+    batch = pd.DataFrame({"id": range(1_000), "name": "example", "value": 1.5})
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = os.path.join(directory, "append_benchmark.csv")
+        broker.create(file_path, batch, index=False)
+
+        # Append time should stay flat as the file grows
+        print("Rows in file  Append (ms)")
+        for appends in range(1, 501):
+            start = time.perf_counter()
+            broker.update(
+                file_path, batch[["value", "id", "name"]], index=False
+            )
+            elapsed = time.perf_counter() - start
+            if appends % 100 == 0:
+                rows = (appends + 1) * len(batch)
+                print(f"{rows:>12}  {elapsed * 1000:.2f}")
+
+        assert len(broker.read(file_path)) == 501 * len(batch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+First and deep page reads of 200k rows with offset vs cursor (keyset)
+pagination.
+
+Run from the repository root: python -m benchmarks.cursor_pagination
+"""
+
+import os
+import tempfile
+import timeit
+
+from flask import Flask
+
+from app.brokers.storage.sql_alchemy.sql_alchemy_storage_broker import (
+    SQLAlchemyStorageBroker,
+    encode_cursor,
+)
+from app.core.database.database import db
+from app.models.data.database import Database
+
+
+def main() -> None:
+    directory = tempfile.mkdtemp()
+    uri = "sqlite:///" + os.path.join(directory, "default.db")
+
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=uri,
+        SQLALCHEMY_BINDS={"default": uri},
+        ROWS_PER_PAGE=50,
+    )
+    db.init_app(app)
+
+    rows = 200_000
+    broker = SQLAlchemyStorageBroker()
+
+    with app.test_request_context():
+        db.create_all()
+        db.session.execute(
+            Database.__table__.insert(),
+            [
+                {
+                    "name": f"db_{i}",
+                    "database_type": "sqlite",
+                    "database_uri": "sqlite://",
+                }
+                for i in range(rows)
+            ],
+        )
+        db.session.commit()
+
+        query = Database.query
+        deep_page = rows // app.config["ROWS_PER_PAGE"] - 1
+
+        # The cursor of the same deep page, found by walking the keys
+        last_id = query.order_by(Database.id).offset(
+            deep_page * app.config["ROWS_PER_PAGE"] - 1
+        ).first().id
+        cursor = encode_cursor("id", [last_id])
+
+        offset_items = broker.read("all", query, deep_page + 1)
+        cursor_items = broker.read("cursor", query, cursor).items
+        assert offset_items == cursor_items
+
+        number = 20
+        for name, read_type, page in (
+            ("offset, first page", "all", 1),
+            ("offset, deep page", "all", deep_page),
+            ("cursor, first page", "cursor", None),
+            ("cursor, deep page", "cursor", cursor),
+        ):
+            read = lambda: broker.read(read_type, query, page)
+            seconds = timeit.timeit(read, number=number) / number
+            print(f"{name}: {seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
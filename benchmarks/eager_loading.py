@@ -0,0 +1,82 @@
+"""
+Queries and time per page of users and roles, lazily vs eager loaded by their
+load profile.
+
+Run from the repository root: python -m benchmarks.eager_loading
+"""
+
+import timeit
+
+from flask import Flask
+
+from app.brokers.storage.sql_alchemy.sql_alchemy_storage_broker import (
+    SQLAlchemyStorageBroker,
+)
+from app.core.database.database import db
+from app.models.data.role import Role
+from app.models.data.user import User
+from app.services.util.eager_loading import (
+    DEFAULT_PROFILE,
+    assert_max_queries,
+    count_queries,
+)
+from app.services.util.make_serializable import make_serializable
+
+
+def main() -> None:
+    uri = "sqlite://"
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=uri,
+        SQLALCHEMY_BINDS={"default": uri},
+        ROWS_PER_PAGE=500,
+    )
+    db.init_app(app)
+
+    broker = SQLAlchemyStorageBroker()
+
+    with app.test_request_context():
+        db.create_all()
+        roles = [Role(name=f"role_{i}") for i in range(50)]
+        db.session.add_all(
+            [
+                User(
+                    email=f"user_{i}@example.com",
+                    password="password",
+                    fs_uniquifier=str(i),
+                    roles=roles[i % 50 : i % 50 + 3],
+                )
+                for i in range(500)
+            ]
+        )
+        db.session.commit()
+
+        def serialize_page(model, profile):
+            db.session.expunge_all()
+            items = broker.read("all", model.query, 1, profile=profile)
+            return make_serializable(items)
+
+        number = 10
+        for model in (User, Role):
+            with count_queries() as lazy:
+                expected = serialize_page(model, None)
+            lazy_time = timeit.timeit(
+                lambda: serialize_page(model, None), number=number
+            )
+
+            with assert_max_queries(3) as eager:
+                assert serialize_page(model, DEFAULT_PROFILE) == expected
+            eager_time = timeit.timeit(
+                lambda: serialize_page(model, DEFAULT_PROFILE), number=number
+            )
+
+            print(
+                f"{model.__name__}: lazy {lazy.count} queries, "
+                f"{lazy_time / number * 1000:.1f} ms / page; eager "
+                f"{eager.count} queries, "
+                f"{eager_time / number * 1000:.1f} ms / page"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Throughput of the in-process event broker with one fast and one stalled
+subscriber.
+
+Run from the repository root: python -m benchmarks.in_process_event_broker
+"""
+
+import threading
+import time
+from typing import Any, List
+
+from app.brokers.events.in_process_event_broker import (
+    InProcessEventBroker,
+)
+
+
+def main() -> None:
+    # Throughput with one fast and one stalled subscriber
+    broker = InProcessEventBroker(batch_size=500, max_queued_batches=100)
+    received = [0]
+    stalled = threading.Event()
+
+    def count(batch: List[Any]) -> None:
+        received[0] += len(batch)
+
+    broker.subscribe("bench", count)
+    broker.subscribe(
+        "bench",
+        lambda batch: stalled.wait(),
+        on_drop=lambda: print("stalled subscriber dropped"),
+    )
+
+    messages = 1_000_000
+    start = time.perf_counter()
+    for i in range(messages):
+        broker.publish("bench", i)
+    broker.flush()
+    while received[0] < messages:
+        time.sleep(0.001)
+    seconds = time.perf_counter() - start
+    stalled.set()
+
+    print(f"{messages / seconds:,.0f} messages / s")
+    print(broker.metrics()["bench"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Rendering 10k model rows with each JSON provider vs make_serializable and
+Flask's provider.
+
+Run from the repository root: python -m benchmarks.json_provider
+"""
+
+import timeit
+import uuid
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import Column, DateTime, Integer, Numeric, String, Uuid
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session, declarative_base
+
+from app.core.json_provider.json_provider import (
+    MsgspecJSONProvider,
+    OrjsonJSONProvider,
+    StdlibJSONProvider,
+    msgspec,
+    orjson,
+)
+from app.services.util.make_serializable import make_serializable
+
+
+def main() -> None:
+    Base = declarative_base()
+
+    class BenchItem(Base):
+        __tablename__ = "item"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(255))
+        price = Column(Numeric(10, 2))
+        reference = Column(Uuid, default=uuid.uuid4)
+        created_at = Column(DateTime, default=func.current_timestamp())
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        session.add_all(
+            [
+                BenchItem(name=f"item_{i}", price=Decimal(i) / 100)
+                for i in range(10_000)
+            ]
+        )
+        session.commit()
+        rows = session.query(BenchItem).all()
+
+        app = Flask(__name__)
+        providers = [StdlibJSONProvider]
+        if orjson is not None:
+            providers.append(OrjsonJSONProvider)
+        if msgspec is not None:
+            providers.append(MsgspecJSONProvider)
+
+        number = 10
+        with app.app_context():
+            # The previous path: a serializable copy, then Flask's provider
+            app.json = DefaultJSONProvider(app)
+            baseline = timeit.timeit(
+                lambda: app.json.response(make_serializable(rows)),
+                number=number,
+            )
+            print(
+                f"make_serializable + stdlib: "
+                f"{baseline / number * 1000:.1f} ms / 10k rows"
+            )
+
+            for provider_class in providers:
+                app.json = provider_class(app)
+                seconds = timeit.timeit(
+                    lambda: app.json.response(rows), number=number
+                )
+                print(
+                    f"{provider_class.__name__}: "
+                    f"{seconds / number * 1000:.1f} ms / 10k rows "
+                    f"({baseline / seconds:.1f}x)"
+                )
+
+
+if __name__ == "__main__":
+    main()
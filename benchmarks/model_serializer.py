@@ -0,0 +1,90 @@
+"""
+Compiled per-class model serializer vs reflecting on the table and mapper per
+call.
+
+Run from the repository root: python -m benchmarks.model_serializer
+"""
+
+import timeit
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import Session, declarative_base, relationship
+
+from app.services.util.make_serializable import make_serializable
+
+
+def main() -> None:
+    Base = declarative_base()
+
+    class BenchRolesUsers(Base):
+        __tablename__ = "roles_users"
+        id = Column(Integer, primary_key=True)
+        user_id = Column(Integer, ForeignKey("user.id"))
+        role_id = Column(Integer, ForeignKey("role.id"))
+
+    class BenchRole(Base):
+        __tablename__ = "role"
+        id = Column(Integer, primary_key=True)
+        name = Column(String(255))
+
+    class BenchUser(Base):
+        __tablename__ = "user"
+        id = Column(Integer, primary_key=True)
+        email = Column(String(255))
+        created_at = Column(DateTime, default=func.current_timestamp())
+        roles = relationship("BenchRole", secondary="roles_users")
+
+    def reflective_serialize(model):
+        # The previous implementation: walks the table and mapper per call
+        result = {
+            column.name: getattr(model, column.name)
+            for column in model.__table__.columns
+        }
+        for name in model.__mapper__.relationships.keys():
+            related_data = getattr(model, name, None)
+            result[name] = [
+                {
+                    column.name: getattr(item, column.name)
+                    for column in item.__table__.columns
+                }
+                for item in related_data
+            ]
+        return result
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as session:
+        roles = [BenchRole(name=f"role_{i}") for i in range(3)]
+        session.add_all(
+            [
+                BenchUser(email=f"user_{i}@example.com", roles=roles)
+                for i in range(500)
+            ]
+        )
+        session.commit()
+
+        users = session.query(BenchUser).all()
+        for user in users:  # Load relationships outside the timed section
+            user.roles
+
+        assert make_serializable(
+            [reflective_serialize(u) for u in users]
+        ) == make_serializable(users)
+
+        number = 20
+        reflective = timeit.timeit(
+            lambda: [reflective_serialize(u) for u in users], number=number
+        )
+        compiled = timeit.timeit(
+            lambda: make_serializable(users), number=number
+        )
+
+        print(f"reflective: {reflective / number * 1000:.2f} ms / page")
+        print(f"compiled:   {compiled / number * 1000:.2f} ms / page")
+        print(f"speedup:    {reflective / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Session lookups per request with a new factory per call vs one registry per
+tenant, under gevent.
+
+Run from the repository root: python -m benchmarks.multi_tenant
+"""
+
+from typing import Any
+
+from flask import Flask
+from gevent import monkey
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+
+def main() -> None:
+    monkey.patch_all()
+
+    import os
+    import tempfile
+    import time
+
+    import gevent
+    from sqlalchemy import text
+
+    from app.core.database.database import db
+
+    directory = tempfile.mkdtemp()
+    uri = "sqlite:///" + os.path.join(directory, "default.db")
+
+    app = Flask(__name__)
+    app.config.update(
+        SQLALCHEMY_DATABASE_URI=uri,
+        SQLALCHEMY_BINDS={"default": uri},
+        SQLALCHEMY_ENGINE_OPTIONS={"pool_size": 20, "max_overflow": 0},
+    )
+    db.init_app(app)
+
+    def uncached_session() -> scoped_session:
+        # The previous behaviour: a new factory and registry per call
+        return scoped_session(sessionmaker(bind=db.get_bind()))
+
+    def handle_request(get_session: Any) -> None:
+        with app.app_context():
+            db.choose_tenant("default")
+            for _ in range(5):  # Several lookups per request
+                session = get_session()
+            session.execute(text("SELECT 1"))
+            session.remove()
+
+    greenlets, requests = 50, 40
+
+    def worker(get_session: Any) -> None:
+        for _ in range(requests):
+            handle_request(get_session)
+    for name, get_session in (
+        ("new factory per call", uncached_session),
+        ("cached per tenant", db.get_session),
+    ):
+        handle_request(get_session)  # Warm up
+        start = time.perf_counter()
+        gevent.joinall(
+            [gevent.spawn(worker, get_session) for _ in range(greenlets)]
+        )
+        seconds = time.perf_counter() - start
+        per_request = seconds / (greenlets * requests) * 1e6
+        print(f"{name}: {per_request:.1f} us / request")
+
+
+if __name__ == "__main__":
+    main()
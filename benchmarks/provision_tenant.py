@@ -0,0 +1,71 @@
+"""
+Request time when tenant databases are provisioned on every request vs once per
+process.
+
+Run from the repository root: python -m benchmarks.provision_tenant
+"""
+
+import os
+import tempfile
+import timeit
+from typing import Any
+
+from flask import Flask, g
+
+from app.core.choose_tenant.choose_tenant import choose_tenant
+from app.core.database.database import db
+from app.core.provision_tenant.provision_tenant import (
+    create_database,
+    create_tables_from_models,
+    provision_tenant,
+)
+
+
+def main() -> None:
+    directory = tempfile.mkdtemp()
+    uri = "sqlite:///" + os.path.join(directory, "default.db")
+
+    class BenchItem(db.Model):
+        id = db.Column(db.Integer, primary_key=True)
+        name = db.Column(db.String(255))
+
+    def build(provisioned: bool) -> Any:
+        app = Flask(__name__)
+        app.config.update(
+            SQLALCHEMY_DATABASE_URI=uri,
+            SQLALCHEMY_BINDS={
+                "default": uri,
+                "acme": "sqlite:///" + os.path.join(directory, "acme.db"),
+            },
+            AUTO_CREATE_DATABASE=True,
+            AUTO_CREATE_TABLES_FROM_MODELS=True,
+        )
+        db.init_app(app)
+
+        @app.before_request
+        def before_request() -> None:
+            choose_tenant(app=app)
+            if provisioned:
+                provision_tenant(app=app, tenant=g.organization)
+            else:  # The previous behaviour
+                create_database(app=app)
+                create_tables_from_models(app=app)
+
+        @app.route("/")
+        def index() -> str:
+            return "ok"
+
+        return app
+
+    number = 500
+    for name, provisioned in (("every request", False), ("registry", True)):
+        client = build(provisioned).test_client()
+        client.get("/?organization=acme")  # Warm up
+        seconds = timeit.timeit(
+            lambda: client.get("/?organization=acme"), number=number
+        )
+        print(f"{name}: {seconds / number * 1000:.3f} ms / request")
+
+
+if __name__ == "__main__":
+    main()
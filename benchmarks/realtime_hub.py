@@ -0,0 +1,77 @@
+"""
+Memory per idle SSE client and fan-out time per commit of the change feed hub,
+under gevent.
+
+Run from the repository root: python -m benchmarks.realtime_hub
+"""
+
+import time
+
+from gevent import monkey
+
+from app.core.realtime.change_feed import Change
+from app.core.realtime.hub import ChangeFeedHub
+
+
+def main() -> None:
+    monkey.patch_all()
+
+    import resource
+
+    import gevent
+
+    # Thousands of idle SSE clients on one process, then bursts of commits
+    subscribers, commits, changes_per_commit = 5000, 200, 10
+    hub = ChangeFeedHub(batch_interval=0.05, heartbeat=5.0)
+    received = [0]
+
+    def client(index: int) -> None:
+        if index % 2:
+            subscription = hub.subscribe("default", "note")
+        else:  # Half follow one record each
+            subscription = hub.subscribe("default", "note", index % 100)
+        for message in hub.stream(subscription):
+            if message.startswith("event: changes"):
+                received[0] += 1
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    clients = [gevent.spawn(client, i) for i in range(subscribers)]
+    gevent.sleep(0.5)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"subscriptions: {hub.stats()['subscriptions']}")
+    print(f"memory: {(rss_after - rss_before) / subscribers:.1f} KiB / client")
+
+    start = time.perf_counter()
+    for commit in range(commits):
+        hub.publish(
+            [
+                Change(
+                    action="update",
+                    collection="note",
+                    record_id=(commit * changes_per_commit + i) % 100,
+                    tenant="default",
+                    data={"id": i, "body": "x" * 64},
+                )
+                for i in range(changes_per_commit)
+            ]
+        )
+        gevent.sleep(0.001)  # Commits of concurrent requests
+    publish_seconds = time.perf_counter() - start
+
+    gevent.sleep(hub.batch_interval * 4)
+    deliver_seconds = time.perf_counter() - start
+    stats = hub.stats()
+    gevent.killall(clients)
+
+    per_commit = publish_seconds / commits * 1000
+    print(f"publish + fan-out: {per_commit:.2f} ms / commit")
+    print(f"all batches delivered within {deliver_seconds:.2f} s")
+    print(
+        f"changes published {stats['published']}, coalesced "
+        f"{stats['coalesced']}, delivered {stats['delivered']} in "
+        f"{received[0]} events"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Throughput of events published by one process and received by another through
+the SQLite event broker.
+
+Run from the repository root: python -m benchmarks.sqlite_event_broker
+"""
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from typing import Any, List
+
+from app.brokers.events.sqlite_event_broker import SQLiteEventBroker
+
+
+def main() -> None:
+    # Events published by one process, received by a subscriber in another
+    path = os.path.join(tempfile.mkdtemp(), "events.db")
+    messages = 200_000
+    context = multiprocessing.get_context("fork")
+    subscribed = context.Event()
+
+    def publisher() -> None:
+        subscribed.wait()
+        broker = SQLiteEventBroker(path)
+        for i in range(messages):
+            broker.publish("bench", {"id": i})
+        broker.close()
+
+    # Forked before this process starts any threads
+    process = context.Process(target=publisher)
+    process.start()
+
+    broker = SQLiteEventBroker(path)
+    received = [0]
+    done = threading.Event()
+
+    def count(batch: List[Any]) -> None:
+        received[0] += len(batch)
+        if received[0] >= messages:
+            done.set()
+
+    broker.subscribe("bench", count)
+    subscribed.set()
+
+    start = time.perf_counter()
+    done.wait(120)
+    seconds = time.perf_counter() - start
+    process.join()
+
+    print(f"{received[0]:,} received, {received[0] / seconds:,.0f} / s")
+    print(broker.metrics()["bench"])
+
+
+if __name__ == "__main__":
+    main()
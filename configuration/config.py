@@ -1,4 +1,5 @@
 import sys, os
+import json
 from dataclasses import dataclass
 import secrets
 from typing import Any, Dict, Union
@@ -51,6 +52,16 @@ class Config(object):
         self.LIST_SEPARATOR = env("LIST_SEPARATOR", ",")
         self.CSV_DELIMITER = env("CSV_DELIMITER", "|")
 
+        ############################################################
+        # Rows per chunk for streamed API responses (?stream=true) #
+        ############################################################
+        self.STREAM_CHUNK_SIZE = int(env("STREAM_CHUNK_SIZE", 1000))
+
+        ####################################################################
+        # JSON encoder: "auto", "orjson", "msgspec" or "stdlib" (fallback) #
+        ####################################################################
+        self.JSON_PROVIDER = env("JSON_PROVIDER", "auto")
+
         ########################
         # Date Time Formatting #
         ########################
@@ -118,16 +129,140 @@ class Config(object):
             "AUTO_CREATE_TABLES_FROM_MODELS", True
         )
 
+        ####################################################################
+        # Provision every tenant bind at startup, not on its first request #
+        ####################################################################
+        self.PROVISION_TENANTS_ON_STARTUP = parse_yes_no_true(
+            env("PROVISION_TENANTS_ON_STARTUP", "False")
+        )
+
+        ###################################################################
+        # "database": an engine per tenant, "schema": a schema per tenant #
+        ###################################################################
+        self.TENANCY_MODE = env("TENANCY_MODE", "database")
+
+        ################################################################
+        # Open tenant engines kept before idle ones are disposed (LRU) #
+        ################################################################
+        self.TENANT_MAX_ENGINES = int(env("TENANT_MAX_ENGINES", 100))
+
+        ##################################################################
+        # Seconds between reloads of the known tenants, and hosts cached #
+        ##################################################################
+        self.TENANT_RESOLVER_TTL = int(env("TENANT_RESOLVER_TTL", 300))
+        self.TENANT_RESOLVER_MAX_HOSTS = int(
+            env("TENANT_RESOLVER_MAX_HOSTS", 10000)
+        )
+
         self.SQLALCHEMY_DATABASE_URI = env(
             "SQLALCHEMY_DATABASE_URI", DEFAULT_DATABASE_URI
         )
 
         self.SQLALCHEMY_BINDS = {"default": self.SQLALCHEMY_DATABASE_URI}
 
+        ##########################################################################
+        # Read replica URLs per bind key, e.g. {"default": ["postgresql://..."]} #
+        ##########################################################################
+        self.SQLALCHEMY_READ_REPLICAS = json.loads(
+            env("SQLALCHEMY_READ_REPLICAS", "{}")
+        )
+        self.READ_REPLICA_STRATEGY = env("READ_REPLICA_STRATEGY", "round_robin")
+
         self.SQLALCHEMY_TRACK_MODIFICATIONS = env(
             "SQLALCHEMY_TRACK_MODIFICATIONS", False
         )
 
+        ####################################
+        # Rows per page of paginated reads #
+        ####################################
+        self.ROWS_PER_PAGE = int(env("ROWS_PER_PAGE", 20))
+
+        ###################################################
+        # Rows per batch (and transaction) of bulk writes #
+        ###################################################
+        self.BULK_BATCH_SIZE = int(env("BULK_BATCH_SIZE", 1000))
+
+        #################################################################
+        # Seconds a user's permission index is reused, and users cached #
+        #################################################################
+        self.PERMISSION_INDEX_TTL = int(env("PERMISSION_INDEX_TTL", 60))
+        self.PERMISSION_INDEX_MAX_USERS = int(
+            env("PERMISSION_INDEX_MAX_USERS", 10000)
+        )
+
+        #############################################################
+        # Tables whose changes clients can stream (comma separated) #
+        #############################################################
+        self.REALTIME_COLLECTIONS = [
+            collection.strip()
+            for collection in env("REALTIME_COLLECTIONS", "").split(",")
+            if collection.strip()
+        ]
+
+        ############################################################
+        # Seconds changes are batched, and between idle keepalives #
+        ############################################################
+        self.REALTIME_BATCH_INTERVAL = float(
+            env("REALTIME_BATCH_INTERVAL", 0.05)
+        )
+        self.REALTIME_HEARTBEAT = float(env("REALTIME_HEARTBEAT", 15))
+
+        ####################################################
+        # Who may stream changes (no auth methods: anyone) #
+        ####################################################
+        self.REALTIME_AUTH_METHODS = [
+            method.strip()
+            for method in env(
+                "REALTIME_AUTH_METHODS", "token,session"
+            ).split(",")
+            if method.strip()
+        ]
+        self.REALTIME_ROLES = [
+            role.strip()
+            for role in env("REALTIME_ROLES", "").split(",")
+            if role.strip()
+        ]
+        self.REALTIME_PERMISSIONS = [
+            permission.strip()
+            for permission in env("REALTIME_PERMISSIONS", "").split(",")
+            if permission.strip()
+        ]
+
+        #################################################################
+        # Event broker: "in_process", or "sqlite" to reach every worker #
+        #################################################################
+        self.EVENT_BROKER = env("EVENT_BROKER", "in_process")
+        self.EVENT_BROKER_SQLITE_PATH = env(
+            "EVENT_BROKER_SQLITE_PATH", "events.db"
+        )
+        self.EVENT_BROKER_BATCH_SIZE = int(env("EVENT_BROKER_BATCH_SIZE", 500))
+        self.EVENT_BROKER_BATCH_INTERVAL = float(
+            env("EVENT_BROKER_BATCH_INTERVAL", 0.01)
+        )
+        self.EVENT_BROKER_MAX_QUEUED_BATCHES = int(
+            env("EVENT_BROKER_MAX_QUEUED_BATCHES", 1000)
+        )
+
+        ######################################################################
+        # Response cache: "memory", or "filesystem" to share between workers #
+        ######################################################################
+        self.RESPONSE_CACHE_ENABLED = parse_yes_no_true(
+            env("RESPONSE_CACHE_ENABLED", "True")
+        )
+        self.RESPONSE_CACHE_BACKEND = env("RESPONSE_CACHE_BACKEND", "memory")
+        self.RESPONSE_CACHE_DIR = env("RESPONSE_CACHE_DIR", "response_cache")
+        self.RESPONSE_CACHE_TTL = float(env("RESPONSE_CACHE_TTL", 60))
+        self.RESPONSE_CACHE_MAX_ENTRIES = int(
+            env("RESPONSE_CACHE_MAX_ENTRIES", 1024)
+        )
+
+        #################################################################
+        # Seconds ETag change tokens are trusted before re-reading them #
+        #################################################################
+        self.CONDITIONAL_GET_TOKEN_TTL = float(
+            env("CONDITIONAL_GET_TOKEN_TTL", 1)
+        )
+
         ########################
         # Application threads. #
         ########################